@@ -0,0 +1,212 @@
+"""Partite multiple: progressi di gioco in tabelle di stato per partita
+
+Sposta catture e flag delle conquiste dalle colonne delle tabelle del catalogo (fiends.was_captured, *.created,
+*.defeated) nelle tabelle di stato indicizzate per partita, assegnandoli alla partita predefinita, e crea le tabelle
+di riepilogo, i contatori globali e il registro degli eventi. Le tabelle di riepilogo e i contatori vengono creati
+vuoti: il server li ricostruisce all'avvio per ogni partita, insieme all'istantanea iniziale del registro.
+
+È la prima revisione versionata: su un database marcato con revisioni locali non più presenti va eseguito
+prima `alembic stamp --purge base`. Ogni passo verifica lo schema attuale, quindi la revisione può essere
+applicata anche a un database già migrato in parte (per esempio con `sql_scripts/migrazione_partite.sql`).
+
+Revision ID: 3f1c2a9d8b7e
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d8b7e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nome della partita a cui vengono assegnati i progressi esistenti (app.saves.DEFAULT_SAVE_NAME)
+DEFAULT_SAVE_NAME = "partita principale"
+
+# Tabelle di stato per partita: (tabella, tabella del catalogo, colonna dell'ID dell'elemento)
+STATE_TABLES = [
+    ("area_conquest_states", "area_conquests", "area_conquest_id"),
+    ("species_conquest_states", "species_conquests", "species_conquest_id"),
+    ("original_creation_states", "original_creations", "original_creation_id"),
+]
+
+# Tabelle derivate dai progressi, ricostruite dal server all'avvio
+SUMMARY_TABLES = ["zone_progress", "species_conquest_progress", "progress_counters"]
+
+
+def save_id_column() -> sa.Column:
+    return sa.Column("save_id", sa.Integer, sa.ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+
+
+def counter_column(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer, nullable=False, server_default="0")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "saves" not in tables:
+        op.create_table(
+            "saves",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("name", sa.String, nullable=False, unique=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        )
+        op.create_index("ix_saves_id", "saves", ["id"])
+        op.create_index("ix_saves_user_id", "saves", ["user_id"])
+    op.execute(
+        sa.text("INSERT INTO saves (name) VALUES (:name) ON CONFLICT (name) DO NOTHING")
+        .bindparams(name=DEFAULT_SAVE_NAME)
+    )
+
+    # Tabelle di stato per partita
+    if "fiend_captures" not in tables:
+        op.create_table(
+            "fiend_captures",
+            save_id_column(),
+            sa.Column("fiend_id", sa.Integer, sa.ForeignKey("fiends.id", onupdate="CASCADE"), primary_key=True),
+            sa.Column("was_captured", sa.Integer,
+                      sa.CheckConstraint("was_captured BETWEEN 0 AND 10", name="valid_was_captured"),
+                      nullable=False, server_default="0"),
+        )
+        op.create_index("ix_fiend_captures_save_covering", "fiend_captures", ["save_id", "fiend_id"],
+                        postgresql_include=["was_captured"])
+    for state_table, catalogue_table, id_column in STATE_TABLES:
+        if state_table not in tables:
+            op.create_table(
+                state_table,
+                save_id_column(),
+                sa.Column(id_column, sa.Integer, sa.ForeignKey(f"{catalogue_table}.id", onupdate="CASCADE"),
+                          primary_key=True),
+                sa.Column("created", sa.Boolean, nullable=False, server_default=sa.false()),
+                sa.Column("defeated", sa.Boolean, nullable=False, server_default=sa.false()),
+            )
+            op.create_index(f"ix_{state_table}_save_covering", state_table, ["save_id", id_column],
+                            postgresql_include=["created", "defeated"])
+
+    # Migrazione dei progressi dalle vecchie colonne del catalogo alla partita predefinita
+    if "was_captured" in {column["name"] for column in inspector.get_columns("fiends")}:
+        op.execute(sa.text(
+            "INSERT INTO fiend_captures (save_id, fiend_id, was_captured) "
+            "SELECT s.id, f.id, COALESCE(f.was_captured, 0) FROM fiends f, saves s WHERE s.name = :name "
+            "ON CONFLICT DO NOTHING"
+        ).bindparams(name=DEFAULT_SAVE_NAME))
+        op.drop_column("fiends", "was_captured")
+    for state_table, catalogue_table, id_column in STATE_TABLES:
+        if "created" in {column["name"] for column in inspector.get_columns(catalogue_table)}:
+            op.execute(sa.text(
+                f"INSERT INTO {state_table} (save_id, {id_column}, created, defeated) "
+                f"SELECT s.id, c.id, COALESCE(c.created, FALSE), COALESCE(c.defeated, FALSE) "
+                f"FROM {catalogue_table} c, saves s WHERE s.name = :name "
+                f"ON CONFLICT DO NOTHING"
+            ).bindparams(name=DEFAULT_SAVE_NAME))
+            op.drop_column(catalogue_table, "created")
+            op.drop_column(catalogue_table, "defeated")
+
+    # Le tabelle di riepilogo create prima delle partite multiple non hanno la colonna save_id: essendo derivate
+    # dai progressi vengono ricreate vuote
+    for summary_table in SUMMARY_TABLES:
+        if summary_table in tables and "save_id" not in {
+            column["name"] for column in inspector.get_columns(summary_table)
+        }:
+            op.drop_table(summary_table)
+            tables.discard(summary_table)
+
+    if "zone_progress" not in tables:
+        op.create_table(
+            "zone_progress",
+            save_id_column(),
+            sa.Column("zone_id", sa.Integer, sa.ForeignKey("zones.id", onupdate="CASCADE"), primary_key=True),
+            counter_column("total_fiends"),
+            counter_column("uncaptured_fiends"),
+            counter_column("completed_fiends"),
+        )
+        op.create_index("ix_zone_progress_zone_id", "zone_progress", ["zone_id"])
+    if "species_conquest_progress" not in tables:
+        op.create_table(
+            "species_conquest_progress",
+            save_id_column(),
+            sa.Column("species_conquest_id", sa.Integer,
+                      sa.ForeignKey("species_conquests.id", onupdate="CASCADE"), primary_key=True),
+            counter_column("total_fiends"),
+            counter_column("uncaptured_fiends"),
+            counter_column("below_required_fiends"),
+            counter_column("completed_fiends"),
+        )
+        op.create_index("ix_species_conquest_progress_species_conquest_id", "species_conquest_progress",
+                        ["species_conquest_id"])
+    if "progress_counters" not in tables:
+        op.create_table(
+            "progress_counters",
+            save_id_column(),
+            counter_column("area_conquests_created"),
+            counter_column("area_conquests_uncreated"),
+            counter_column("area_conquests_undefeated"),
+            counter_column("species_conquests_created"),
+            counter_column("species_conquests_undefeated"),
+            counter_column("original_creations_undefeated"),
+            counter_column("fiends_below_five"),
+            counter_column("fiends_below_ten"),
+            counter_column("shinryu_fiends_below_two"),
+            counter_column("version"),
+        )
+    elif "version" not in {column["name"] for column in inspector.get_columns("progress_counters")}:
+        op.add_column("progress_counters", counter_column("version"))
+
+    # Registro degli eventi e istantanee
+    if "progress_events" not in tables:
+        op.create_table(
+            "progress_events",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("save_id", sa.Integer, sa.ForeignKey("saves.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("kind", sa.String,
+                      sa.CheckConstraint("kind IN ('captures', 'defeat', 'reset', 'undo', 'redo')",
+                                         name="valid_event_kind"),
+                      nullable=False),
+            sa.Column("payload", sa.JSON, nullable=False),
+            sa.Column("target_id", sa.Integer, sa.ForeignKey("progress_events.id", ondelete="SET NULL"),
+                      nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index("ix_progress_events_id", "progress_events", ["id"])
+        op.create_index("ix_progress_events_save_id_id", "progress_events", ["save_id", "id"])
+    if "event_snapshots" not in tables:
+        op.create_table(
+            "event_snapshots",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("save_id", sa.Integer, sa.ForeignKey("saves.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("last_event_id", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("state", sa.JSON, nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index("ix_event_snapshots_id", "event_snapshots", ["id"])
+        op.create_index("ix_event_snapshots_save_id_last_event_id", "event_snapshots", ["save_id", "last_event_id"])
+
+
+def downgrade() -> None:
+    # Ripristina le vecchie colonne con i progressi della partita predefinita; le altre partite vengono perse
+    op.add_column("fiends", sa.Column("was_captured", sa.Integer, server_default="0"))
+    op.execute(sa.text(
+        "UPDATE fiends f SET was_captured = c.was_captured FROM fiend_captures c, saves s "
+        "WHERE c.fiend_id = f.id AND c.save_id = s.id AND s.name = :name"
+    ).bindparams(name=DEFAULT_SAVE_NAME))
+    for state_table, catalogue_table, id_column in STATE_TABLES:
+        op.add_column(catalogue_table, sa.Column("created", sa.Boolean, server_default=sa.false()))
+        op.add_column(catalogue_table, sa.Column("defeated", sa.Boolean, server_default=sa.false()))
+        op.create_index(f"ix_{catalogue_table}_created", catalogue_table, ["created"])
+        op.create_index(f"ix_{catalogue_table}_defeated", catalogue_table, ["defeated"])
+        op.execute(sa.text(
+            f"UPDATE {catalogue_table} c SET created = st.created, defeated = st.defeated "
+            f"FROM {state_table} st, saves s WHERE st.{id_column} = c.id AND st.save_id = s.id AND s.name = :name"
+        ).bindparams(name=DEFAULT_SAVE_NAME))
+
+    for table in ["event_snapshots", "progress_events", *SUMMARY_TABLES,
+                  *[state_table for state_table, _, _ in STATE_TABLES], "fiend_captures", "saves"]:
+        op.drop_table(table)
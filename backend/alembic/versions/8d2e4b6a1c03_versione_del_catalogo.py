@@ -0,0 +1,35 @@
+"""Versione del catalogo condivisa tra i processi
+
+Crea la tabella `catalogue_version`, con la versione del catalogo incrementata da popolamento, reseed e ripristino
+dell'istantanea: i processi del server la confrontano con quella dei dati di riferimento in memoria per accorgersi
+delle modifiche al catalogo eseguite da altri processi.
+
+Revision ID: 8d2e4b6a1c03
+Revises: 3f1c2a9d8b7e
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6a1c03'
+down_revision: Union[str, None] = '3f1c2a9d8b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "catalogue_version" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "catalogue_version",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("version", sa.Integer, nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("catalogue_version")
@@ -0,0 +1,95 @@
+# backend/app/catalogue_files.py
+import hashlib
+import json
+import os
+from typing import Any, Iterable, Iterator, Optional
+
+# Directory dei file del catalogo. Ogni sezione (una per tabella, nell'ordine di caricamento indicato dal manifest)
+# è un file JSON Lines: una riga per elemento, con gli argomenti della funzione `new_*` di `population_data`
+# che lo crea. Il manifest indica la versione dei dati e, per ogni sezione, file, numero di righe e hash SHA-256;
+# va aggiornato (incrementando `version`) ad ogni modifica dei file.
+CATALOGUE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "catalogue")
+MANIFEST_FILE = "manifest.json"
+
+
+def read_manifest(directory: str = CATALOGUE_DIR) -> dict[str, Any]:
+    """Legge il manifest del catalogo: versione dei dati e sezioni nell'ordine di caricamento."""
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_section(section: dict[str, Any], directory: str = CATALOGUE_DIR) -> Iterator[dict[str, Any]]:
+    """
+    Legge una sezione del catalogo una riga alla volta, senza caricare il file in memoria,
+    verificando al termine numero di righe e hash indicati nel manifest.
+
+    :param section: Sezione del manifest.
+    :param directory: Directory dei file del catalogo.
+    :raises ValueError: Se il file non corrisponde al manifest (solo dopo aver restituito tutte le righe).
+    :return: Iteratore sulle righe della sezione.
+    """
+    digest = hashlib.sha256()
+    rows = 0
+    with open(os.path.join(directory, section["file"]), "rb") as file:
+        for line in file:
+            digest.update(line)
+            if line.strip():
+                rows += 1
+                yield json.loads(line)
+
+    if rows != section["rows"] or digest.hexdigest() != section["sha256"]:
+        raise ValueError(
+            f"Il file '{section['file']}' non corrisponde al manifest del catalogo "
+            f"({rows} righe, sha256 {digest.hexdigest()})"
+        )
+
+
+def iter_catalogue(
+        sections: Optional[Iterable[str]] = None,
+        directory: str = CATALOGUE_DIR
+) -> Iterator[tuple[str, Iterator[dict[str, Any]]]]:
+    """
+    Restituisce le sezioni del catalogo nell'ordine di caricamento, ciascuna con l'iteratore delle sue righe.
+
+    :param sections: Nomi delle sezioni da leggere (default: tutte), per ricaricare solo una parte del catalogo.
+    :param directory: Directory dei file del catalogo.
+    :raises ValueError: Se una sezione richiesta non esiste nel manifest.
+    :return: Iteratore di coppie (nome della sezione, righe).
+    """
+    manifest = read_manifest(directory)
+    names = [section["name"] for section in manifest["sections"]]
+    unknown = set(sections or ()) - set(names)
+    if unknown:
+        raise ValueError(f"Sezioni del catalogo non trovate: {', '.join(sorted(unknown))}")
+
+    for section in manifest["sections"]:
+        if sections is None or section["name"] in sections:
+            yield section["name"], read_section(section, directory)
+
+
+def write_manifest(version: int, names: Iterable[str], directory: str = CATALOGUE_DIR) -> dict[str, Any]:
+    """
+    Riscrive il manifest del catalogo calcolando numero di righe e hash dei file delle sezioni indicate,
+    da eseguire dopo aver modificato i dati.
+
+    :param version: Nuova versione dei dati.
+    :param names: Nomi delle sezioni nell'ordine di caricamento (file `<nome>.jsonl`).
+    :param directory: Directory dei file del catalogo.
+    :return: Il manifest scritto.
+    """
+    sections = []
+    for name in names:
+        with open(os.path.join(directory, f"{name}.jsonl"), "rb") as file:
+            content = file.read()
+        sections.append({
+            "name": name,
+            "file": f"{name}.jsonl",
+            "rows": sum(1 for line in content.splitlines() if line.strip()),
+            "sha256": hashlib.sha256(content).hexdigest()
+        })
+
+    manifest = {"version": version, "sections": sections}
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+        file.write("\n")
+    return manifest
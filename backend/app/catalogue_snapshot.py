@@ -0,0 +1,216 @@
+# backend/app/catalogue_snapshot.py
+import hashlib
+import io
+import json
+import os
+import sys
+import zipfile
+from typing import Any, Optional
+from sqlalchemy import Table, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from app.catalogue_files import read_manifest
+from app.database import SessionLocal
+from app.models import Base
+from app.population_data import sync_sequence
+from app.progress_version import progress_version
+from app.reference_data import reference_data
+from app.saves import ensure_saves
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Istantanea binaria del catalogo di un database PostgreSQL già popolato (e corretto), da cui creare nuovi
+# ambienti senza eseguire popolamento e script di correzione. È un archivio zip con un file per tabella
+# in formato COPY binario di PostgreSQL e un manifest con versione del catalogo, impronta dello schema e,
+# per ogni tabella, colonne, numero di righe e hash SHA-256. Righe ordinate per chiave primaria e date
+# fisse nell'archivio rendono identiche le istantanee dello stesso catalogo. Dalla directory backend:
+#
+#   python -m app.catalogue_snapshot [file]             costruisce l'istantanea dal database configurato
+#   python -m app.catalogue_snapshot --restore [file]   la carica in un database con il catalogo vuoto
+#
+# Le istantanee (data/snapshots/catalogue-v<versione>.zip) sono facoltative e non fanno parte del repository:
+# se manca quella della versione attuale, setup.sh carica il catalogo con il reseed (`app.population_data --reseed`).
+# Con DB_BACKEND=sqlite lo stesso ruolo è svolto dal catalogo precompilato di `app.sqlite_catalogue`.
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "snapshots")
+SNAPSHOT_MANIFEST = "manifest.json"
+SNAPSHOT_FORMAT = 1
+
+# Data assegnata ai file dell'archivio, perché il contenuto non dipenda dal momento della costruzione
+ARCHIVE_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+def snapshot_path(version: Optional[int] = None) -> str:
+    """Restituisce il percorso predefinito dell'istantanea di una versione del catalogo (default: quella attuale)."""
+    if version is None:
+        version = read_manifest()["version"]
+    return os.path.join(SNAPSHOT_DIR, f"catalogue-v{version}.zip")
+
+
+def catalogue_tables() -> list[Table]:
+    """
+    Restituisce le tabelle del catalogo in ordine di dipendenza: tutte tranne partite, utenti,
+    versione del catalogo e tabelle con i dati delle singole partite.
+    """
+    return [
+        table for table in Base.metadata.sorted_tables
+        if table.name not in ("saves", "users", "catalogue_version") and "save_id" not in table.columns
+    ]
+
+
+def schema_fingerprint(tables: list[Table]) -> str:
+    """
+    Calcola l'impronta dello schema delle tabelle (nomi e tipi PostgreSQL delle colonne): il formato COPY binario
+    può essere caricato solo in tabelle con colonne dello stesso tipo, nello stesso ordine.
+    """
+    schema = [
+        [table.name, [[column.name, str(column.type.compile(dialect=postgresql.dialect()))] for column in table.columns]]
+        for table in tables
+    ]
+    return hashlib.sha256(json.dumps(schema).encode()).hexdigest()
+
+
+def copy_connection(db: Session, isolation_level: Optional[str] = None):
+    """
+    Avvia la transazione della sessione e ne restituisce la connessione psycopg2, necessaria per COPY.
+
+    :param db: Sessione del database.
+    :param isolation_level: Livello di isolamento della transazione (default: quello della connessione).
+    :raises RuntimeError: Se il database non è PostgreSQL.
+    """
+    if db.bind.dialect.name != "postgresql":
+        raise RuntimeError(
+            "Le istantanee binarie del catalogo richiedono PostgreSQL: "
+            "con SQLite usare il catalogo precompilato (`python -m app.sqlite_catalogue`)"
+        )
+    execution_options = {"isolation_level": isolation_level} if isolation_level else {}
+    return db.connection(execution_options=execution_options).connection.dbapi_connection
+
+
+def build_snapshot(path: Optional[str] = None) -> dict[str, Any]:
+    """
+    Esporta il catalogo del database in un'istantanea binaria, leggendo tutte le tabelle
+    in un'unica transazione REPEATABLE READ (quindi da uno stato coerente).
+
+    :param path: Percorso dell'archivio (default: `snapshot_path()`).
+    :return: Il manifest dell'istantanea.
+    """
+    path = path or snapshot_path()
+    tables = catalogue_tables()
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "catalogue_version": read_manifest()["version"],
+        "schema": schema_fingerprint(tables),
+        "tables": []
+    }
+
+    db = SessionLocal()
+    try:
+        cursor = copy_connection(db, "REPEATABLE READ").cursor()
+        data = {}
+        for table in tables:
+            columns = ", ".join(column.name for column in table.columns)
+            order = ", ".join(column.name for column in table.primary_key.columns)
+            buffer = io.BytesIO()
+            cursor.copy_expert(
+                f"COPY (SELECT {columns} FROM {table.name} ORDER BY {order}) TO STDOUT WITH (FORMAT binary)", buffer
+            )
+            data[table.name] = buffer.getvalue()
+            manifest["tables"].append({
+                "name": table.name,
+                "file": f"{table.name}.copy",
+                "columns": [column.name for column in table.columns],
+                "rows": db.execute(select(func.count()).select_from(table)).scalar(),
+                "sha256": hashlib.sha256(data[table.name]).hexdigest()
+            })
+        db.rollback()
+    finally:
+        db.close()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with zipfile.ZipFile(temporary, "w") as archive:
+        archive.writestr(
+            zipfile.ZipInfo(SNAPSHOT_MANIFEST, ARCHIVE_DATE), json.dumps(manifest, indent=2) + "\n",
+            compress_type=zipfile.ZIP_DEFLATED
+        )
+        for entry in manifest["tables"]:
+            archive.writestr(
+                zipfile.ZipInfo(entry["file"], ARCHIVE_DATE), data[entry["name"]], compress_type=zipfile.ZIP_DEFLATED
+            )
+    os.replace(temporary, path)
+
+    rows = sum(entry["rows"] for entry in manifest["tables"])
+    logger.info(f"Istantanea del catalogo (versione {manifest['catalogue_version']}, {rows} righe) scritta in {path}")
+    return manifest
+
+
+def restore_snapshot(path: Optional[str] = None) -> dict[str, Any]:
+    """
+    Carica un'istantanea binaria in un database con il catalogo vuoto, in un'unica transazione: crea le tabelle
+    mancanti, carica ogni tabella con un COPY, riallinea le sequenze degli ID e crea la partita predefinita.
+    In caso di errore il database resta invariato.
+
+    :param path: Percorso dell'archivio (default: `snapshot_path()`).
+    :raises ValueError: Se l'istantanea non è compatibile con lo schema attuale o un file è danneggiato.
+    :raises RuntimeError: Se il catalogo del database non è vuoto (per aggiornarlo usare il reseed).
+    :return: Il manifest dell'istantanea.
+    """
+    path = path or snapshot_path()
+    tables = {table.name: table for table in catalogue_tables()}
+
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read(SNAPSHOT_MANIFEST))
+        if manifest["format"] != SNAPSHOT_FORMAT or manifest["schema"] != schema_fingerprint(list(tables.values())):
+            raise ValueError(f"L'istantanea {path} non è compatibile con lo schema attuale del database")
+        if manifest["catalogue_version"] != read_manifest()["version"]:
+            logger.warning(
+                f"L'istantanea contiene la versione {manifest['catalogue_version']} del catalogo, "
+                f"i file dei dati la versione {read_manifest()['version']}: eseguire il reseed dopo il ripristino"
+            )
+
+        db = SessionLocal()
+        try:
+            cursor = copy_connection(db).cursor()
+            Base.metadata.create_all(db.connection())
+            for name in tables:
+                if db.execute(select(tables[name]).limit(1)).first():
+                    raise RuntimeError(
+                        f"La tabella '{name}' non è vuota: per aggiornare il catalogo usare "
+                        f"`python -m app.population_data --reseed`"
+                    )
+
+            for entry in manifest["tables"]:
+                data = archive.read(entry["file"])
+                if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                    raise ValueError(f"Il file '{entry['file']}' dell'istantanea {path} è danneggiato")
+                cursor.copy_expert(
+                    f"COPY {entry['name']} ({', '.join(entry['columns'])}) FROM STDIN WITH (FORMAT binary)",
+                    io.BytesIO(data)
+                )
+                sync_sequence(db, tables[entry["name"]])
+
+            ensure_saves(db)
+            progress_version.bump_all(db)
+            reference_data.bump_catalogue_version(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    reference_data.invalidate()
+    rows = sum(entry["rows"] for entry in manifest["tables"])
+    logger.info(f"Istantanea del catalogo (versione {manifest['catalogue_version']}, {rows} righe) caricata da {path}")
+    return manifest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    arguments = [argument for argument in sys.argv[1:] if argument != "--restore"]
+    if "--restore" in sys.argv:
+        restore_snapshot(arguments[0] if arguments else None)
+    else:
+        build_snapshot(arguments[0] if arguments else None)
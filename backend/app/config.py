@@ -22,6 +22,75 @@ def get_db_name():
     return os.getenv("DATABASE", "zoolab")
 
 
+def get_db_user():
+    return os.getenv("DATABASE_USER", "mr.anderson2159")
+
+
+def get_db_host():
+    return os.getenv("DATABASE_HOST", "localhost")
+
+
+def get_int(name, default):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise RuntimeError(f"{name} deve essere un numero intero, trovato '{value}'.")
+
+
+def get_bool(name, default):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() == "true"
+
+
+def get_db_backend():
+    backend = os.getenv("DB_BACKEND", "postgresql")
+    if backend not in ("postgresql", "sqlite"):
+        raise RuntimeError(f"DB_BACKEND deve essere 'postgresql' o 'sqlite', trovato '{backend}'.")
+    return backend
+
+
 CORS_ORIGINS = get_cors_origins()
 DEBUG_MODE = get_debug_mode()
 DATABASE_NAME = get_db_name()
+DATABASE_USER = get_db_user()
+DATABASE_HOST = get_db_host()
+
+# Database usato dal server: PostgreSQL oppure SQLite (file locale, senza server). In modalità SQLite,
+# se SQLITE_PATH non esiste viene creato copiando il catalogo precompilato SQLITE_CATALOGUE;
+# con SQLITE_PATH=":memory:" ogni avvio usa una copia temporanea del catalogo, eliminata alla chiusura.
+DB_BACKEND = get_db_backend()
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(os.path.dirname(__file__), "..", "zoolab.db"))
+SQLITE_CATALOGUE = os.getenv(
+    "SQLITE_CATALOGUE", os.path.join(os.path.dirname(__file__), "..", "data", "catalogue.sqlite")
+)
+SQLITE_MMAP_SIZE = get_int("SQLITE_MMAP_SIZE", 64 * 1024 * 1024)  # Byte letti tramite memory map (0 per disattivare)
+
+# Configurazione del pool di connessioni, da dimensionare in base al numero di worker uvicorn:
+# ogni worker apre al massimo DB_POOL_SIZE + DB_MAX_OVERFLOW connessioni per ciascun engine
+DB_POOL_SIZE = get_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = get_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = get_int("DB_POOL_TIMEOUT", 30)  # Secondi di attesa massima per una connessione libera
+DB_POOL_PRE_PING = get_bool("DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = get_int("DB_POOL_RECYCLE", 1800)  # Secondi di vita di una connessione (-1 per disattivare)
+DB_STATEMENT_TIMEOUT = get_int("DB_STATEMENT_TIMEOUT", 0)  # Millisecondi per singola query (0 per disattivare)
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "zoolab")
+
+# Numero di eventi del registro dei progressi dopo cui viene scritta una nuova istantanea della partita.
+# Vengono conservati gli eventi successivi alla penultima istantanea, disponibili per annullamento e replay.
+EVENT_COMPACTION_INTERVAL = get_int("EVENT_COMPACTION_INTERVAL", 200)
+
+# Accorpamento delle variazioni di cattura ravvicinate sulla stessa partita: le richieste ricevute entro
+# CAPTURE_COALESCING_WINDOW_MS millisecondi vengono applicate in un'unica transazione (0 per disattivare).
+# Raggiunte CAPTURE_COALESCING_MAX_BATCH richieste il gruppo viene applicato senza attendere la finestra.
+CAPTURE_COALESCING_WINDOW_MS = get_int("CAPTURE_COALESCING_WINDOW_MS", 0)
+CAPTURE_COALESCING_MAX_BATCH = get_int("CAPTURE_COALESCING_MAX_BATCH", 50)
+
+# Flusso delle modifiche ai progressi (Server-Sent Events): intervallo in secondi dei messaggi di keep-alive
+# e numero massimo di messaggi in coda per client, oltre il quale il client viene invitato a ricaricare i dati
+STREAM_KEEPALIVE_SECONDS = get_int("STREAM_KEEPALIVE_SECONDS", 15)
+STREAM_QUEUE_SIZE = get_int("STREAM_QUEUE_SIZE", 100)
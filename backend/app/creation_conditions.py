@@ -1,41 +1,154 @@
-from typing import Optional, Iterator, Type, Any, Callable, Union
-from sqlalchemy.orm import Session
+from typing import Optional, Iterable, Iterator, Type, Callable, Union
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from app import models, schemas
-from sqlalchemy.sql.elements import BinaryExpression, and_
+from app.progress import CONQUEST_STATES, STATE_KEYS, set_conquest_flags
+from sqlalchemy.sql.elements import ColumnElement
 import logging
 
 # Configura il logger
 logger = logging.getLogger(__name__)
 
+# Condizioni di creazione dei prototipi zoolab, espresse in modo dichiarativo sulle colonne dei contatori globali
+# dei progressi e compilate in un'unica SELECT. Aggiungere un prototipo non richiede query aggiuntive.
+ORIGINAL_CREATION_RULES: dict[str, Callable[[Type[models.ProgressCounters]], ColumnElement]] = {
+    # Almeno 2 campioni di zona creati
+    "mangiaterra": lambda c: c.area_conquests_created >= 2,
+    # Almeno 2 campioni di specie creati
+    "titanosfera": lambda c: c.species_conquests_created >= 2,
+    # Almeno 6 campioni di zona creati
+    "catastrophe": lambda c: c.area_conquests_created >= 6,
+    # Almeno 6 campioni di specie creati
+    "vlakorados": lambda c: c.species_conquests_created >= 6,
+    # Tutti i campioni di zona creati
+    "gasteropodos": lambda c: c.area_conquests_uncreated == 0,
+    # Tutti i mostri catturati almeno 5 volte
+    "ultima x": lambda c: c.fiends_below_five == 0,
+    # Splasher, aquelous ed echeneis del monte gagazet catturati almeno 2 volte
+    "shinryu": lambda c: c.shinryu_fiends_below_two == 0,
+    # Tutti i mostri catturati 10 volte e tutte le altre conquiste sconfitte
+    "il supremo": lambda c: and_(
+        c.fiends_below_ten == 0,
+        c.area_conquests_undefeated == 0,
+        c.species_conquests_undefeated == 0,
+        c.original_creations_undefeated == 0
+    ),
+}
+
+
+async def evaluate_original_creation_rules(db: AsyncSession, save_id: int) -> dict[str, bool]:
+    """
+    Valuta tutte le condizioni di creazione dei prototipi zoolab di una partita con un'unica SELECT
+    sui contatori globali.
+
+    Args:
+        db (AsyncSession): Sessione asincrona del database per eseguire la query.
+        save_id (int): ID della partita.
+
+    Returns:
+        Un dizionario con l'esito di ciascuna condizione, indicizzato per nome del prototipo.
+    """
+    counters = models.ProgressCounters
+    statement = select(
+        *[rule(counters).label(f"rule_{index}") for index, rule in enumerate(ORIGINAL_CREATION_RULES.values())]
+    ).where(counters.save_id == save_id)
+
+    row = (await db.execute(statement)).one()
+    return {name: bool(value) for name, value in zip(ORIGINAL_CREATION_RULES, row)}
+
+
 class CreationConditions:
     """
     Classe CreationConditions per verificare le condizioni di creazione dei vari campioni di zona,
     campioni di specie e prototipi zoolab, basandosi sulle catture dei mostri nella zona specifica.
 
     Attributes:
-        db (Session): Sessione del database per eseguire query.
+        db (AsyncSession): Sessione asincrona del database per eseguire query.
+        save_id (int): ID della partita di cui verificare le condizioni.
         captured_fiends (list[models.Fiend]): Lista di mostri catturati.
         negative_check (bool): Flag per determinare se eseguire la logica di annullamento.
+
+    Le condizioni dei prototipi zoolab (`ORIGINAL_CREATION_RULES`) vengono valutate tutte insieme con un'unica
+    query sui contatori globali dei progressi (`progress_counters`), aggiornati in modo incrementale dalle
+    variazioni di cattura e dei flag delle conquiste.
+
+    Tutte le verifiche sono asincrone; le modifiche dei flag vengono eseguite dalle funzioni sincrone
+    di `app.progress` tramite `AsyncSession.run_sync`, sulla stessa transazione.
     """
 
-    def __init__(self, db: Session, captured_fiends: list[models.Fiend] = None, negative_check: bool = None):
+    def __init__(
+            self,
+            db: AsyncSession,
+            save_id: int,
+            captured_fiends: list[models.Fiend] = None,
+            negative_check: bool = None
+    ):
         """
         Inizializza un'istanza della classe CreationConditions.
 
         Args:
-            db (Session): Sessione del database per eseguire query.
+            db (AsyncSession): Sessione asincrona del database per eseguire query.
+            save_id (int): ID della partita di cui verificare le condizioni.
             captured_fiends (list[models.Fiend]): Lista di mostri catturati.
             negative_check (bool): Flag per determinare se eseguire la logica di annullamento.
         """
         self.db = db
+        self.save_id = save_id
         self.captured_fiends = captured_fiends
         self.negative_check = negative_check
+        self._rules = None
+        self._originals = None
         if captured_fiends is None and negative_check is None:
             logger.info("Inizializzazione CreationConditions: nessun parametro specificato")
         else:
             logger.info(f"Inizializzazione CreationConditions: negative_check={negative_check}, captured_fiends={[fiend.name for fiend in captured_fiends]}")
 
-    def __check_originals(self) -> Optional[list[schemas.OriginalCreationResponse]]:
+    async def rules(self) -> dict[str, bool]:
+        """Esito delle condizioni di creazione dei prototipi zoolab, valutate una sola volta per verifica."""
+        if self._rules is None:
+            self._rules = await evaluate_original_creation_rules(self.db, self.save_id)
+        return self._rules
+
+    async def originals(self) -> dict[str, tuple[
+        models.OriginalCreation, models.OriginalCreationState, Optional[tuple[str, int]]
+    ]]:
+        """
+        Prototipi zoolab con il relativo stato nella partita e la ricompensa di creazione (nome dell'item e quantità),
+        indicizzati per nome.
+        Vengono caricati con un'unica query alla prima verifica e riutilizzati da tutte le regole.
+        """
+        if self._originals is None:
+            rows = (await self.db.execute(
+                select(
+                    models.OriginalCreation,
+                    models.OriginalCreationState,
+                    models.Item.name,
+                    models.OriginalCreationReward.quantity
+                )
+                .join(
+                    models.OriginalCreationState,
+                    and_(
+                        models.OriginalCreationState.original_creation_id == models.OriginalCreation.id,
+                        models.OriginalCreationState.save_id == self.save_id
+                    )
+                )
+                .outerjoin(
+                    models.OriginalCreationReward,
+                    and_(
+                        models.OriginalCreationReward.original_creation_id == models.OriginalCreation.id,
+                        models.OriginalCreationReward.reward_type == 'creation'
+                    )
+                )
+                .outerjoin(models.Item, models.Item.id == models.OriginalCreationReward.item_id)
+            )).all()
+            self._originals = {
+                original_creation.name: (original_creation, state, (item_name, quantity) if item_name else None)
+                for original_creation, state, item_name, quantity in rows
+            }
+        return self._originals
+
+    async def __check_originals(self) -> Optional[list[schemas.OriginalCreationResponse]]:
         """
         Verifica le condizioni di creazione per i prototipi zoolab specifici.
 
@@ -43,15 +156,13 @@ class CreationConditions:
             Una lista di OriginalCreationResponse contenente le informazioni sulle creazioni effettuate.
         """
         logger.info("Inizio verifica dei prototipi zoolab originali")
+
+        # Rivaluta le condizioni, che includono le conquiste create o annullate dalle verifiche precedenti
+        self._rules = None
+        rules = await self.rules()
         check = [
-            self.check_mangiaterra(),
-            self.check_titanosfera(),
-            self.check_catastrophe(),
-            self.check_vlakorados(),
-            self.check_gasteropodos(),
-            self.check_ultima_x(),
-            self.check_shinryu(),
-            self.check_il_supremo()
+            await self.__originals_checker(original_creation_name=name, create_condition=rules[name])
+            for name in ORIGINAL_CREATION_RULES
         ]
 
         # Restituisce solo i prototipi creati con successo
@@ -61,7 +172,7 @@ class CreationConditions:
             logger.info(f"Prototipi zoolab creati: {[creation.name for creation in check]}")
             return check
 
-    def check(self) -> dict:
+    async def check(self) -> dict:
         """
         Controlla e verifica le condizioni per campioni di area, specie e prototipi zoolab.
 
@@ -70,16 +181,16 @@ class CreationConditions:
         """
         logger.info("Inizio verifica delle condizioni di creazione")
         result = {
-            "area_conquests": self.check_area_conquest(),
-            "species_conquests": self.check_species_conquest()
+            "area_conquests": await self.check_area_conquest(),
+            "species_conquests": await self.check_species_conquest()
         }
-        self.db.flush()
+        await self.db.flush()
         logger.info(f"Flush del database prima di verificare i prototipi zoolab")
-        result |= {"original_creations": self.__check_originals()}
+        result |= {"original_creations": await self.__check_originals()}
         logger.info(f"Risultato della verifica delle condizioni di creazione: {result}")
         return result
 
-    def __originals_checker(
+    async def __originals_checker(
             self,
             *,
             original_creation_name: str,
@@ -97,20 +208,12 @@ class CreationConditions:
         """
         logger.info(f"Verifica creazione prototipo: {original_creation_name}, condizione: {create_condition}")
 
-        # Cerca l'original creation nel database
-        original_creation = self.db.query(models.OriginalCreation).filter(
-            models.OriginalCreation.name == original_creation_name
-        ).first()
+        # Cerca l'original creation tra quelle caricate per questa verifica
+        original_creation, state, reward = (await self.originals())[original_creation_name]
 
-        if not original_creation.created and create_condition:
+        if not state.created and create_condition:
             # Crea il prototipo se non è stato ancora creato e la condizione è soddisfatta
-            original_creation.created = True
-
-            # Recupera la ricompensa associata alla creazione
-            reward = self.db.query(models.OriginalCreationReward).filter(
-                models.OriginalCreationReward.original_creation_id == original_creation.id,
-                models.OriginalCreationReward.reward_type == 'creation'
-            ).first()
+            await self.db.run_sync(set_conquest_flags, original_creation, state, created=True)
 
             logger.info(f"Prototipo creato: {original_creation_name}")
             return schemas.OriginalCreationResponse(
@@ -118,13 +221,12 @@ class CreationConditions:
                 name=original_creation.name,
                 created=True,
                 image_url=original_creation.image_url,
-                reward=(reward.item.name, reward.quantity)
+                reward=reward
             )
 
-        elif original_creation.created and self.negative_check and not create_condition:
+        elif state.created and self.negative_check and not create_condition:
             # Annulla il prototipo se è stato creato, il negative_check è attivo e la condizione non è più valida
-            original_creation.created = False
-            original_creation.defeated = False
+            await self.db.run_sync(set_conquest_flags, original_creation, state, created=False, defeated=False)
             logger.info(f"Prototipo annullato: {original_creation_name}")
             return schemas.OriginalCreationResponse(
                 id=original_creation.id,
@@ -132,10 +234,9 @@ class CreationConditions:
                 created=False,
                 image_url=original_creation.image_url
             )
-        elif original_creation.created and original_creation_name == "il supremo" and not create_condition:
+        elif state.created and original_creation_name == "il supremo" and not create_condition:
             # Annulla il prototipo "il supremo" se è stato creato e la condizione non è più valida
-            original_creation.created = False
-            original_creation.defeated = False
+            await self.db.run_sync(set_conquest_flags, original_creation, state, created=False, defeated=False)
             logger.info(f"Prototipo annullato: {original_creation_name}")
             return schemas.OriginalCreationResponse(
                 id=original_creation.id,
@@ -144,97 +245,96 @@ class CreationConditions:
                 image_url=original_creation.image_url
             )
 
-    def __conquests_checker(
+    async def __conquests_checker(
             self,
             *,
-            elements_to_check: Any,
-            conquest_model: Optional[Type[models.Base]],
-            conquest_filter: Callable[[Any], BinaryExpression],
-            missing_captures_target: Type[models.Base],
-            missing_captures_filter: Callable[
-                [Any, Union[models.AreaConquest, models.SpeciesConquest]], BinaryExpression],
+            elements_to_check: Iterable[int],
+            conquest_model: Type[Union[models.AreaConquest, models.SpeciesConquest]],
+            conquest_key: InstrumentedAttribute,
+            missing_captures_column: InstrumentedAttribute,
+            missing_captures_key: InstrumentedAttribute,
             schema_class: Type[schemas.ConquestResponseBase],
     ) -> Optional[list[schemas.ConquestResponseBase]]:
         """
         Metodo generico per verificare e gestire la creazione o l'annullamento dei campioni di area e specie.
 
-        Questo metodo viene utilizzato per controllare se le condizioni per una determinata conquista
-        (come campioni di area o di specie) sono soddisfatte o devono essere annullate. Il metodo utilizza
-        filtri dinamici per verificare la creazione di ogni elemento, rendendolo flessibile per vari tipi di
-        conquiste. In caso di successo, restituisce una lista di risposte con lo stato di creazione o annullamento.
+        Tutti gli elementi da verificare vengono valutati con un'unica query, che restituisce per ogni conquista
+        il suo stato nella partita, il numero di mostri che non soddisfano ancora la condizione (dal riepilogo dei progressi) e la ricompensa
+        di creazione. Il numero di query non dipende quindi dal numero di elementi modificati.
 
         Args:
-            elements_to_check (Any): Elementi da verificare per la creazione, come un ID di zona o mostri catturati.
-            conquest_model (Optional[Type[models.Base]]): Il modello di database per il tipo di conquista da verificare.
-            conquest_filter (Callable[[Any], BinaryExpression]): Filtro per verificare la conquista specifica nell'elemento.
-            missing_captures_target (Type[models.Base]): Modello di riferimento per verificare catture mancanti di mostri.
-            missing_captures_filter (Callable[[Any, Union[models.AreaConquest, models.SpeciesConquest]], BinaryExpression]):
-                Filtro per identificare i mostri mancanti che devono essere catturati per soddisfare la condizione.
+            elements_to_check (Iterable[int]): Chiavi degli elementi da verificare, come gli ID delle zone o delle specie.
+            conquest_model (Type[Union[models.AreaConquest, models.SpeciesConquest]]): Il modello di database per il
+                tipo di conquista da verificare.
+            conquest_key (InstrumentedAttribute): Colonna della conquista che corrisponde alle chiavi da verificare.
+            missing_captures_column (InstrumentedAttribute): Colonna della tabella di riepilogo dei progressi che
+                contiene il numero di mostri che non soddisfano ancora la condizione.
+            missing_captures_key (InstrumentedAttribute): Colonna della tabella di riepilogo dei progressi che
+                corrisponde a `conquest_key`.
             schema_class (Type[schemas.ConquestResponseBase]): Classe dello schema di risposta da restituire per la conquista.
 
         Returns:
             Optional[list[schemas.ConquestResponseBase]]: Una lista di oggetti schema con il loro stato aggiornato,
             se ci sono conquiste create o annullate.
         """
+        # Rimuove i duplicati mantenendo l'ordine degli elementi
+        elements_to_check = list(dict.fromkeys(element for element in elements_to_check if element is not None))
+        if not elements_to_check:
+            return None
+
+        # Costruisce il modello di reward dinamicamente, utilizzando la convenzione di denominazione
+        reward_model = getattr(models, f'{conquest_model.__name__}Reward')
+        reward_owner = getattr(reward_model, f'{conquest_model.__tablename__[:-1]}_id')
+        state_model = CONQUEST_STATES[conquest_model]
+        progress_model = missing_captures_column.class_
+
+        # Recupera conquiste, stati, mostri mancanti e ricompense di creazione di tutti gli elementi in un'unica query
+        rows = (await self.db.execute(
+            select(conquest_model, state_model, missing_captures_column, models.Item.name, reward_model.quantity)
+            .join(state_model, and_(STATE_KEYS[state_model] == conquest_model.id, state_model.save_id == self.save_id))
+            .join(progress_model, and_(missing_captures_key == conquest_key, progress_model.save_id == self.save_id))
+            .outerjoin(reward_model, and_(reward_owner == conquest_model.id, reward_model.reward_type == 'creation'))
+            .outerjoin(models.Item, models.Item.id == reward_model.item_id)
+            .filter(conquest_key.in_(elements_to_check))
+            .order_by(conquest_model.id)
+        )).all()
+        conquests = {}
+        for conquest, state, missing_count, item_name, quantity in rows:
+            conquests.setdefault(
+                getattr(conquest, conquest_key.key),
+                (conquest, state, missing_count, (item_name, quantity) if item_name else None)
+            )
+
         results = []
 
         for element in elements_to_check:
             logger.info(f"Verifica conquista per elemento: {element}")
 
-            # Recupera l'istanza della conquista (per esempio, AreaConquest o SpeciesConquest) corrispondente all'elemento.
-            conquest: Union[models.AreaConquest, models.SpeciesConquest] = (
-                self.db.query(conquest_model)
-                .filter(conquest_filter(element))
-                .first()
-            )
-
-            if not conquest:
+            if element not in conquests:
                 logger.info(f"Conquista non trovata per elemento: {element}")
                 continue
 
-            # Verifica se ci sono mostri che non soddisfano la condizione richiesta
-            missing_count = self.db.query(missing_captures_target).filter(
-                missing_captures_filter(element, conquest)
-            ).count()
+            conquest, state, missing_count, reward = conquests[element]
             logger.info(f"Numero di mostri mancanti per la conquista {conquest.name}: {missing_count}")
 
             # Crea o annulla la creazione del campione in base alla condizione e al valore di negative_check
             if missing_count == 0:
-                if not conquest.created:
-                    conquest.created = True
+                if not state.created:
+                    await self.db.run_sync(set_conquest_flags, conquest, state, created=True)
                     logger.info(f"Conquista creata: {conquest.name}")
 
-                    # Determina il nome della classe del modello di conquista
-                    c_m_name = conquest_model.__name__
-                    # Determina il nome della tabella del modello di conquista
-                    c_m_tablename = conquest_model.__tablename__
-
-                    # Costruisce il nome del modello di reward dinamicamente, utilizzando la convenzione di denominazione
-                    r_m_name = getattr(models, f'{c_m_name}Reward')
-
-                    # Recupera la ricompensa di tipo 'creation' per l'elemento di conquista creato
-                    reward = (
-                        self.db.query(r_m_name)
-                        .filter(
-                            getattr(r_m_name, f'{c_m_tablename[:-1]}_id') == conquest.id,
-                            r_m_name.reward_type == 'creation'
-                        )
-                        .first()
-                    )
-
                     # Aggiunge la conquista alla lista dei risultati, includendo la ricompensa
                     results.append(schema_class(
                         id=conquest.id,
                         name=conquest.name,
                         created=True,
                         image_url=conquest.image_url,
-                        reward=(reward.item.name, reward.quantity)
+                        reward=reward
                     ))
 
             # Annulla la conquista se il `negative_check` è attivo e la condizione non è più valida
-            elif self.negative_check and conquest.created:
-                conquest.created = False
-                conquest.defeated = False
+            elif self.negative_check and state.created:
+                await self.db.run_sync(set_conquest_flags, conquest, state, created=False, defeated=False)
                 logger.info(f"Conquista annullata: {conquest.name}")
                 results.append(schema_class(
                     id=conquest.id,
@@ -247,104 +347,76 @@ class CreationConditions:
         if results:
             return results
 
-    def check_area_conquest(self) -> Optional[list[schemas.AreaConquestResponse]]:
+    async def check_area_conquest(self) -> Optional[list[schemas.AreaConquestResponse]]:
         """
-        Verifica le condizioni di creazione per i campioni di area.
+        Verifica le condizioni di creazione per i campioni di area delle zone dei mostri catturati.
 
         Returns:
             Una lista di AreaConquestResponse contenente i campioni di area creati o annullati.
         """
-        return self.__conquests_checker(
-            elements_to_check={fiend.zone_id for fiend in self.captured_fiends},
+        return await self.__conquests_checker(
+            elements_to_check=(fiend.zone_id for fiend in self.captured_fiends),
             conquest_model=models.AreaConquest,
-            conquest_filter=lambda zone_id: models.AreaConquest.zone_id == zone_id,
-            missing_captures_target=models.Fiend,
-            missing_captures_filter=lambda zone_id, _: and_(models.Fiend.zone_id == zone_id,
-                                                            models.Fiend.was_captured == 0),
+            conquest_key=models.AreaConquest.zone_id,
+            missing_captures_column=models.ZoneProgress.uncaptured_fiends,
+            missing_captures_key=models.ZoneProgress.zone_id,
             schema_class=schemas.AreaConquestResponse
         )
 
-    def check_species_conquest(self) -> Optional[list[schemas.SpeciesConquestResponse]]:
+    async def check_species_conquest(self) -> Optional[list[schemas.SpeciesConquestResponse]]:
         """
-        Verifica le condizioni di creazione per i campioni di specie.
+        Verifica le condizioni di creazione per i campioni di specie dei mostri catturati,
+        una sola volta per ogni specie distinta.
 
         Returns:
             Una lista di SpeciesConquestResponse contenente i campioni di specie creati o annullati.
         """
-        return self.__conquests_checker(
-            elements_to_check=self.captured_fiends,
+        return await self.__conquests_checker(
+            elements_to_check=(fiend.species_conquest_id for fiend in self.captured_fiends),
             conquest_model=models.SpeciesConquest,
-            conquest_filter=lambda fiend: models.SpeciesConquest.id == fiend.species_conquest_id,
-            missing_captures_target=models.Fiend,
-            missing_captures_filter=lambda fiend, conquest: and_(
-                models.Fiend.species_conquest_id == conquest.id,
-                models.Fiend.was_captured < conquest.required_fiends
-            ),
+            conquest_key=models.SpeciesConquest.id,
+            missing_captures_column=models.SpeciesConquestProgress.below_required_fiends,
+            missing_captures_key=models.SpeciesConquestProgress.species_conquest_id,
             schema_class=schemas.SpeciesConquestResponse
         )
 
     # Metodi per verificare la creazione di specifici prototipi zoolab
-    def check_mangiaterra(self):
-        return self.__originals_checker(
-            original_creation_name="mangiaterra",
-            create_condition=self.db.query(models.AreaConquest).filter(
-                models.AreaConquest.created
-            ).count() >= 2
+    async def check_mangiaterra(self):
+        return await self.__originals_checker(
+            original_creation_name="mangiaterra", create_condition=(await self.rules())["mangiaterra"]
         )
 
-    def check_titanosfera(self):
-        return self.__originals_checker(
-            original_creation_name="titanosfera",
-            create_condition=self.db.query(models.SpeciesConquest).filter(
-                models.SpeciesConquest.created
-            ).count() >= 2
+    async def check_titanosfera(self):
+        return await self.__originals_checker(
+            original_creation_name="titanosfera", create_condition=(await self.rules())["titanosfera"]
         )
 
-    def check_catastrophe(self):
-        return self.__originals_checker(
-            original_creation_name="catastrophe",
-            create_condition=self.db.query(models.AreaConquest).filter(
-                models.AreaConquest.created
-            ).count() >= 6
+    async def check_catastrophe(self):
+        return await self.__originals_checker(
+            original_creation_name="catastrophe", create_condition=(await self.rules())["catastrophe"]
         )
 
-    def check_vlakorados(self):
-        return self.__originals_checker(
-            original_creation_name="vlakorados",
-            create_condition=self.db.query(models.SpeciesConquest).filter(
-                models.SpeciesConquest.created
-            ).count() >= 6
+    async def check_vlakorados(self):
+        return await self.__originals_checker(
+            original_creation_name="vlakorados", create_condition=(await self.rules())["vlakorados"]
         )
 
-    def check_gasteropodos(self):
-        return self.__originals_checker(
-            original_creation_name="gasteropodos",
-            create_condition=self.db.query(models.AreaConquest).filter(
-                 models.AreaConquest.created == False
-            ).count() == 0
+    async def check_gasteropodos(self):
+        return await self.__originals_checker(
+            original_creation_name="gasteropodos", create_condition=(await self.rules())["gasteropodos"]
         )
 
-    def check_ultima_x(self):
-        return self.__originals_checker(
-            original_creation_name="ultima x",
-            create_condition=self.db.query(models.Fiend).filter(
-                models.Fiend.was_captured < 5
-            ).count() == 0
+    async def check_ultima_x(self):
+        return await self.__originals_checker(
+            original_creation_name="ultima x", create_condition=(await self.rules())["ultima x"]
         )
 
-    def check_shinryu(self):
-        gagazet_id = self.db.query(models.Zone.id).filter(models.Zone.name == "monte gagazet").scalar()
-
-        return self.__originals_checker(
-            original_creation_name="shinryu",
-            create_condition=self.db.query(models.Fiend).filter(
-                models.Fiend.zone_id == gagazet_id,
-                models.Fiend.name.in_(["splasher", "aquelous", "echeneis"]),
-                models.Fiend.was_captured < 2
-            ).count() == 0
+    async def check_shinryu(self):
+        return await self.__originals_checker(
+            original_creation_name="shinryu", create_condition=(await self.rules())["shinryu"]
         )
 
-    def check_il_supremo(self):
+    async def check_il_supremo(self):
         """
         Verifica se la creazione "il supremo" può essere sbloccata.
         La condizione è che tutti i mostri siano stati catturati 10 volte,
@@ -352,38 +424,6 @@ class CreationConditions:
 
         :return: Un oggetto OriginalCreationResponse se la condizione è soddisfatta.
         """
-        il_supremo_id = self.db.query(models.OriginalCreation.id).filter(models.OriginalCreation.name == "il supremo").scalar()
-
-        # Verifica che tutti i mostri siano stati catturati almeno 10 volte
-        all_fiends_captured = self.db.query(models.Fiend).filter(
-            models.Fiend.was_captured < 10
-        ).count() == 0
-
-        # Verifica che tutti i campioni di zona siano stati sconfitti
-        all_area_conquests_defeated = self.db.query(models.AreaConquest).filter(
-            models.AreaConquest.defeated == False
-        ).count() == 0
-
-        # Verifica che tutti i campioni di specie siano stati sconfitti
-        all_species_conquests_defeated = self.db.query(models.SpeciesConquest).filter(
-            models.SpeciesConquest.defeated == False
-        ).count() == 0
-
-        # Verifica che tutti i prototipi zoolab siano stati sconfitti
-        all_original_creations_defeated = self.db.query(models.OriginalCreation).filter(
-            models.OriginalCreation.defeated == False,
-            models.OriginalCreation.id != il_supremo_id
-        ).count() == 0
-
-        # La creazione "il supremo" può essere sbloccata solo se tutte le condizioni sono soddisfatte
-        create_condition = (
-                all_fiends_captured and
-                all_area_conquests_defeated and
-                all_species_conquests_defeated and
-                all_original_creations_defeated
+        return await self.__originals_checker(
+            original_creation_name="il supremo", create_condition=(await self.rules())["il supremo"]
         )
-
-        return self.__originals_checker(
-            original_creation_name="il supremo",
-            create_condition=create_condition
-        )
\ No newline at end of file
@@ -1,25 +1,137 @@
-# backend/app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_NAME
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from app.config import (
+    DATABASE_NAME, DATABASE_USER, DATABASE_HOST, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_STATEMENT_TIMEOUT, DB_APPLICATION_NAME, DB_BACKEND, SQLITE_MMAP_SIZE,
+    SQLITE_PATH
+)
+from app.db_pool import (
+    InstrumentedAsyncQueuePool, InstrumentedQueuePool, application_name, request_read_only, request_tag
+)
+from app.sqlite_catalogue import prepare_sqlite_database, remove_database
 
-# Configura l'URL del database
-DATABASE_URL = f"postgresql://mr.anderson2159@localhost/{DATABASE_NAME}"
+# Parametri del pool di connessioni comuni ai due engine
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
+)
 
-# Crea l'engine per la connessione al database
-engine = create_engine(DATABASE_URL)
+if DB_BACKEND == "sqlite":
+    # Database SQLite locale, creato dal catalogo precompilato se non esiste
+    SQLITE_FILE = prepare_sqlite_database(SQLITE_PATH)
+    DATABASE_URL = f"sqlite:///{SQLITE_FILE}"
+    ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{SQLITE_FILE}"
+
+    engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **POOL_OPTIONS)
+else:
+    # Configura l'URL del database. Il driver psycopg2 è indicato esplicitamente: è quello installato dai requisiti
+    # ed è necessario per i COPY delle istantanee del catalogo (SQLAlchemy 2.1 userebbe psycopg 3 di default)
+    DATABASE_URL = f"postgresql+psycopg2://{DATABASE_USER}@{DATABASE_HOST}/{DATABASE_NAME}"
+
+    # URL del database per il driver asincrono (asyncpg), usato dalle rotte FastAPI
+    ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DATABASE_USER}@{DATABASE_HOST}/{DATABASE_NAME}"
+
+    # Impostazioni di sessione di PostgreSQL applicate ad ogni nuova connessione
+    SERVER_SETTINGS = {"application_name": application_name(DB_APPLICATION_NAME)}
+    if DB_STATEMENT_TIMEOUT > 0:
+        SERVER_SETTINGS["statement_timeout"] = str(DB_STATEMENT_TIMEOUT)
+
+    # Crea l'engine per la connessione al database
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        connect_args={"options": " ".join(f"-c {name}={value}" for name, value in SERVER_SETTINGS.items())},
+        **POOL_OPTIONS
+    )
+
+    # Crea l'engine asincrono. Le sessioni asincrone sono usate dalle rotte FastAPI
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args={"server_settings": SERVER_SETTINGS},
+        **POOL_OPTIONS
+    )
 
 # Configura la sessione
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessione asincrona. Gli oggetti non vengono invalidati dopo il commit,
+# perché in una sessione asincrona il ricaricamento implicito degli attributi non è consentito.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # Crea la classe base per i modelli
 Base = declarative_base()
 
 
-# Dependency per la connessione al database
+@event.listens_for(Session, "after_begin")
+def tag_transaction(session, transaction, connection):
+    """
+    All'inizio di ogni transazione avviata durante una richiesta HTTP imposta application_name
+    (solo per la transazione) con il tag della richiesta, così le query in corso sono riconoscibili
+    in pg_stat_activity. Vale anche per le sessioni asincrone, che usano internamente una `Session`.
+    """
+    tag = request_tag.get()
+    if tag and connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT set_config('application_name', :name, true)"), {"name": application_name(tag)})
+
+
+def configure_sqlite(sqlite_engine) -> None:
+    """
+    Configura le connessioni SQLite di un engine: chiavi esterne attive, write-ahead log (le letture non
+    bloccano le scritture), attesa del lock fino a DB_POOL_TIMEOUT e letture tramite memory map.
+
+    Le transazioni vengono aperte esplicitamente: quelle delle richieste che possono scrivere con
+    BEGIN IMMEDIATE, che acquisisce subito il lock di scrittura. Così le scritture concorrenti si accodano
+    come con i lock di riga di PostgreSQL, invece di fallire quando una transazione che ha già letto
+    prova a scrivere dopo un'altra.
+    """
+    @event.listens_for(sqlite_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout = {DB_POOL_TIMEOUT * 1000}")
+        cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+        cursor.close()
+
+    @event.listens_for(sqlite_engine, "begin")
+    def begin_transaction(connection):
+        connection.exec_driver_sql("BEGIN" if request_read_only.get() else "BEGIN IMMEDIATE")
+
+
+if DB_BACKEND == "sqlite":
+    configure_sqlite(engine)
+    configure_sqlite(async_engine.sync_engine)
+
+
+async def close_databases() -> None:
+    """
+    Chiude le connessioni di entrambi gli engine. Con SQLITE_PATH=":memory:" elimina anche la copia temporanea
+    del database: alla chiusura del server con un segnale le funzioni registrate con `atexit` non vengono eseguite.
+    """
+    await async_engine.dispose()
+    engine.dispose()
+    if DB_BACKEND == "sqlite" and SQLITE_PATH == ":memory:":
+        remove_database(SQLITE_FILE)
+
+
+# Dependency per la connessione al database (sincrona, usata da script come `populate_data` e all'avvio)
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependency per la connessione asincrona al database, usata dalle rotte
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,105 @@
+# backend/app/db_pool.py
+import contextvars
+import threading
+import time
+from typing import Optional
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Tag della richiesta HTTP in corso (per esempio "zoolab POST /fiends/update_captures"), impostato da un
+# middleware e usato come application_name delle transazioni, così le query sono riconoscibili in pg_stat_activity
+request_tag: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_tag", default=None)
+
+# Vero durante le richieste HTTP che non modificano dati (GET e HEAD): con SQLite le loro transazioni
+# non acquisiscono il lock di scrittura
+request_read_only: contextvars.ContextVar[bool] = contextvars.ContextVar("request_read_only", default=False)
+
+# Lunghezza massima di application_name accettata da PostgreSQL
+APPLICATION_NAME_MAX_LENGTH = 63
+
+
+class PoolStatsMixin:
+    """
+    Mixin per i pool di connessioni di SQLAlchemy che registra il numero di connessioni prelevate dal pool,
+    il tempo di attesa per ottenerle e i timeout, da esporre tramite `/debug/pool`.
+
+    Le statistiche sono per istanza del pool e ripartono da zero quando il pool viene ricreato (per esempio
+    dopo `engine.dispose()`).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _do_get(self):
+        # `_do_get` è il punto in cui il pool attende una connessione libera (o ne apre una nuova)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            logger.warning("Timeout in attesa di una connessione dal pool")
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+    def wait_stats(self) -> dict:
+        """Restituisce le statistiche di attesa registrate dal pool."""
+        with self._stats_lock:
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(PoolStatsMixin, QueuePool):
+    """Pool di connessioni dell'engine sincrono, con statistiche di attesa."""
+
+
+class InstrumentedAsyncQueuePool(PoolStatsMixin, AsyncAdaptedQueuePool):
+    """Pool di connessioni dell'engine asincrono, con statistiche di attesa."""
+
+
+def pool_status(pool: Pool) -> dict:
+    """
+    Restituisce lo stato attuale di un pool di connessioni: dimensione, connessioni libere e in uso,
+    overflow e, se il pool è instrumentato, le statistiche di attesa.
+
+    :param pool: Pool di connessioni dell'engine.
+    :return: Dizionario con lo stato del pool.
+    """
+    status = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status |= {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+        }
+
+    if isinstance(pool, PoolStatsMixin):
+        status |= pool.wait_stats()
+
+    return status
+
+
+def application_name(tag: str) -> str:
+    """Tronca il tag alla lunghezza massima consentita per application_name."""
+    return tag[:APPLICATION_NAME_MAX_LENGTH]
@@ -0,0 +1,252 @@
+# backend/app/events.py
+from typing import Any, Iterable, Optional
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from app import models
+from app.config import EVENT_COMPACTION_INTERVAL
+from app.progress import CATALOGUE_STATES, CONQUEST_STATES, STATE_KEYS, rebuild_progress, reset_game
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Azioni dell'utente che possono essere annullate e ripristinate
+UNDOABLE_KINDS = ("captures", "defeat")
+
+# Modelli delle conquiste indicizzati per nome della tabella, come salvati nel payload degli eventi `defeat`
+CONQUEST_MODELS = {model.__tablename__: model for model in CONQUEST_STATES}
+
+# Il registro degli eventi di una partita è append-only: ogni scrittura dei progressi (catture, sconfitte,
+# reset) aggiunge un evento nella stessa transazione che aggiorna le tabelle di stato, che restano la vista
+# materializzata usata da letture e verifiche delle condizioni. Payload degli eventi:
+#   - captures: {"updates": [[fiend_id, delta], ...], "flags": [[tabella, ID, [created, defeated] precedenti,
+#     [created, defeated] nuovi], ...]}, con le variazioni nell'ordine della richiesta e i flag delle conquiste
+#     create o annullate di conseguenza (assenti negli eventi registrati prima della loro introduzione);
+#   - defeat: {"conquest": <tabella>, "id": <ID>, "defeated": <nuovo valore>, "previous": <valore precedente>};
+#   - reset: {};
+#   - undo / redo: {"action": <captures|defeat>, ...payload dell'azione applicata}, con `target_id` uguale
+#     all'evento annullato o all'annullamento ripristinato.
+# Ogni EVENT_COMPACTION_INTERVAL eventi (e dopo ogni reset) viene scritta un'istantanea dello stato della partita;
+# gli eventi precedenti alla penultima istantanea vengono eliminati.
+
+
+def event_action(event: models.ProgressEvent) -> str:
+    """Restituisce il tipo di azione applicata da un evento (per annullamenti e ripristini, quella del payload)."""
+    return event.payload.get("action", event.kind)
+
+
+def inverse_payload(action: str, payload: dict) -> dict:
+    """
+    Calcola il payload dell'azione inversa: variazioni di cattura opposte in ordine inverso, con i flag
+    delle conquiste da riportare ai valori precedenti, oppure il ripristino del flag `defeated` precedente.
+
+    :param action: Tipo di azione (`captures` o `defeat`).
+    :param payload: Payload dell'azione da invertire.
+    :return: Payload dell'azione inversa, con la chiave `action`.
+    """
+    if action == "captures":
+        return {
+            "action": action,
+            "updates": [[fiend_id, -delta] for fiend_id, delta in reversed(payload["updates"])],
+            "flags": [[tablename, conquest_id, after, before]
+                      for tablename, conquest_id, before, after in payload.get("flags", [])]
+        }
+    return {
+        "action": action,
+        "conquest": payload["conquest"],
+        "id": payload["id"],
+        "defeated": payload["previous"],
+        "previous": payload["defeated"]
+    }
+
+
+def progress_state(db: Session, save_id: int) -> dict[str, list[list[Any]]]:
+    """
+    Legge lo stato attuale di una partita dalle tabelle di stato: per ogni tipo di elemento del catalogo,
+    le righe [ID, colonne di stato...] in ordine di ID.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :return: Stato della partita, serializzabile in JSON.
+    """
+    state = {}
+    for catalogue_model, state_model in CATALOGUE_STATES.items():
+        key = STATE_KEYS[state_model]
+        columns = [column for column in state_model.__table__.columns if not column.primary_key]
+        rows = db.query(key, *columns).filter(state_model.save_id == save_id).order_by(key).all()
+        state[catalogue_model.__tablename__] = [list(row) for row in rows]
+    return state
+
+
+def latest_snapshot(db: Session, save_id: int) -> Optional[models.EventSnapshot]:
+    """Restituisce l'istantanea più recente di una partita, se esiste."""
+    return (
+        db.query(models.EventSnapshot)
+        .filter(models.EventSnapshot.save_id == save_id)
+        .order_by(models.EventSnapshot.last_event_id.desc(), models.EventSnapshot.id.desc())
+        .first()
+    )
+
+
+def write_snapshot(db: Session, save_id: int) -> models.EventSnapshot:
+    """
+    Scrive un'istantanea dello stato attuale di una partita, aggiornata all'ultimo evento registrato, ed elimina
+    gli eventi e le istantanee precedenti alla penultima istantanea.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :return: L'istantanea scritta.
+    """
+    last_event_id = (
+        db.query(func.max(models.ProgressEvent.id)).filter(models.ProgressEvent.save_id == save_id).scalar() or 0
+    )
+    previous = latest_snapshot(db, save_id)
+    snapshot = models.EventSnapshot(save_id=save_id, last_event_id=last_event_id, state=progress_state(db, save_id))
+    db.add(snapshot)
+    db.flush()
+
+    if previous:
+        db.query(models.ProgressEvent).filter(
+            models.ProgressEvent.save_id == save_id,
+            models.ProgressEvent.id <= previous.last_event_id
+        ).delete(synchronize_session=False)
+        db.query(models.EventSnapshot).filter(
+            models.EventSnapshot.save_id == save_id,
+            models.EventSnapshot.id.notin_([previous.id, snapshot.id])
+        ).delete(synchronize_session=False)
+
+    logger.info(f"Istantanea della partita {save_id} scritta all'evento {last_event_id}")
+    return snapshot
+
+
+def ensure_snapshot(db: Session, save_id: int) -> None:
+    """
+    Scrive la prima istantanea di una partita che non ne ha (partita nuova o creata prima del registro
+    degli eventi), così lo stato attuale può essere sempre ricostruito dal registro.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    if not latest_snapshot(db, save_id):
+        write_snapshot(db, save_id)
+
+
+def record_event(
+        db: Session,
+        save_id: int,
+        kind: str,
+        payload: dict,
+        target_id: Optional[int] = None,
+        snapshot: bool = False
+) -> models.ProgressEvent:
+    """
+    Aggiunge un evento al registro dei progressi di una partita, nella transazione della modifica
+    che descrive, e scrive una nuova istantanea se dall'ultima sono stati registrati
+    EVENT_COMPACTION_INTERVAL eventi.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param kind: Tipo di evento.
+    :param payload: Dati dell'evento.
+    :param target_id: ID dell'evento annullato o ripristinato (solo per `undo` e `redo`).
+    :param snapshot: Se True, scrive comunque una nuova istantanea (per esempio dopo un reset).
+    :return: L'evento registrato.
+    """
+    event = models.ProgressEvent(save_id=save_id, kind=kind, payload=payload, target_id=target_id)
+    db.add(event)
+    db.flush()
+
+    if not snapshot:
+        last = latest_snapshot(db, save_id)
+        pending = (
+            db.query(func.count(models.ProgressEvent.id))
+            .filter(
+                models.ProgressEvent.save_id == save_id,
+                models.ProgressEvent.id > (last.last_event_id if last else 0)
+            )
+            .scalar()
+        )
+        snapshot = pending >= EVENT_COMPACTION_INTERVAL
+
+    if snapshot:
+        write_snapshot(db, save_id)
+    return event
+
+
+def tail_events(db: Session, save_id: int, after_id: int = 0) -> list[models.ProgressEvent]:
+    """Restituisce gli eventi di una partita successivi all'evento `after_id`, in ordine di registrazione."""
+    return (
+        db.query(models.ProgressEvent)
+        .filter(models.ProgressEvent.save_id == save_id, models.ProgressEvent.id > after_id)
+        .order_by(models.ProgressEvent.id)
+        .all()
+    )
+
+
+def undo_target(events: Iterable[models.ProgressEvent]) -> Optional[models.ProgressEvent]:
+    """
+    Individua l'azione da annullare: l'azione più recente (catture, sconfitta o ripristino) non ancora annullata.
+    Un reset interrompe la ricerca, perché non può essere annullato.
+
+    :param events: Eventi della partita, dal più recente al più vecchio.
+    :return: L'evento da annullare, oppure None.
+    """
+    undone = 0
+    for event in events:
+        if event.kind == "reset":
+            return None
+        if event.kind == "undo":
+            undone += 1
+        elif undone:
+            undone -= 1
+        else:
+            return event
+    return None
+
+
+def redo_target(events: Iterable[models.ProgressEvent]) -> Optional[models.ProgressEvent]:
+    """
+    Individua l'annullamento da ripristinare: l'annullamento più recente non ancora ripristinato,
+    purché dopo di esso non sia stata registrata una nuova azione.
+
+    :param events: Eventi della partita, dal più recente al più vecchio.
+    :return: L'evento di annullamento da ripristinare, oppure None.
+    """
+    redone = 0
+    for event in events:
+        if event.kind == "redo":
+            redone += 1
+        elif event.kind == "undo":
+            if not redone:
+                return event
+            redone -= 1
+        else:
+            return None
+    return None
+
+
+def restore_snapshot(db: Session, save_id: int, snapshot: models.EventSnapshot) -> None:
+    """
+    Riporta le tabelle di stato di una partita ai valori di un'istantanea e ricostruisce le tabelle di riepilogo.
+    Gli elementi aggiunti al catalogo dopo l'istantanea restano allo stato iniziale.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param snapshot: Istantanea da ripristinare.
+    """
+    reset_game(db, save_id)
+
+    for catalogue_model, state_model in CATALOGUE_STATES.items():
+        key = STATE_KEYS[state_model]
+        columns = [column.key for column in state_model.__table__.columns if not column.primary_key]
+        existing = {element_id for (element_id,) in db.query(key).filter(state_model.save_id == save_id)}
+        rows = [
+            {"save_id": save_id, key.key: row[0], **dict(zip(columns, row[1:]))}
+            for row in snapshot.state.get(catalogue_model.__tablename__, [])
+            if row[0] in existing
+        ]
+        if rows:
+            db.execute(update(state_model), rows)
+
+    db.flush()
+    rebuild_progress(db, save_id)
@@ -2,12 +2,18 @@
 
 import os
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.routers import zones, fiends, area_conquests, original_creations, species_conquests
-from app.config import CORS_ORIGINS, DEBUG_MODE
-from app.database import DATABASE_URL
+from app.routers import (
+    zones, fiends, area_conquests, original_creations, species_conquests, snapshot, saves, events, stream, debug
+)
+from app.config import CORS_ORIGINS, DEBUG_MODE, DB_APPLICATION_NAME
+from app.db_pool import request_read_only, request_tag
+from app.database import DATABASE_URL, SessionLocal, close_databases
+from app.saves import ensure_saves
+from app.reference_data import reference_data
+from app.routers.functions import build_full_details_documents
 
 # Definisce i colori per ciascuna parte del messaggio
 RESET = "\x1b[0m"
@@ -72,8 +78,66 @@ app.include_router(fiends.router)
 app.include_router(area_conquests.router)
 app.include_router(species_conquests.router)
 app.include_router(original_creations.router)
+app.include_router(snapshot.router)
+app.include_router(saves.router)
+app.include_router(events.router)
+app.include_router(stream.router)
+
+# Le rotte di diagnostica (pool di connessioni e accorpamento delle catture) sono esposte solo in modalità debug
+if DEBUG_MODE:
+    app.include_router(debug.router)
+
+
+@app.middleware("http")
+async def tag_database_requests(request: Request, call_next):
+    """
+    Associa alla richiesta il tag usato come application_name delle transazioni sul database
+    (per esempio "zoolab POST /fiends/update_captures") e indica se la richiesta è in sola lettura.
+    """
+    token = request_tag.set(f"{DB_APPLICATION_NAME} {request.method} {request.url.path}")
+    read_only_token = request_read_only.set(request.method in ("GET", "HEAD"))
+    try:
+        return await call_next(request)
+    finally:
+        request_read_only.reset(read_only_token)
+        request_tag.reset(token)
+
+
+@app.on_event("startup")
+def ensure_progress_summary():
+    """
+    Crea la partita predefinita se non esiste e allinea le righe di stato e le tabelle di riepilogo dei progressi
+    di tutte le partite ai dati presenti nel database, ricostruendole se mancano righe (per esempio dopo
+    l'aggiunta di elementi al catalogo).
+    """
+    db = SessionLocal()
+    try:
+        ensure_saves(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+async def close_database_connections():
+    """Chiude le connessioni al database alla chiusura del server."""
+    await close_databases()
 
 
 @app.get("/")
 def read_root():
     return {"message": "Final Fantasy X Copilot"}
+
+
+@app.on_event("startup")
+def load_reference_data():
+    """
+    Carica in memoria i dati di riferimento immutabili e costruisce i documenti precalcolati
+    dei dettagli completi delle conquiste.
+    """
+    db = SessionLocal()
+    try:
+        reference_data.load(db)
+        build_full_details_documents(db)
+    finally:
+        db.close()
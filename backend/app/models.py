@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, CheckConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, CheckConstraint, Index, JSON, DateTime, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -9,6 +9,19 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
 
+    saves = relationship("Save", back_populates="user")
+
+
+class Save(Base):
+    """Partita tracciata dal server. Tutti i progressi di gioco (catture, flag delle conquiste, riepiloghi
+    e contatori) sono memorizzati in tabelle di stato indicizzate per (save_id, ID dell'elemento)."""
+    __tablename__ = "saves"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    user = relationship("User", back_populates="saves")
+
 
 class Item(Base):
     __tablename__ = "items"
@@ -34,6 +47,7 @@ class Zone(Base):
     fiends = relationship("Fiend", back_populates="zone")
     found_fiends = relationship("CanBeFound", back_populates="zone")
     area_conquests = relationship("AreaConquest", back_populates="zone")
+    progress = relationship("ZoneProgress", back_populates="zone")
 
 
 class SpeciesConquest(Base):
@@ -42,8 +56,6 @@ class SpeciesConquest(Base):
     name = Column(String, index=True, unique=True, nullable=False)
     image_url = Column(String, unique=True)
     required_fiends = Column(Integer, nullable=False)
-    created = Column(Boolean, default=False, index=True)
-    defeated = Column(Boolean, default=False, index=True)
 
     fiends = relationship("Fiend", back_populates="species_conquest")
     rewards = relationship("SpeciesConquestReward", back_populates="species_conquest")
@@ -51,13 +63,14 @@ class SpeciesConquest(Base):
     weaknesses = relationship("SpeciesConquestWeakness", back_populates="species_conquest")
     resistances = relationship("SpeciesConquestResistance", back_populates="species_conquest")
     stats = relationship("SpeciesConquestStats", back_populates="species_conquest")
+    progress = relationship("SpeciesConquestProgress", back_populates="species_conquest")
+    states = relationship("SpeciesConquestState", back_populates="species_conquest")
 
 
 class Fiend(Base):
     __tablename__ = "fiends"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, unique=True, nullable=False)
-    was_captured = Column(Integer, default=0)
     zone_id = Column(Integer, ForeignKey("zones.id", onupdate="CASCADE"), nullable=False)
     image_url = Column(String, unique=True)
     species_conquest_id = Column(Integer, ForeignKey("species_conquests.id", onupdate="CASCADE"), nullable=True)
@@ -70,6 +83,165 @@ class Fiend(Base):
     weaknesses = relationship("FiendWeakness", back_populates="fiend")
     resistances = relationship("FiendResistance", back_populates="fiend")
     stats = relationship("FiendStats", back_populates="fiend")
+    captures = relationship("FiendCapture", back_populates="fiend")
+
+
+class FiendCapture(Base):
+    """Numero di catture di un mostro in una partita."""
+    __tablename__ = "fiend_captures"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    fiend_id = Column(Integer, ForeignKey("fiends.id", onupdate="CASCADE"), primary_key=True)
+    was_captured = Column(Integer,
+                          CheckConstraint("was_captured BETWEEN 0 AND 10", name="valid_was_captured"),
+                          nullable=False, default=0)
+
+    # Indice di copertura: le letture delle catture di una partita non accedono alla tabella
+    __table_args__ = (
+        Index("ix_fiend_captures_save_covering", "save_id", "fiend_id", postgresql_include=["was_captured"]),
+    )
+
+    fiend = relationship("Fiend", back_populates="captures")
+
+
+class AreaConquestState(Base):
+    """Flag `created` e `defeated` di un campione di zona in una partita."""
+    __tablename__ = "area_conquest_states"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    area_conquest_id = Column(Integer, ForeignKey("area_conquests.id", onupdate="CASCADE"), primary_key=True)
+    created = Column(Boolean, nullable=False, default=False)
+    defeated = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_area_conquest_states_save_covering", "save_id", "area_conquest_id",
+              postgresql_include=["created", "defeated"]),
+    )
+
+    area_conquest = relationship("AreaConquest", back_populates="states")
+
+
+class SpeciesConquestState(Base):
+    """Flag `created` e `defeated` di un campione di specie in una partita."""
+    __tablename__ = "species_conquest_states"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    species_conquest_id = Column(Integer, ForeignKey("species_conquests.id", onupdate="CASCADE"), primary_key=True)
+    created = Column(Boolean, nullable=False, default=False)
+    defeated = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_species_conquest_states_save_covering", "save_id", "species_conquest_id",
+              postgresql_include=["created", "defeated"]),
+    )
+
+    species_conquest = relationship("SpeciesConquest", back_populates="states")
+
+
+class OriginalCreationState(Base):
+    """Flag `created` e `defeated` di un prototipo zoolab in una partita."""
+    __tablename__ = "original_creation_states"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    original_creation_id = Column(Integer, ForeignKey("original_creations.id", onupdate="CASCADE"),
+                                  primary_key=True)
+    created = Column(Boolean, nullable=False, default=False)
+    defeated = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_original_creation_states_save_covering", "save_id", "original_creation_id",
+              postgresql_include=["created", "defeated"]),
+    )
+
+    original_creation = relationship("OriginalCreation", back_populates="states")
+
+
+class ZoneProgress(Base):
+    """Riepilogo delle catture dei mostri nativi di una zona in una partita, aggiornato ad ogni variazione
+    delle catture."""
+    __tablename__ = "zone_progress"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    zone_id = Column(Integer, ForeignKey("zones.id", onupdate="CASCADE"), primary_key=True, index=True)
+    total_fiends = Column(Integer, nullable=False, default=0)
+    uncaptured_fiends = Column(Integer, nullable=False, default=0)
+    completed_fiends = Column(Integer, nullable=False, default=0)
+
+    zone = relationship("Zone", back_populates="progress")
+
+
+class SpeciesConquestProgress(Base):
+    """Riepilogo delle catture dei mostri di una specie in una partita, aggiornato ad ogni variazione
+    delle catture."""
+    __tablename__ = "species_conquest_progress"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    species_conquest_id = Column(Integer, ForeignKey("species_conquests.id", onupdate="CASCADE"), primary_key=True,
+                                 index=True)
+    total_fiends = Column(Integer, nullable=False, default=0)
+    uncaptured_fiends = Column(Integer, nullable=False, default=0)
+    below_required_fiends = Column(Integer, nullable=False, default=0)
+    completed_fiends = Column(Integer, nullable=False, default=0)
+
+    species_conquest = relationship("SpeciesConquest", back_populates="progress")
+
+
+class ProgressCounters(Base):
+    """Contatori globali dei progressi di una partita, aggiornati in modo incrementale e usati per valutare
+    le condizioni di creazione dei prototipi zoolab senza scansioni delle tabelle."""
+    __tablename__ = "progress_counters"
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), primary_key=True)
+    area_conquests_created = Column(Integer, nullable=False, default=0)
+    area_conquests_uncreated = Column(Integer, nullable=False, default=0)
+    area_conquests_undefeated = Column(Integer, nullable=False, default=0)
+    species_conquests_created = Column(Integer, nullable=False, default=0)
+    species_conquests_undefeated = Column(Integer, nullable=False, default=0)
+    original_creations_undefeated = Column(Integer, nullable=False, default=0)
+    fiends_below_five = Column(Integer, nullable=False, default=0)
+    fiends_below_ten = Column(Integer, nullable=False, default=0)
+    shinryu_fiends_below_two = Column(Integer, nullable=False, default=0)
+    # Versione dei progressi della partita, usata per l'ETag delle risposte e per il flusso delle modifiche
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class CatalogueVersion(Base):
+    """Versione del catalogo nel database, incrementata da ogni popolamento, reseed o ripristino che lo modifica.
+    Permette ai processi del server di accorgersi delle modifiche eseguite da altri processi e di ricaricare
+    la cache dei dati di riferimento. La tabella contiene al più una riga."""
+    __tablename__ = "catalogue_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ProgressEvent(Base):
+    """Evento del registro append-only dei progressi di una partita: variazione delle catture, sconfitta
+    di una conquista, reset, annullamento o ripristino di un'azione precedente. Lo stato attuale della partita
+    è ricostruibile dall'ultima istantanea (`EventSnapshot`) applicando in ordine gli eventi successivi."""
+    __tablename__ = "progress_events"
+    id = Column(Integer, primary_key=True, index=True)
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String,
+                  CheckConstraint("kind IN ('captures', 'defeat', 'reset', 'undo', 'redo')", name="valid_event_kind"),
+                  nullable=False)
+    payload = Column(JSON, nullable=False)
+    target_id = Column(Integer, ForeignKey("progress_events.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Gli eventi di una partita vengono sempre letti in ordine di ID a partire da un'istantanea
+    __table_args__ = (
+        Index("ix_progress_events_save_id_id", "save_id", "id"),
+    )
+    # `created_at` viene letto con RETURNING all'inserimento, così l'evento è serializzabile dopo il commit
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class EventSnapshot(Base):
+    """Istantanea dello stato di una partita (catture e flag delle conquiste) dopo l'evento `last_event_id`,
+    scritta periodicamente per compattare il registro degli eventi."""
+    __tablename__ = "event_snapshots"
+    id = Column(Integer, primary_key=True, index=True)
+    save_id = Column(Integer, ForeignKey("saves.id", ondelete="CASCADE"), nullable=False)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    state = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_event_snapshots_save_id_last_event_id", "save_id", "last_event_id"),
+    )
 
 
 class UniqueFiend(Base):
@@ -85,8 +257,6 @@ class AreaConquest(Base):
     name = Column(String, index=True, unique=True, nullable=False)
     image_url = Column(String, unique=True)
     zone_id = Column(Integer, ForeignKey("zones.id", onupdate="CASCADE"))
-    created = Column(Boolean, default=False, index=True)
-    defeated = Column(Boolean, default=False, index=True)
 
     zone = relationship("Zone", back_populates="area_conquests")
     rewards = relationship("AreaConquestReward", back_populates="area_conquest")
@@ -94,6 +264,7 @@ class AreaConquest(Base):
     weaknesses = relationship("AreaConquestWeakness", back_populates="area_conquest")
     resistances = relationship("AreaConquestResistance", back_populates="area_conquest")
     stats = relationship("AreaConquestStats", back_populates="area_conquest")
+    states = relationship("AreaConquestState", back_populates="area_conquest")
 
 
 class OriginalCreation(Base):
@@ -101,15 +272,14 @@ class OriginalCreation(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, unique=True, nullable=False)
     image_url = Column(String, unique=True)
-    created = Column(Boolean, default=False, index=True)
     creation_rule = Column(String)
-    defeated = Column(Boolean, default=False, index=True)
 
     rewards = relationship("OriginalCreationReward", back_populates="original_creation")
     equipment_rewards = relationship("OriginalCreationEquipmentReward", back_populates="original_creation")
     weaknesses = relationship("OriginalCreationWeakness", back_populates="original_creation")
     resistances = relationship("OriginalCreationResistance", back_populates="original_creation")
     stats = relationship("OriginalCreationStats", back_populates="original_creation")
+    states = relationship("OriginalCreationState", back_populates="original_creation")
 
 
 class CanBeFound(Base):
@@ -0,0 +1,560 @@
+# backend/app/progress.py
+from collections import defaultdict
+from typing import Iterable, Optional, Union
+from sqlalchemy import and_, case, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+from app import models
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Numero massimo di catture per un singolo mostro
+MAX_CAPTURES = 10
+
+# Catture minime richieste a tutti i mostri per il prototipo "ultima x"
+ULTIMA_X_CAPTURES = 5
+
+# Mostri del monte Gagazet da catturare almeno due volte per il prototipo "shinryu"
+SHINRYU_ZONE = "monte gagazet"
+SHINRYU_FIENDS = ("splasher", "aquelous", "echeneis")
+SHINRYU_CAPTURES = 2
+
+# Prototipo escluso dal conteggio dei prototipi da sconfiggere, perché è esso stesso la ricompensa finale
+IL_SUPREMO = "il supremo"
+
+# Tabella di stato per partita di ciascun tipo di conquista
+CONQUEST_STATES = {
+    models.AreaConquest: models.AreaConquestState,
+    models.SpeciesConquest: models.SpeciesConquestState,
+    models.OriginalCreation: models.OriginalCreationState,
+}
+
+# Chiave di `Session.info` con le modifiche dei flag delle conquiste non ancora registrate (`pop_flag_changes`)
+FLAG_CHANGES = "conquest_flag_changes"
+
+# Tabella di stato per partita di ciascun elemento del catalogo con progressi (mostri e conquiste)
+CATALOGUE_STATES = {models.Fiend: models.FiendCapture, **CONQUEST_STATES}
+
+# Tabelle di stato per partita, con la colonna che identifica l'elemento del catalogo,
+# nell'ordine in cui le relative righe vengono bloccate
+STATE_KEYS = {
+    models.FiendCapture: models.FiendCapture.fiend_id,
+    models.AreaConquestState: models.AreaConquestState.area_conquest_id,
+    models.SpeciesConquestState: models.SpeciesConquestState.species_conquest_id,
+    models.OriginalCreationState: models.OriginalCreationState.original_creation_id,
+}
+
+# Colonne dei contatori globali aggiornate dai flag `created` e `defeated` di ciascun tipo di conquista
+CREATED_COUNTERS = {
+    "area_conquests": ("area_conquests_created", "area_conquests_uncreated"),
+    "species_conquests": ("species_conquests_created", None),
+    "original_creations": (None, None),
+}
+UNDEFEATED_COUNTERS = {
+    "area_conquests": "area_conquests_undefeated",
+    "species_conquests": "species_conquests_undefeated",
+    "original_creations": "original_creations_undefeated",
+}
+
+
+def ensure_states(db: Session, save_id: int) -> int:
+    """
+    Crea le righe di stato mancanti di una partita (catture a zero, conquiste non create e non sconfitte),
+    per esempio per una partita nuova o dopo l'aggiunta di elementi al catalogo.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :return: Numero di righe di stato create.
+    """
+    created = 0
+
+    for catalogue_model, state_model in CATALOGUE_STATES.items():
+        key = STATE_KEYS[state_model]
+        missing = select(literal(save_id), catalogue_model.id).where(
+            ~exists().where(state_model.save_id == save_id, key == catalogue_model.id)
+        )
+        result = db.execute(insert(state_model).from_select([state_model.save_id, key], missing))
+        created += max(result.rowcount, 0)
+
+    if created:
+        logger.info(f"Create {created} righe di stato per la partita {save_id}")
+    return created
+
+
+def rebuild_progress(db: Session, save_id: int) -> None:
+    """
+    Ricalcola da zero le tabelle di riepilogo dei progressi (zone e campioni di specie) di una partita
+    a partire dalle catture registrate.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    logger.info(f"Ricostruzione delle tabelle di riepilogo dei progressi della partita {save_id}")
+    captures = func.coalesce(models.FiendCapture.was_captured, 0)
+    save_captures = and_(models.FiendCapture.fiend_id == models.Fiend.id, models.FiendCapture.save_id == save_id)
+
+    db.query(models.ZoneProgress).filter(models.ZoneProgress.save_id == save_id).delete()
+    db.query(models.SpeciesConquestProgress).filter(models.SpeciesConquestProgress.save_id == save_id).delete()
+
+    # Conteggi per zona: i valori di `case` valgono l'ID del mostro, così le zone senza mostri restano a zero
+    zone_rows = (
+        db.query(
+            models.Zone.id,
+            func.count(models.Fiend.id),
+            func.count(case((captures == 0, models.Fiend.id))),
+            func.count(case((captures == MAX_CAPTURES, models.Fiend.id)))
+        )
+        .outerjoin(models.Fiend, models.Fiend.zone_id == models.Zone.id)
+        .outerjoin(models.FiendCapture, save_captures)
+        .group_by(models.Zone.id)
+        .all()
+    )
+    db.add_all([
+        models.ZoneProgress(
+            save_id=save_id,
+            zone_id=zone_id,
+            total_fiends=total,
+            uncaptured_fiends=uncaptured,
+            completed_fiends=completed
+        )
+        for zone_id, total, uncaptured, completed in zone_rows
+    ])
+
+    # Conteggi per campione di specie, confrontando le catture con la soglia richiesta dalla specie
+    species_rows = (
+        db.query(
+            models.SpeciesConquest.id,
+            func.count(models.Fiend.id),
+            func.count(case((captures == 0, models.Fiend.id))),
+            func.count(case((captures < models.SpeciesConquest.required_fiends, models.Fiend.id))),
+            func.count(case((captures == MAX_CAPTURES, models.Fiend.id)))
+        )
+        .outerjoin(models.Fiend, models.Fiend.species_conquest_id == models.SpeciesConquest.id)
+        .outerjoin(models.FiendCapture, save_captures)
+        .group_by(models.SpeciesConquest.id)
+        .all()
+    )
+    db.add_all([
+        models.SpeciesConquestProgress(
+            save_id=save_id,
+            species_conquest_id=species_conquest_id,
+            total_fiends=total,
+            uncaptured_fiends=uncaptured,
+            below_required_fiends=below_required,
+            completed_fiends=completed
+        )
+        for species_conquest_id, total, uncaptured, below_required, completed in species_rows
+    ])
+    db.flush()
+
+    rebuild_counters(db, save_id)
+
+
+def rebuild_counters(db: Session, save_id: int) -> None:
+    """
+    Ricalcola da zero i contatori globali dei progressi di una partita a partire dalle catture
+    e dai flag delle conquiste.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    logger.info(f"Ricostruzione dei contatori globali dei progressi della partita {save_id}")
+
+    # La versione dei progressi viene conservata e incrementata, perché i contatori possono essere cambiati
+    version = db.query(models.ProgressCounters.version).filter(models.ProgressCounters.save_id == save_id).scalar()
+    db.query(models.ProgressCounters).filter(models.ProgressCounters.save_id == save_id).delete()
+
+    def count(model, *criteria) -> int:
+        return db.query(func.count()).select_from(model).filter(model.save_id == save_id, *criteria).scalar()
+
+    area, species, original = models.AreaConquestState, models.SpeciesConquestState, models.OriginalCreationState
+    captures = models.FiendCapture
+
+    counters = models.ProgressCounters(
+        save_id=save_id,
+        area_conquests_created=count(area, area.created),
+        area_conquests_uncreated=count(area, area.created == False),
+        area_conquests_undefeated=count(area, area.defeated == False),
+        species_conquests_created=count(species, species.created),
+        species_conquests_undefeated=count(species, species.defeated == False),
+        original_creations_undefeated=(
+            db.query(func.count())
+            .select_from(original)
+            .join(models.OriginalCreation, models.OriginalCreation.id == original.original_creation_id)
+            .filter(
+                original.save_id == save_id,
+                original.defeated == False,
+                models.OriginalCreation.name != IL_SUPREMO
+            )
+            .scalar()
+        ),
+        fiends_below_five=count(captures, captures.was_captured < ULTIMA_X_CAPTURES),
+        fiends_below_ten=count(captures, captures.was_captured < MAX_CAPTURES),
+        shinryu_fiends_below_two=(
+            db.query(func.count(captures.fiend_id))
+            .join(models.Fiend, models.Fiend.id == captures.fiend_id)
+            .join(models.Zone, models.Zone.id == models.Fiend.zone_id)
+            .filter(
+                captures.save_id == save_id,
+                models.Zone.name == SHINRYU_ZONE,
+                models.Fiend.name.in_(SHINRYU_FIENDS),
+                captures.was_captured < SHINRYU_CAPTURES
+            )
+            .scalar()
+        ),
+        version=0 if version is None else version + 1
+    )
+    db.add(counters)
+    db.flush()
+
+
+def ensure_progress(db: Session, save_id: int) -> None:
+    """
+    Crea le righe di stato mancanti di una partita e ricostruisce le tabelle di riepilogo se non coprono
+    tutte le zone e tutti i campioni di specie (per esempio su una partita appena creata).
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    states_created = ensure_states(db, save_id)
+
+    zones_missing = (
+        db.query(models.ZoneProgress).filter(models.ZoneProgress.save_id == save_id).count()
+        != db.query(models.Zone).count()
+    )
+    species_missing = (
+        db.query(models.SpeciesConquestProgress).filter(models.SpeciesConquestProgress.save_id == save_id).count()
+        != db.query(models.SpeciesConquest).count()
+    )
+    if states_created or zones_missing or species_missing:
+        rebuild_progress(db, save_id)
+    elif not db.get(models.ProgressCounters, save_id):
+        rebuild_counters(db, save_id)
+
+
+def update_counters(db: Session, save_id: int, **deltas: int) -> None:
+    """
+    Incrementa (o decrementa) i contatori globali indicati di una partita con un unico UPDATE lato database.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param deltas: Variazioni da applicare, indicizzate per nome della colonna.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    db.query(models.ProgressCounters).filter(models.ProgressCounters.save_id == save_id).update({
+        getattr(models.ProgressCounters, name): getattr(models.ProgressCounters, name) + delta
+        for name, delta in deltas.items()
+    }, synchronize_session=False)
+
+
+def set_conquest_flags(
+        db: Session,
+        conquest: Union[models.AreaConquest, models.SpeciesConquest, models.OriginalCreation],
+        state: Union[models.AreaConquestState, models.SpeciesConquestState, models.OriginalCreationState],
+        *,
+        created: Optional[bool] = None,
+        defeated: Optional[bool] = None
+) -> None:
+    """
+    Imposta i flag `created` e/o `defeated` di una conquista in una partita, aggiornando nella stessa
+    transazione i contatori globali della partita che ne dipendono. La modifica viene annotata nella sessione,
+    così l'evento che la registra può salvare i flag precedenti (`pop_flag_changes`).
+
+    :param db: Sessione del database.
+    :param conquest: Conquista da aggiornare.
+    :param state: Riga di stato della conquista nella partita.
+    :param created: Nuovo valore del flag `created` (None per lasciarlo invariato).
+    :param defeated: Nuovo valore del flag `defeated` (None per lasciarlo invariato).
+    """
+    deltas = defaultdict(int)
+    tablename = conquest.__tablename__
+    changes = db.info.setdefault(FLAG_CHANGES, {})
+    key = (tablename, conquest.id)
+    before = changes[key][0] if key in changes else [bool(state.created), bool(state.defeated)]
+
+    if created is not None:
+        created_column, uncreated_column = CREATED_COUNTERS[tablename]
+        delta = int(created) - int(bool(state.created))
+        if created_column:
+            deltas[created_column] += delta
+        if uncreated_column:
+            deltas[uncreated_column] -= delta
+        state.created = created
+
+    if defeated is not None:
+        if not (tablename == "original_creations" and conquest.name == IL_SUPREMO):
+            deltas[UNDEFEATED_COUNTERS[tablename]] -= int(defeated) - int(bool(state.defeated))
+        state.defeated = defeated
+
+    changes[key] = (before, [bool(state.created), bool(state.defeated)])
+    update_counters(db, state.save_id, **deltas)
+
+
+def pop_flag_changes(db: Session) -> list[list]:
+    """
+    Restituisce e azzera le modifiche dei flag delle conquiste eseguite da `set_conquest_flags` nella sessione
+    dall'ultima chiamata, nel formato salvato nei payload degli eventi.
+
+    :param db: Sessione del database.
+    :return: Le modifiche [tabella, ID, [created, defeated] precedenti, [created, defeated] nuovi], in ordine di
+        tabella e di ID, escluse quelle che hanno riportato i flag ai valori iniziali.
+    """
+    changes = db.info.pop(FLAG_CHANGES, {})
+    return [
+        [tablename, conquest_id, before, after]
+        for (tablename, conquest_id), (before, after) in sorted(changes.items())
+        if before != after
+    ]
+
+
+def apply_captures(db: Session, save_id: int, changes: Iterable[tuple[models.Fiend, int, int]]) -> None:
+    """
+    Aggiorna in modo incrementale le tabelle di riepilogo di una partita in base alle variazioni di cattura.
+    Va chiamata nella stessa transazione che modifica `FiendCapture.was_captured`.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param changes: Terne (mostro, catture precedenti, nuove catture).
+    """
+    zone_deltas = defaultdict(lambda: [0, 0])
+    species_changes = defaultdict(list)
+    counter_deltas = defaultdict(int)
+
+    for fiend, old, new in changes:
+        old, new = old or 0, new or 0
+        counter_deltas["fiends_below_five"] += (new < ULTIMA_X_CAPTURES) - (old < ULTIMA_X_CAPTURES)
+        counter_deltas["fiends_below_ten"] += (new < MAX_CAPTURES) - (old < MAX_CAPTURES)
+        if fiend.name in SHINRYU_FIENDS and fiend.zone.name == SHINRYU_ZONE:
+            counter_deltas["shinryu_fiends_below_two"] += (new < SHINRYU_CAPTURES) - (old < SHINRYU_CAPTURES)
+
+        uncaptured_delta = (new == 0) - (old == 0)
+        completed_delta = (new == MAX_CAPTURES) - (old == MAX_CAPTURES)
+
+        zone_delta = zone_deltas[fiend.zone_id]
+        zone_delta[0] += uncaptured_delta
+        zone_delta[1] += completed_delta
+
+        if fiend.species_conquest_id is not None:
+            species_changes[fiend.species_conquest_id].append((old, new))
+
+    # Le righe di riepilogo vengono aggiornate in ordine crescente di ID, come previsto dall'ordine dei lock
+    for zone_id, (uncaptured_delta, completed_delta) in sorted(zone_deltas.items()):
+        if uncaptured_delta or completed_delta:
+            db.query(models.ZoneProgress).filter(
+                models.ZoneProgress.save_id == save_id,
+                models.ZoneProgress.zone_id == zone_id
+            ).update({
+                models.ZoneProgress.uncaptured_fiends: models.ZoneProgress.uncaptured_fiends + uncaptured_delta,
+                models.ZoneProgress.completed_fiends: models.ZoneProgress.completed_fiends + completed_delta
+            }, synchronize_session=False)
+
+    # Recupera con una sola query la soglia di catture richiesta dalle specie coinvolte
+    required = dict(
+        db.query(models.SpeciesConquest.id, models.SpeciesConquest.required_fiends)
+        .filter(models.SpeciesConquest.id.in_(species_changes.keys()))
+        .all()
+    ) if species_changes else {}
+
+    for species_conquest_id, species_deltas in sorted(species_changes.items()):
+        threshold = required[species_conquest_id]
+        uncaptured_delta = sum((new == 0) - (old == 0) for old, new in species_deltas)
+        below_delta = sum((new < threshold) - (old < threshold) for old, new in species_deltas)
+        completed_delta = sum((new == MAX_CAPTURES) - (old == MAX_CAPTURES) for old, new in species_deltas)
+
+        if uncaptured_delta or below_delta or completed_delta:
+            db.query(models.SpeciesConquestProgress).filter(
+                models.SpeciesConquestProgress.save_id == save_id,
+                models.SpeciesConquestProgress.species_conquest_id == species_conquest_id
+            ).update({
+                models.SpeciesConquestProgress.uncaptured_fiends:
+                    models.SpeciesConquestProgress.uncaptured_fiends + uncaptured_delta,
+                models.SpeciesConquestProgress.below_required_fiends:
+                    models.SpeciesConquestProgress.below_required_fiends + below_delta,
+                models.SpeciesConquestProgress.completed_fiends:
+                    models.SpeciesConquestProgress.completed_fiends + completed_delta
+            }, synchronize_session=False)
+
+    # I contatori globali sono l'ultima riga bloccata dalla transazione
+    update_counters(db, save_id, **counter_deltas)
+
+
+def reset_progress(db: Session, save_id: int) -> None:
+    """
+    Riporta le tabelle di riepilogo di una partita allo stato iniziale (nessun mostro catturato)
+    e ricalcola i contatori globali. Va chiamata nella stessa transazione che azzera le catture
+    e i flag delle conquiste della partita.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    db.query(models.ZoneProgress).filter(models.ZoneProgress.save_id == save_id).update({
+        models.ZoneProgress.uncaptured_fiends: models.ZoneProgress.total_fiends,
+        models.ZoneProgress.completed_fiends: 0
+    }, synchronize_session=False)
+
+    # Con zero catture un mostro è sotto soglia solo se la specie richiede almeno una cattura
+    below_required = (
+        db.query(models.SpeciesConquest.required_fiends)
+        .filter(models.SpeciesConquest.id == models.SpeciesConquestProgress.species_conquest_id)
+        .scalar_subquery()
+    )
+    db.query(models.SpeciesConquestProgress).filter(models.SpeciesConquestProgress.save_id == save_id).update({
+        models.SpeciesConquestProgress.uncaptured_fiends: models.SpeciesConquestProgress.total_fiends,
+        models.SpeciesConquestProgress.below_required_fiends: case(
+            (below_required > 0, models.SpeciesConquestProgress.total_fiends),
+            else_=0
+        ),
+        models.SpeciesConquestProgress.completed_fiends: 0
+    }, synchronize_session=False)
+
+    # Il reset è un'operazione rara: i contatori globali vengono ricalcolati dopo aver reso visibili le modifiche
+    db.flush()
+    rebuild_counters(db, save_id)
+
+
+# Ordine dei lock: tutte le transazioni che modificano i progressi di una partita bloccano le righe nello stesso
+# ordine, così le richieste concorrenti (per esempio da più dispositivi sulla stessa partita) si accodano senza
+# deadlock e senza perdere aggiornamenti:
+#   0. riga della partita, in modalità condivisa (`lock_save`), così non può essere eliminata durante la modifica;
+#   1. catture dei mostri, in ordine crescente di ID del mostro;
+#   2. stati dei campioni di zona, dei campioni di specie e dei prototipi zoolab, ciascuno in ordine crescente
+#      di ID della conquista;
+#   3. righe di riepilogo di zone e specie, in ordine crescente di ID (aggiornate da `apply_captures`);
+#   4. contatori globali (aggiornati da `update_counters`).
+# Le righe dei punti 0, 1 e 2 vengono bloccate esplicitamente all'inizio della transazione, prima di leggere
+# qualsiasi stato, mentre quelle dei punti 3 e 4 vengono bloccate dagli UPDATE nell'ordine indicato.
+# Tutte le righe appartengono alla partita: partite diverse non si bloccano a vicenda.
+# Su SQLite `FOR UPDATE` viene ignorato: le scritture sono già serializzate dal lock sul database.
+
+def lock_save(db: Session, save_id: int) -> bool:
+    """
+    Blocca in modalità condivisa (`SELECT ... FOR KEY SHARE`) la riga di una partita, come prima istruzione
+    delle transazioni che ne modificano i progressi: la partita può essere stata eliminata da un altro processo
+    dopo essere stata validata dalla cache di `app.saves`, e non può esserlo mentre la modifica è in corso.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :return: True se la partita esiste.
+    """
+    return db.execute(
+        select(models.Save.id).where(models.Save.id == save_id).with_for_update(read=True, key_share=True)
+    ).first() is not None
+
+
+def lock_rows(db: Session, state_model: type[models.Base], save_id: int, *criteria) -> list:
+    """
+    Blocca (`SELECT ... FOR UPDATE`) le righe di stato di una partita che soddisfano i criteri,
+    in ordine crescente di ID dell'elemento del catalogo.
+
+    :param db: Sessione del database.
+    :param state_model: Modello delle righe di stato da bloccare.
+    :param save_id: ID della partita.
+    :param criteria: Filtri opzionali sulle righe da bloccare.
+    :return: Gli ID degli elementi delle righe bloccate.
+    """
+    key = STATE_KEYS[state_model]
+    return (
+        db.query(key)
+        .filter(state_model.save_id == save_id, *criteria)
+        .order_by(key)
+        .with_for_update()
+        .all()
+    )
+
+
+def lock_for_captures(db: Session, save_id: int, fiend_ids: Iterable[int]) -> dict[int, tuple[models.Fiend, int]]:
+    """
+    Blocca le righe coinvolte da una variazione di cattura in una partita: le catture dei mostri indicati,
+    gli stati dei campioni di zona e di specie a cui appartengono e quelli dei prototipi zoolab,
+    le cui condizioni dipendono dai contatori globali.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param fiend_ids: ID dei mostri da aggiornare.
+    :return: I mostri trovati con le loro catture attuali nella partita, indicizzati per ID.
+    """
+    rows = (
+        db.query(models.Fiend, models.FiendCapture.was_captured)
+        .join(models.FiendCapture, models.FiendCapture.fiend_id == models.Fiend.id)
+        .filter(models.FiendCapture.save_id == save_id, models.Fiend.id.in_(list(fiend_ids)))
+        .order_by(models.Fiend.id)
+        .with_for_update(of=models.FiendCapture)
+        .all()
+    )
+    fiends = [fiend for fiend, _ in rows]
+    zone_ids = {fiend.zone_id for fiend in fiends}
+    species_conquest_ids = {fiend.species_conquest_id for fiend in fiends} - {None}
+
+    if zone_ids:
+        area_conquest_ids = select(models.AreaConquest.id).where(models.AreaConquest.zone_id.in_(zone_ids))
+        lock_rows(db, models.AreaConquestState, save_id,
+                  models.AreaConquestState.area_conquest_id.in_(area_conquest_ids))
+    if species_conquest_ids:
+        lock_rows(db, models.SpeciesConquestState, save_id,
+                  models.SpeciesConquestState.species_conquest_id.in_(species_conquest_ids))
+    lock_rows(db, models.OriginalCreationState, save_id)
+
+    return {fiend.id: (fiend, was_captured or 0) for fiend, was_captured in rows}
+
+
+def lock_for_defeat(db: Session, save_id: int, model: type[models.Base], obj_id: int) -> None:
+    """
+    Blocca le righe coinvolte dalla modifica del flag `defeated` di una conquista in una partita:
+    lo stato della conquista stessa e quelli dei prototipi zoolab, perché "il supremo" può essere
+    creato o annullato di conseguenza.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param model: Modello della conquista.
+    :param obj_id: ID della conquista.
+    """
+    if model is not models.OriginalCreation:
+        state_model = CONQUEST_STATES[model]
+        lock_rows(db, state_model, save_id, STATE_KEYS[state_model] == obj_id)
+    lock_rows(db, models.OriginalCreationState, save_id)
+
+
+def lock_all(db: Session, save_id: int) -> None:
+    """
+    Blocca tutte le righe di stato di una partita, per le operazioni che ne modificano interamente
+    i progressi (reset).
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    for state_model, key in STATE_KEYS.items():
+        # Le righe vengono bloccate lato database senza trasferirne gli ID, che non servono
+        locked = (
+            select(key)
+            .where(state_model.save_id == save_id)
+            .order_by(key)
+            .with_for_update()
+            .subquery()
+        )
+        db.execute(select(func.count()).select_from(locked))
+
+
+def reset_game(db: Session, save_id: int) -> None:
+    """
+    Azzera tutti i progressi di una partita con pochi UPDATE di massa, senza caricare oggetti ORM nella sessione:
+    catture di tutti i mostri, flag `created` e `defeated` di tutte le conquiste, tabelle di riepilogo
+    e contatori globali. Il numero di query non dipende dalla dimensione del catalogo né dal numero di partite.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    """
+    lock_all(db, save_id)
+
+    db.query(models.FiendCapture).filter(models.FiendCapture.save_id == save_id).update(
+        {models.FiendCapture.was_captured: 0}, synchronize_session=False
+    )
+    for state_model in CONQUEST_STATES.values():
+        db.query(state_model).filter(state_model.save_id == save_id).update(
+            {state_model.created: False, state_model.defeated: False}, synchronize_session=False
+        )
+
+    reset_progress(db, save_id)
@@ -0,0 +1,84 @@
+# backend/app/progress_stream.py
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any
+from fastapi.encoders import jsonable_encoder
+from app.config import STREAM_QUEUE_SIZE
+from app.progress_version import progress_version
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Tipi di messaggio pubblicati sul flusso, con i rispettivi dati:
+#   - ready: {"version": <identificativo>}, inviato all'apertura della connessione;
+#   - captures: {"updates": [[fiend_id, delta], ...], "area_conquests", "species_conquests", "original_creations"};
+#   - defeat: {"conquest": <tabella>, "id": <ID>, "defeated": <nuovo valore>, "original_creations"};
+#   - reset: {};
+#   - undo / redo: {"action": <captures|defeat>, ...payload dell'azione applicata, ...conquiste};
+#   - resync: {}, quando il client ha perso dei messaggi e deve ricaricare i dati.
+# L'ID di ogni messaggio è l'identificativo della versione dei progressi raggiunta con la modifica.
+
+
+class ProgressStream:
+    """
+    Diffusore in memoria delle modifiche confermate ai progressi delle partite verso i client collegati
+    al flusso Server-Sent Events. Ogni client ha una coda limitata: se si riempie (client troppo lento),
+    i messaggi in attesa vengono sostituiti da un unico `resync`.
+
+    I client ricevono solo le modifiche eseguite dallo stesso processo: con più worker uvicorn una modifica
+    confermata da un altro worker non viene notificata, e il client la vede solo alla successiva richiesta GET
+    o riconnessione al flusso. La versione dei progressi è invece salvata nel database, quindi l'ETag di quella
+    richiesta e il `resync` inviato alla riconnessione tengono conto anche delle modifiche degli altri worker.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, save_id: int) -> asyncio.Queue:
+        """Registra un nuovo client per le modifiche di una partita e ne restituisce la coda dei messaggi."""
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._subscribers[save_id].add(queue)
+        logger.info(f"Client collegato al flusso della partita {save_id} ({len(self._subscribers[save_id])} attivi)")
+        return queue
+
+    def unsubscribe(self, save_id: int, queue: asyncio.Queue) -> None:
+        """Rimuove un client dal flusso di una partita."""
+        self._subscribers[save_id].discard(queue)
+        if not self._subscribers[save_id]:
+            del self._subscribers[save_id]
+        logger.info(f"Client scollegato dal flusso della partita {save_id}")
+
+    def publish(self, save_id: int, version: int, event: str, data: dict[str, Any]) -> None:
+        """
+        Invia una modifica ai client collegati al flusso di una partita. Va chiamata solo dopo il commit,
+        con la versione restituita da `progress_version.bump`.
+
+        :param save_id: ID della partita modificata.
+        :param version: Versione dei progressi raggiunta con la modifica.
+        :param event: Tipo di messaggio.
+        :param data: Dati del messaggio (anche oggetti Pydantic).
+        """
+        queues = self._subscribers.get(save_id)
+        if not queues:
+            return
+
+        message = format_message(event, jsonable_encoder(data), progress_version.token(save_id, version))
+        for queue in queues:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"Coda del flusso della partita {save_id} piena, richiesta di ricaricamento")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_message("resync", {}, progress_version.token(save_id, version)))
+
+
+def format_message(event: str, data: Any, event_id: str) -> str:
+    """Formatta un messaggio secondo il protocollo Server-Sent Events."""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# Istanza condivisa dall'intero processo
+progress_stream = ProgressStream()
@@ -0,0 +1,122 @@
+# backend/app/progress_version.py
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import models
+from app.database import get_async_db
+from app.reference_data import reference_data
+from app.saves import get_save_id, save_not_found
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+
+class ProgressVersion:
+    """
+    Versione dei progressi di ciascuna partita, incrementata ad ogni modifica confermata di catture,
+    campioni sconfitti o reset della partita. Viene usata per generare l'ETag delle risposte GET,
+    così la modifica di una partita non invalida le copie salvate dai client delle altre.
+
+    La versione è salvata nella colonna `version` dei contatori globali della partita (`progress_counters`)
+    e viene incrementata nella stessa transazione della modifica, così è condivisa da tutti i worker del server
+    e dagli strumenti a riga di comando (reseed e ripristino del catalogo) e non riparte da 0 al riavvio.
+    """
+
+    def bump(self, db: Session, save_id: int) -> Optional[int]:
+        """
+        Incrementa la versione di una partita nella transazione della modifica, dopo tutti gli altri blocchi:
+        i contatori globali sono le ultime righe nell'ordine dei lock di `app.progress`. Con una sessione asincrona
+        va eseguita tramite `AsyncSession.run_sync`, prima del commit.
+
+        :param db: Sessione del database.
+        :param save_id: ID della partita modificata.
+        :return: La nuova versione, o None se la partita non esiste.
+        """
+        counters = models.ProgressCounters
+        version = db.execute(
+            update(counters)
+            .where(counters.save_id == save_id)
+            .values(version=counters.version + 1)
+            .returning(counters.version)
+        ).scalar()
+        logger.info(f"Versione dei progressi della partita {save_id} incrementata: {version}")
+        return version
+
+    def bump_all(self, db: Session) -> None:
+        """
+        Incrementa la versione di tutte le partite, per le modifiche al catalogo che cambiano le risposte
+        di ogni partita. Il commit è a carico del chiamante.
+
+        :param db: Sessione del database.
+        """
+        counters = models.ProgressCounters
+        db.execute(update(counters).values(version=counters.version + 1))
+        logger.info("Versione dei progressi di tutte le partite incrementata")
+
+    async def current(self, db: AsyncSession, save_id: int) -> Optional[int]:
+        """Restituisce la versione attuale di una partita, o None se la partita non esiste."""
+        counters = models.ProgressCounters
+        return await db.scalar(select(counters.version).where(counters.save_id == save_id))
+
+    def token(self, save_id: int, version: int) -> str:
+        """
+        Restituisce l'identificativo di una versione di una partita.
+
+        :param save_id: ID della partita.
+        :param version: Versione da identificare.
+        :return: Identificativo nel formato `<partita>-<versione>`.
+        """
+        return f"{save_id}-{version}"
+
+    def etag(self, save_id: int, version: int) -> str:
+        """Restituisce l'ETag (debole) associato a una versione di una partita."""
+        return f'W/"{self.token(save_id, version)}"'
+
+
+# Istanza condivisa dall'intero processo
+progress_version = ProgressVersion()
+
+
+async def progress_etag(
+        request: Request,
+        response: Response,
+        save_id: int = Depends(get_save_id),
+        db: AsyncSession = Depends(get_async_db)
+) -> None:
+    """
+    Dependency per le rotte GET: aggiunge alla risposta l'ETag della versione attuale dei progressi
+    della partita e, se il client invia un `If-None-Match` corrispondente, risponde 304 senza leggere i progressi.
+    Nella stessa query legge la versione del catalogo, che invalida la cache dei dati di riferimento se il catalogo
+    è stato modificato da un altro processo. Le richieste con metodi diversi da GET vengono ignorate.
+
+    :param request: Richiesta HTTP in ingresso.
+    :param response: Risposta HTTP su cui impostare gli header.
+    :param save_id: ID della partita a cui si riferisce la richiesta.
+    :param db: Sessione del database, la stessa usata dalla rotta.
+    :raises HTTPException: 304 se la copia del client è ancora valida.
+    """
+    if request.method != "GET":
+        return
+
+    counters = models.ProgressCounters
+    versions = (await db.execute(
+        select(counters.version, reference_data.catalogue_version_query()).where(counters.save_id == save_id)
+    )).first()
+    if versions is None:
+        raise save_not_found(save_id)
+    version, catalogue_version = versions
+    reference_data.observe(catalogue_version)
+
+    etag = progress_version.etag(save_id, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "X-Save-Id"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in client_etags or etag in client_etags:
+            raise HTTPException(status_code=304, headers=headers)
+
+    response.headers.update(headers)
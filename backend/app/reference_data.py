@@ -0,0 +1,198 @@
+# backend/app/reference_data.py
+import threading
+from typing import Optional
+from sqlalchemy import ScalarSelect, func, select, update
+from sqlalchemy.orm import Session
+from app import models
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Modelli che possiedono ricompense, statistiche, debolezze e resistenze, indicizzati per nome di tabella
+OWNER_MODELS = [models.Fiend, models.AreaConquest, models.SpeciesConquest, models.OriginalCreation]
+
+# Colonne della tabella delle statistiche esposte nei dettagli completi
+STATS_COLUMNS = ["hp", "mp", "overkill", "guil", "ap", "ap_overkill"]
+
+
+class ReferenceData:
+    """
+    Cache di processo per i dati di riferimento immutabili (item, abilità, debolezze/resistenze, statistiche
+    e relative tabelle di associazione), che non cambiano dopo l'esecuzione di `populate_data`.
+
+    La cache viene caricata all'avvio del server (o al primo utilizzo) ed è versionata: ogni caricamento
+    incrementa `version`, mentre `invalidate()` forza il ricaricamento al successivo accesso.
+    Popolamento, reseed e ripristino del catalogo incrementano anche la versione del catalogo salvata nel
+    database (`catalogue_version`): ogni processo la confronta con quella caricata tramite `observe()`,
+    così si accorge anche delle modifiche eseguite da altri processi.
+
+    Attributes:
+        version (int): Versione dei dati attualmente caricati (0 se la cache non è mai stata caricata).
+        catalogue_version (int): Versione del catalogo nel database al momento del caricamento.
+        items (dict[int, str]): Nome degli item, indicizzati per ID.
+        abilities (dict[int, str]): Nome delle abilità, indicizzate per ID.
+        weaknesses (dict[int, str]): Nome delle debolezze/resistenze, indicizzate per ID.
+        stats (dict[int, dict[str, Optional[int]]]): Statistiche, indicizzate per ID.
+        rewards (dict[tuple[str, int], dict[str, tuple[str, int]]]): Ricompense di ogni elemento
+            (nome della tabella, ID), indicizzate per tipo di ricompensa.
+        element_stats (dict[tuple[str, int], dict[str, Optional[int]]]): Statistiche di ogni elemento.
+        element_weaknesses (dict[tuple[str, int], list[tuple[str, int]]]): Debolezze di ogni elemento.
+        element_resistances (dict[tuple[str, int], list[str]]): Resistenze di ogni elemento.
+        details (dict[tuple[str, int], bytes]): Documenti JSON precalcolati dei dettagli completi delle conquiste,
+            privi dei flag `created` e `defeated`.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.catalogue_version = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.items = {}
+        self.abilities = {}
+        self.weaknesses = {}
+        self.stats = {}
+        self.rewards = {}
+        self.element_stats = {}
+        self.element_weaknesses = {}
+        self.element_resistances = {}
+        self.details = {}
+        self._details_version = 0
+
+    def invalidate(self) -> None:
+        """Invalida la cache, che verrà ricaricata al successivo accesso."""
+        with self._lock:
+            self._loaded = False
+        logger.info("Cache dei dati di riferimento invalidata")
+
+    def observe(self, catalogue_version: int) -> None:
+        """
+        Confronta la versione del catalogo letta dal database con quella dei dati caricati e, se è cambiata
+        (per esempio per un reseed eseguito da un altro processo), invalida la cache.
+
+        :param catalogue_version: Versione attuale del catalogo, letta con `catalogue_version_query()`.
+        """
+        if self._loaded and catalogue_version != self.catalogue_version:
+            logger.info(f"Versione del catalogo cambiata: {self.catalogue_version} -> {catalogue_version}")
+            self.invalidate()
+
+    def catalogue_version_query(self) -> ScalarSelect:
+        """Restituisce la subquery della versione del catalogo nel database (0 se non è mai stata incrementata)."""
+        return select(func.coalesce(func.max(models.CatalogueVersion.version), 0)).scalar_subquery()
+
+    def bump_catalogue_version(self, db: Session) -> None:
+        """
+        Incrementa la versione del catalogo nel database, nella transazione che modifica il catalogo.
+        Il commit è a carico del chiamante.
+
+        :param db: Sessione del database.
+        """
+        table = models.CatalogueVersion
+        if not db.execute(update(table).values(version=table.version + 1)).rowcount:
+            db.add(table(id=1, version=1))
+            db.flush()
+        logger.info("Versione del catalogo incrementata")
+
+    def get(self, db: Session) -> "ReferenceData":
+        """
+        Restituisce la cache, caricandola dal database se non è ancora stata caricata o è stata invalidata.
+
+        :param db: Sessione del database, usata solo in caso di caricamento.
+        :return: La cache dei dati di riferimento.
+        """
+        if not self._loaded:
+            self.load(db)
+        return self
+
+    def load(self, db: Session) -> None:
+        """
+        Carica tutti i dati di riferimento dal database con una query per tabella.
+
+        :param db: Sessione del database.
+        """
+        with self._lock:
+            catalogue_version = db.scalar(select(self.catalogue_version_query()))
+            items = dict(db.query(models.Item.id, models.Item.name).all())
+            abilities = dict(db.query(models.Ability.id, models.Ability.name).all())
+            weaknesses = dict(db.query(models.WeaknessOrResistance.id, models.WeaknessOrResistance.name).all())
+            stats = {
+                stat.id: {column: getattr(stat, column) for column in STATS_COLUMNS}
+                for stat in db.query(models.Stats.id, *[getattr(models.Stats, column) for column in STATS_COLUMNS])
+            }
+
+            rewards, element_stats, element_weaknesses, element_resistances = {}, {}, {}, {}
+
+            for owner_model in OWNER_MODELS:
+                # Costruisce i nomi dei modelli di associazione con la convenzione di denominazione dei modelli
+                owner_name = owner_model.__name__
+                owner_tablename = owner_model.__tablename__
+                owner_column = f'{owner_tablename[:-1]}_id'
+
+                reward_model = getattr(models, f'{owner_name}Reward')
+                for reward in db.query(reward_model).all():
+                    key = (owner_tablename, getattr(reward, owner_column))
+                    rewards.setdefault(key, {})[reward.reward_type] = (items[reward.item_id], reward.quantity)
+
+                stats_model = getattr(models, f'{owner_name}Stats')
+                for link in db.query(stats_model).all():
+                    element_stats.setdefault((owner_tablename, getattr(link, owner_column)), stats[link.stats_id])
+
+                weakness_model = getattr(models, f'{owner_name}Weakness')
+                for weakness in db.query(weakness_model).all():
+                    key = (owner_tablename, getattr(weakness, owner_column))
+                    element_weaknesses.setdefault(key, []).append(
+                        (weaknesses[weakness.weakness_id], weakness.percentage)
+                    )
+
+                resistance_model = getattr(models, f'{owner_name}Resistance')
+                for resistance in db.query(resistance_model).all():
+                    key = (owner_tablename, getattr(resistance, owner_column))
+                    element_resistances.setdefault(key, []).append(weaknesses[resistance.resistance_id])
+
+            self.items = items
+            self.abilities = abilities
+            self.weaknesses = weaknesses
+            self.stats = stats
+            self.rewards = rewards
+            self.element_stats = element_stats
+            self.element_weaknesses = element_weaknesses
+            self.element_resistances = element_resistances
+            self.catalogue_version = catalogue_version
+            self.version += 1
+            self._loaded = True
+
+        logger.info(f"Cache dei dati di riferimento caricata (versione {self.version})")
+
+    def details_ready(self) -> bool:
+        """Indica se i documenti dei dettagli completi sono stati costruiti per la versione attuale dei dati."""
+        return self._loaded and self._details_version == self.version
+
+    def set_details(self, details: dict[tuple[str, int], bytes]) -> None:
+        """
+        Salva i documenti precalcolati dei dettagli completi, associandoli alla versione attuale dei dati.
+
+        :param details: Documenti JSON indicizzati per (nome della tabella, ID).
+        """
+        self.details = details
+        self._details_version = self.version
+        logger.info(f"Documenti dei dettagli completi costruiti: {len(details)} (versione {self.version})")
+
+    def element_rewards(self, obj: models.Base) -> dict[str, tuple[str, int]]:
+        """Restituisce le ricompense di un elemento, indicizzate per tipo di ricompensa."""
+        return self.rewards.get((obj.__tablename__, obj.id), {})
+
+    def element_stat(self, obj: models.Base) -> dict[str, Optional[int]]:
+        """Restituisce le statistiche di un elemento (vuote se non presenti)."""
+        return self.element_stats.get((obj.__tablename__, obj.id), {})
+
+    def element_weakness(self, obj: models.Base) -> list[tuple[str, int]]:
+        """Restituisce le debolezze di un elemento con la relativa percentuale."""
+        return self.element_weaknesses.get((obj.__tablename__, obj.id), [])
+
+    def element_resistance(self, obj: models.Base) -> list[str]:
+        """Restituisce le resistenze di un elemento."""
+        return self.element_resistances.get((obj.__tablename__, obj.id), [])
+
+
+# Istanza condivisa dall'intero processo
+reference_data = ReferenceData()
@@ -1,80 +1,97 @@
 # backend/app/routers/area_conquests.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
-from app.database import get_db
-from app.routers.functions import get_one, get_all, repr, defeated, undefeated, full_details
+from app.database import get_async_db
+from app.routers.functions import get_one, get_all, repr, defeated, undefeated, full_details_document
+from app.progress_version import progress_etag
+from app.saves import get_save_id
 
 router = APIRouter(
     prefix="/area_conquests",
-    tags=["Area Conquests"]
+    tags=["Area Conquests"],
+    dependencies=[Depends(progress_etag)]
 )
 
 
 @router.get("/", response_model=list[schemas.AreaConquest])
-def get_all_area_conquests(db: Session = Depends(get_db)):
+async def get_all_area_conquests(
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Restituisce tutti i campioni di zona.
 
     :param db: Sessione del database.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :return: Lista di campioni di zona.
     """
-    return get_all(db, models.AreaConquest)
+    return await get_all(db, models.AreaConquest, save_id=save_id)
 
 
 @router.get("/repr", response_model=schemas.ConquestRepr)
-def get_area_conquest_repr(db: Session = Depends(get_db)):
-    return repr(db, models.AreaConquest, 'don tomberry', 'Campioni di Zona', 'area_conquests')
+async def get_area_conquest_repr(db: AsyncSession = Depends(get_async_db)):
+    return await repr(db, models.AreaConquest, 'don tomberry', 'Campioni di Zona', 'area_conquests')
 
 
 @router.get("/{area_conquest_id}", response_model=schemas.AreaConquest)
-def get_area_conquest(area_conquest_id: int, db: Session = Depends(get_db)):
+async def get_area_conquest(
+        area_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Recupera un singolo campione di zona.
 
     :param area_conquest_id: ID del campione di zona.
     :param db: Sessione del database.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :raises HTTPException: Se il campione di zona non viene trovato.
     :return: Oggetto AreaConquest.
     """
-    return get_one(db, models.AreaConquest, area_conquest_id)
+    return await get_one(db, models.AreaConquest, area_conquest_id, save_id=save_id)
 
 
 @router.post("/{area_conquest_id}/defeated")
-def defeated_area_conquest(area_conquest_id: int, db: Session = Depends(get_db)):
+async def defeated_area_conquest(
+        area_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Segna un campione di zona come sconfitto.
 
     :param area_conquest_id: ID del campione di zona.
     :param db: Sessione del database.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :raises HTTPException: Se il campione di zona non viene trovato.
     :return: Oggetto aggiornato del campione di zona.
     """
-    return defeated(db, models.AreaConquest, area_conquest_id)
+    return await defeated(db, save_id, models.AreaConquest, area_conquest_id)
 
 
 @router.post("/{area_conquest_id}/undefeated")
-def undefeated_area_conquest(area_conquest_id: int, db: Session = Depends(get_db)):
+async def undefeated_area_conquest(
+        area_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Segna un campione di zona come non sconfitto.
 
     :param area_conquest_id: ID del campione di zona.
     :param db: Sessione del database.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :raises HTTPException: Se il campione di zona non viene trovato.
     :return: Oggetto aggiornato del campione di zona.
     """
-    return undefeated(db, models.AreaConquest, area_conquest_id)
+    return await undefeated(db, save_id, models.AreaConquest, area_conquest_id)
 
 
 @router.get("/{area_conquest_id}/full_details")
-def get_area_conquest_full_details(area_conquest_id: int, db: Session = Depends(get_db)):
-    area_conquest: models.AreaConquest = get_one(db, models.AreaConquest, area_conquest_id)
-    required_fiends = [(fiend.id, fiend.name) for fiend in area_conquest.zone.fiends]
-    required_fiends = sorted(required_fiends, key=lambda x: x[0])
-
-    return full_details(
-        area_conquest,
-        zone_id=area_conquest.zone.id,
-        zone_name=area_conquest.zone.name,
-        required_fiends=required_fiends
-    )
+async def get_area_conquest_full_details(
+        area_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await full_details_document(db, save_id, models.AreaConquest, area_conquest_id)
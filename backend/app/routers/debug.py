@@ -0,0 +1,36 @@
+# backend/app/routers/debug.py
+from fastapi import APIRouter
+from app import database, schemas
+from app.db_pool import pool_status
+from app.routers.fiends import capture_coalescer
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Debug"]
+)
+
+
+@router.get("/pool", response_model=schemas.PoolStatus)
+async def get_pool_status():
+    """
+    Restituisce lo stato dei pool di connessioni degli engine sincrono e asincrono: connessioni in uso
+    e libere, overflow, numero di prelievi, timeout e tempi di attesa medi e massimi.
+    Serve a dimensionare DB_POOL_SIZE e DB_MAX_OVERFLOW in base al numero di worker.
+
+    :return: Oggetto PoolStatus.
+    """
+    return {
+        "sync_engine": pool_status(database.engine.pool),
+        "async_engine": pool_status(database.async_engine.sync_engine.pool),
+    }
+
+
+@router.get("/coalescer", response_model=schemas.CoalescerStats)
+async def get_coalescer_stats():
+    """
+    Restituisce la configurazione e i contatori dell'accorpamento delle variazioni di cattura:
+    il rapporto tra richieste ricevute e gruppi applicati indica quante transazioni sono state risparmiate.
+
+    :return: Oggetto CoalescerStats.
+    """
+    return capture_coalescer.stats()
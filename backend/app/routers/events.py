@@ -0,0 +1,246 @@
+# backend/app/routers/events.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app import models, schemas
+from app.database import get_async_db
+from app.events import (
+    CONQUEST_MODELS, event_action, inverse_payload, latest_snapshot, progress_state, record_event, redo_target,
+    restore_snapshot, tail_events, undo_target
+)
+from app.creation_conditions import CreationConditions
+from app.progress import CONQUEST_STATES, lock_all, lock_save, pop_flag_changes, reset_game, set_conquest_flags
+from app.progress_stream import progress_stream
+from app.progress_version import progress_etag, progress_version
+from app.routers.fiends import apply_capture_updates
+from app.routers.functions import set_defeated, try_except
+from app.saves import get_save_id, save_not_found
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"],
+    dependencies=[Depends(progress_etag)]
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def restore_defeated_flags(
+        db: AsyncSession,
+        save_id: int,
+        flags: list[list]
+) -> Optional[schemas.OriginalCreationResponse]:
+    """
+    Riporta il flag `defeated` delle conquiste di una partita ai valori salvati nel payload di un evento `captures`.
+    Le variazioni di cattura ricreano le conquiste annullate, ma non possono sapere se erano già state sconfitte.
+
+    Il flag `created` resta quello stabilito dalle condizioni di creazione: il flag `defeated` viene ripristinato
+    solo per le conquiste il cui flag `created` corrisponde già a quello salvato. Se viene ripristinato almeno
+    un flag viene verificato di conseguenza il prototipo "il supremo".
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param flags: Flag salvati nell'evento: [tabella, ID, [created, defeated] precedenti, [created, defeated] da
+        ripristinare].
+    :return: Il prototipo "il supremo", se creato o annullato.
+    """
+    restored = False
+    for tablename, conquest_id, _, (created, defeated) in flags:
+        model = CONQUEST_MODELS[tablename]
+        state = await db.get(CONQUEST_STATES[model], (save_id, conquest_id), populate_existing=True)
+        if state is None or state.created != created or state.defeated == defeated:
+            continue
+        conquest = await db.get(model, conquest_id)
+        await db.run_sync(set_conquest_flags, conquest, state, defeated=defeated)
+        restored = True
+
+    if not restored:
+        return None
+    await db.flush()
+    return await CreationConditions(db, save_id).check_il_supremo()
+
+
+async def apply_action(db: AsyncSession, save_id: int, action: str, payload: dict) -> dict:
+    """
+    Applica a una partita un'azione descritta dal payload di un evento (variazioni di cattura o modifica del flag
+    `defeated`), con le stesse verifiche delle rotte originali e senza eseguire il commit.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param action: Tipo di azione (`captures` o `defeat`).
+    :param payload: Payload dell'evento.
+    :return: Le catture aggiornate e le conquiste create o annullate dall'azione.
+    """
+    if action == "captures":
+        feedback, conquests = await apply_capture_updates(
+            db, save_id, [(fiend_id, delta) for fiend_id, delta in payload["updates"]]
+        )
+        il_supremo = await restore_defeated_flags(db, save_id, payload.get("flags", []))
+        if il_supremo:
+            conquests["original_creations"] = [*(conquests["original_creations"] or []), il_supremo]
+        return {"captures": feedback, **conquests}
+
+    model = CONQUEST_MODELS[payload["conquest"]]
+    _, il_supremo = await set_defeated(db, save_id, model, payload["id"], payload["defeated"])
+    return {"original_creations": [il_supremo] if il_supremo else None}
+
+
+async def __revert(db: AsyncSession, save_id: int, kind: str) -> dict:
+    # Blocca tutte le righe di stato della partita, nello stesso ordine delle altre scritture: le azioni
+    # concorrenti sono già registrate e l'azione da annullare (o ripristinare) non può cambiare nel frattempo
+    if not await db.run_sync(lock_save, save_id):
+        raise save_not_found(save_id)
+    await db.run_sync(lock_all, save_id)
+
+    events = (await db.scalars(
+        select(models.ProgressEvent)
+        .where(models.ProgressEvent.save_id == save_id)
+        .order_by(models.ProgressEvent.id.desc())
+    )).all()
+    target = undo_target(events) if kind == "undo" else redo_target(events)
+    if not target:
+        detail = "Nessuna azione da annullare" if kind == "undo" else "Nessuna azione da ripristinare"
+        raise HTTPException(status_code=404, detail=detail)
+
+    # L'annullamento applica l'inverso dell'azione, il ripristino l'inverso del suo annullamento
+    payload = inverse_payload(event_action(target), target.payload)
+    logger.info(f"{kind} dell'evento {target.id} nella partita {save_id}: {payload}")
+    result = await apply_action(db, save_id, payload["action"], payload)
+    if payload["action"] == "captures":
+        # Salva i flag effettivamente modificati, che il ripristino dell'azione riporterà ai valori precedenti
+        payload["flags"] = await db.run_sync(pop_flag_changes)
+    event = await db.run_sync(record_event, save_id, kind, payload, target.id)
+
+    version = await db.run_sync(progress_version.bump, save_id)
+
+    try:
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Errore durante l'aggiornamento: {str(e)}")
+
+    progress_stream.publish(save_id, version, kind, {
+        **payload, **{key: value for key, value in result.items() if key != "captures"}
+    })
+    return {"event": schemas.ProgressEvent.model_validate(event), **result}
+
+
+@router.get("/", response_model=list[schemas.ProgressEvent])
+async def get_events(
+        after_id: int = 0,
+        limit: int = 100,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    """
+    Restituisce gli eventi del registro dei progressi di una partita successivi all'evento `after_id`,
+    in ordine di registrazione, per ripercorrere una sessione di gioco.
+
+    :param after_id: ID dell'ultimo evento già letto (0 per partire dal più vecchio conservato).
+    :param limit: Numero massimo di eventi da restituire.
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
+    :return: Lista di eventi.
+    """
+    return (await db.scalars(
+        select(models.ProgressEvent)
+        .where(models.ProgressEvent.save_id == save_id, models.ProgressEvent.id > after_id)
+        .order_by(models.ProgressEvent.id)
+        .limit(limit)
+    )).all()
+
+
+@try_except
+@router.post("/undo")
+async def undo(db: AsyncSession = Depends(get_async_db), save_id: int = Depends(get_save_id)):
+    """
+    Annulla l'ultima azione non ancora annullata della partita (variazione di catture o sconfitta di una
+    conquista), applicandone l'inverso e registrandolo come evento `undo`. Un reset non può essere annullato.
+
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
+    :raises HTTPException: 404 se non ci sono azioni da annullare.
+    :return: L'evento registrato, le catture aggiornate e le conquiste create o annullate.
+    """
+    return {"message": "Azione annullata con successo", **await __revert(db, save_id, "undo")}
+
+
+@try_except
+@router.post("/redo")
+async def redo(db: AsyncSession = Depends(get_async_db), save_id: int = Depends(get_save_id)):
+    """
+    Ripristina l'ultima azione annullata della partita, purché dopo l'annullamento non siano state registrate
+    nuove azioni, e la registra come evento `redo`.
+
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
+    :raises HTTPException: 404 se non ci sono azioni da ripristinare.
+    :return: L'evento registrato, le catture aggiornate e le conquiste create o annullate.
+    """
+    return {"message": "Azione ripristinata con successo", **await __revert(db, save_id, "redo")}
+
+
+@try_except
+@router.post("/rebuild")
+async def rebuild(
+        dry_run: bool = False,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    """
+    Ricostruisce lo stato della partita dall'ultima istantanea applicando in ordine gli eventi successivi,
+    e lo confronta con lo stato attuale. Con `dry_run` la ricostruzione viene annullata e restituisce
+    solo le differenze, utile per verificare la coerenza del registro.
+
+    :param dry_run: Se True, non salva lo stato ricostruito.
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
+    :raises HTTPException: 404 se la partita non ha istantanee.
+    :return: Numero di eventi applicati ed elementi il cui stato ricostruito differisce da quello attuale.
+    """
+    if not await db.run_sync(lock_save, save_id):
+        raise save_not_found(save_id)
+    await db.run_sync(lock_all, save_id)
+    before = await db.run_sync(progress_state, save_id)
+
+    snapshot = await db.run_sync(latest_snapshot, save_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail=f"Nessuna istantanea per la partita {save_id}")
+    snapshot_event_id = snapshot.last_event_id
+    events = await db.run_sync(tail_events, save_id, snapshot_event_id)
+
+    # Gli UPDATE di massa non aggiornano gli oggetti già caricati: la sessione viene svuotata dopo ciascuno
+    await db.run_sync(restore_snapshot, save_id, snapshot)
+    db.expunge_all()
+    for event in events:
+        if event.kind == "reset":
+            await db.run_sync(reset_game, save_id)
+            db.expunge_all()
+        else:
+            await apply_action(db, save_id, event_action(event), event.payload)
+
+    after = await db.run_sync(progress_state, save_id)
+    differences = {}
+    for table, rows in after.items():
+        changed = {tuple(row) for row in rows} ^ {tuple(row) for row in before[table]}
+        if changed:
+            differences[table] = sorted({row[0] for row in changed})
+
+    if dry_run:
+        await db.rollback()
+    else:
+        version = await db.run_sync(progress_version.bump, save_id)
+        await db.commit()
+        # Lo stato ricostruito può differire da quello noto ai client, che devono ricaricare i dati
+        progress_stream.publish(save_id, version, "resync", {})
+
+    logger.info(f"Ricostruzione della partita {save_id}: {len(events)} eventi, differenze {differences}")
+    return {
+        "snapshot_event_id": snapshot_event_id,
+        "replayed_events": len(events),
+        "differences": differences,
+        "saved": not dry_run
+    }
@@ -1,16 +1,28 @@
 # backend/app/routers/fiends.py
+from collections import defaultdict
+from typing import Optional, Union
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import case, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
+from app.config import CAPTURE_COALESCING_MAX_BATCH, CAPTURE_COALESCING_WINDOW_MS
 from app.creation_conditions import CreationConditions
+from app.progress import MAX_CAPTURES, apply_captures, lock_for_captures, lock_save, pop_flag_changes, reset_game
 from app import models, schemas
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_async_db
+from app.events import record_event
 from app.routers.functions import get_one, get_all, try_except
+from app.progress_stream import progress_stream
+from app.progress_version import progress_etag, progress_version
+from app.saves import get_save_id, save_not_found
+from app.write_coalescer import WriteCoalescer
 
 router = APIRouter(
     prefix="/fiends",
-    tags=["Fiends"]
+    tags=["Fiends"],
+    dependencies=[Depends(progress_etag)]
 )
 
 logger = logging.getLogger(__name__)
@@ -18,122 +30,333 @@ logger = logging.getLogger(__name__)
 
 # Rotta per ottenere l'elenco di tutti i mostri
 @router.get("/", response_model=list[schemas.Fiend])
-def get_all_fiends(db: Session = Depends(get_db)):
+async def get_all_fiends(db: AsyncSession = Depends(get_async_db), save_id: int = Depends(get_save_id)):
     """
-    Recupera l'elenco completo di tutti i mostri.
+    Recupera l'elenco completo di tutti i mostri, con le catture della partita.
 
     :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :return: Lista di tutti i mostri.
     """
-    return get_all(db, models.Fiend)
+    return await get_all(db, models.Fiend, save_id=save_id)
 
 
 # Rotta per ottenere un singolo mostro specificato tramite il suo ID
 @router.get("/{fiend_id}", response_model=schemas.Fiend)
-def get_fiend(fiend_id: int, db: Session = Depends(get_db)):
+async def get_fiend(fiend_id: int, db: AsyncSession = Depends(get_async_db), save_id: int = Depends(get_save_id)):
     """
-    Recupera un mostro specifico dal database in base al suo ID.
+    Recupera un mostro specifico dal database in base al suo ID, con le catture della partita.
 
     :param fiend_id: L'ID del mostro da recuperare.
     :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :raises HTTPException: Se il mostro non viene trovato, lancia un'eccezione HTTP 404.
     :return: Dati del mostro trovato.
     """
-    return get_one(db, models.Fiend, fiend_id)
+    return await get_one(db, models.Fiend, fiend_id, save_id=save_id)
 
 
-# Rotta per aggiornare il numero di catture dei mostri
-@try_except
-@router.post("/update_captures")
-def update_fiend_captures(request: schemas.FiendCapturesUpdateRequest, db: Session = Depends(get_db)):
+def check_capture_updates(
+        fiends: dict[int, tuple[models.Fiend, int]],
+        running: dict[int, int],
+        updates: list[tuple[int, int]]
+) -> None:
     """
-    Aggiorna il numero di catture dei mostri indicati nella richiesta.
-
-    :param request: Richiesta contenente una lista di mostri e le variazioni di cattura.
-    :param db: Sessione del database ottenuta tramite dependency injection.
-    :raises HTTPException: Se un mostro non viene trovato o i dati non sono validi, lancia un'eccezione HTTP.
-    :return: Un messaggio di conferma o errore.
+    Verifica le variazioni di cattura di una richiesta nell'ordine in cui sono indicate, a partire dalle catture
+    correnti della partita, e in caso di successo aggiorna di conseguenza le catture correnti.
+
+    :param fiends: Mostri trovati con le catture nella partita all'inizio della transazione, indicizzati per ID.
+    :param running: Catture correnti dei mostri, comprese quelle delle richieste già accettate.
+    :param updates: Coppie (ID del mostro, variazione) nell'ordine della richiesta.
+    :raises HTTPException: 404 se un mostro non viene trovato, 403 se una variazione porta le catture fuori
+        dai limiti 0-10. In questo caso le catture correnti non vengono modificate.
     """
-    logger.info("Richiesta di aggiornamento ricevuta: updates=%s", request.updates)
-
-    # Recupera tutti i mostri corrispondenti agli ID nella richiesta
-    fiend_ids = [update.fiend_id for update in request.updates]
-    captured_fiends: list[models.Fiend] = db.query(models.Fiend).filter(models.Fiend.id.in_(fiend_ids)).all()
-
-    # Crea un dizionario per associare facilmente i fiend ai loro ID
-    captured_fiends_dict = {fiend.id: fiend for fiend in captured_fiends}
-
     # Controlla che ogni fiend richiesto sia stato trovato nel database
-    for update in request.updates:
-        if update.fiend_id not in captured_fiends_dict:
-            logger.error(f"Mostro con ID {update.fiend_id} non trovato.")
-            raise HTTPException(status_code=404, detail=f"Mostro con ID {update.fiend_id} non trovato.")
-
-    logger.info("Mostri catturati trovati nel database: %s", [fiend.name for fiend in captured_fiends])
-
-    feedback = []
-
-    # Cicla attraverso ogni update e aggiorna il conteggio delle catture
-    for update in request.updates:
-        fiend = captured_fiends_dict[update.fiend_id]
-        new_capture_count = fiend.was_captured + update.delta
-        logger.info(
-            "Controllo cattura per %s: catture attuali=%d, delta=%d, nuovo conteggio=%d",
-            fiend.name, fiend.was_captured, update.delta, new_capture_count
-        )
-
-        # Verifica che il nuovo conteggio delle catture sia valido
+    for fiend_id, _ in updates:
+        if fiend_id not in fiends:
+            logger.error(f"Mostro con ID {fiend_id} non trovato.")
+            raise HTTPException(status_code=404, detail=f"Mostro con ID {fiend_id} non trovato.")
+
+    # Verifica che ogni nuovo conteggio delle catture sia valido, una variazione alla volta
+    captures = {fiend_id: running.get(fiend_id, fiends[fiend_id][1]) for fiend_id, _ in updates}
+    for fiend_id, delta in updates:
+        fiend, _ = fiends[fiend_id]
+        new_capture_count = captures[fiend_id] + delta
         if new_capture_count < 0:
             logger.error(f"{fiend.name} non può avere un numero di catture minore di 0 ({new_capture_count})")
             raise HTTPException(
                 status_code=403,
                 detail=f"{fiend.name} non può avere un numero di catture minore di 0 ({new_capture_count})"
             )
-        elif new_capture_count > 10:
+        elif new_capture_count > MAX_CAPTURES:
             logger.error(f"{fiend.name} non può essere catturato più di 10 volte ({new_capture_count})")
             raise HTTPException(
                 status_code=403,
                 detail=f"{fiend.name} non può essere catturato più di 10 volte ({new_capture_count})"
             )
+        captures[fiend_id] = new_capture_count
 
-        # Aggiorna il conteggio delle catture
-        fiend.was_captured = new_capture_count
-        db.add(fiend)  # Aggiungi l'oggetto alla sessione per il commit successivo
-        feedback.append((fiend.name, update.delta))
-        logger.info("Aggiornamento effettivo per %s: nuovo numero di catture=%d", fiend.name, fiend.was_captured)
+    running.update(captures)
 
-    # Flush del database per rendere visibili le modifiche
-    db.flush()
-    logger.info("Flush del database eseguito con successo. Verifica delle nuove creazioni in corso...")
 
-    # Usa db.refresh() per assicurarsi che le modifiche siano visibili nelle query successive
-    for fiend in captured_fiends:
-        db.refresh(fiend)
-        logger.info(f"Stato aggiornato per {fiend.name}: catture attuali={fiend.was_captured}")
+async def apply_capture_batch(
+        db: AsyncSession,
+        save_id: int,
+        batch: list[list[tuple[int, int]]]
+) -> tuple[list[Union[list[tuple[str, int]], HTTPException]], Optional[dict]]:
+    """
+    Applica in una partita le variazioni di cattura di una o più richieste e verifica di conseguenza le condizioni
+    di creazione delle conquiste, senza eseguire il commit.
+
+    Le righe coinvolte vengono bloccate nell'ordine definito in `app.progress`, così le richieste concorrenti non
+    possono perdere un aggiornamento né lasciare incoerenti i flag delle conquiste. Ogni richiesta viene poi
+    verificata nell'ordine di arrivo sulle catture risultanti da quelle già accettate: una richiesta non valida
+    viene scartata da sola, mentre le variazioni complessive di quelle valide vengono scritte con un'unica UPDATE.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param batch: Coppie (ID del mostro, variazione) di ciascuna richiesta, nell'ordine di arrivo.
+    :return: Per ciascuna richiesta le coppie (nome del mostro, variazione) o l'eccezione HTTP che l'ha scartata,
+        e le conquiste create o annullate (None se nessuna richiesta è stata accettata).
+    """
+    # Blocca la partita, poi catture e conquiste coinvolte in ordine crescente di ID, così le richieste concorrenti
+    # si accodano
+    if not await db.run_sync(lock_save, save_id):
+        raise save_not_found(save_id)
+    fiends = await db.run_sync(lock_for_captures, save_id, {fiend_id for updates in batch for fiend_id, _ in updates})
+
+    results = []
+    running: dict[int, int] = {}
+    accepted: list[tuple[int, int]] = []
+    for updates in batch:
+        try:
+            check_capture_updates(fiends, running, updates)
+        except HTTPException as e:
+            results.append(e)
+            continue
+        results.append([(fiends[fiend_id][0].name, delta) for fiend_id, delta in updates])
+        accepted.extend(updates)
+
+    if not accepted:
+        return results, None
+
+    # Somma le variazioni accettate per lo stesso mostro
+    deltas = defaultdict(int)
+    for fiend_id, delta in accepted:
+        deltas[fiend_id] += delta
+
+    # Incrementa le catture di tutti i mostri nella partita con un'unica UPDATE
+    captures = models.FiendCapture
+    try:
+        await db.execute(
+            update(captures)
+            .where(captures.save_id == save_id, captures.fiend_id.in_(deltas))
+            .values(was_captured=captures.was_captured + case(deltas, value=captures.fiend_id))
+        )
+    except IntegrityError:
+        # Il vincolo sulle catture (0-10) è stato violato nonostante la verifica sotto blocco: la transazione
+        # viene annullata e le richieste accettate ricevono il 403 della verifica sulle catture attuali
+        logger.error("Vincolo sulle catture violato dall'aggiornamento della partita %s: %s", save_id, dict(deltas))
+        await db.rollback()
+        return await reject_capture_batch(db, save_id, batch, results), None
+
+    captured_fiends = [fiends[fiend_id][0] for fiend_id in sorted(deltas)]
+    logger.info("Mostri catturati aggiornati nel database: %s", [fiend.name for fiend in captured_fiends])
+
+    # Aggiorna le tabelle di riepilogo dei progressi nella stessa transazione
+    await db.run_sync(apply_captures, save_id, [
+        (fiend, fiends[fiend.id][1], running[fiend.id]) for fiend in captured_fiends
+    ])
 
     # Verifica le condizioni per le creazioni
-    conquests = CreationConditions(
+    conquests = await CreationConditions(
         db=db,
+        save_id=save_id,
         captured_fiends=captured_fiends,
-        negative_check=any(update.delta < 0 for update in request.updates)
+        negative_check=any(delta < 0 for _, delta in accepted)
     ).check()
 
     logger.info("Conquiste verificate: %s", conquests)
+    return results, conquests
+
+
+async def reject_capture_batch(
+        db: AsyncSession,
+        save_id: int,
+        batch: list[list[tuple[int, int]]],
+        results: list[Union[list[tuple[str, int]], HTTPException]]
+) -> list[HTTPException]:
+    """
+    Costruisce le risposte di un gruppo di richieste la cui UPDATE delle catture è stata rifiutata dal database,
+    dopo l'annullamento della transazione: ogni richiesta accettata viene verificata di nuovo, nell'ordine di arrivo,
+    sulle catture attuali della partita, così riceve lo stesso 403 di `check_capture_updates`. Le richieste già
+    scartate mantengono il proprio errore. Il rollback della nuova transazione è a carico del chiamante.
+
+    :param db: Sessione del database, con la transazione precedente già annullata.
+    :param save_id: ID della partita.
+    :param batch: Coppie (ID del mostro, variazione) di ciascuna richiesta, nell'ordine di arrivo.
+    :param results: Esito della verifica precedente di ciascuna richiesta.
+    :return: L'eccezione HTTP di ciascuna richiesta.
+    """
+    if not await db.run_sync(lock_save, save_id):
+        raise save_not_found(save_id)
+    fiends = await db.run_sync(lock_for_captures, save_id, {fiend_id for updates in batch for fiend_id, _ in updates})
+
+    rejected = []
+    running: dict[int, int] = {}
+    for updates, result in zip(batch, results):
+        if isinstance(result, HTTPException):
+            rejected.append(result)
+            continue
+        try:
+            check_capture_updates(fiends, running, updates)
+        except HTTPException as e:
+            rejected.append(e)
+            continue
+        # Le catture attuali ammettono la richiesta, ma sono cambiate rispetto a quelle verificate
+        names = ", ".join(fiends[fiend_id][0].name for fiend_id, _ in updates)
+        rejected.append(HTTPException(status_code=403, detail=f"Catture di {names} fuori dai limiti 0-{MAX_CAPTURES}"))
+    return rejected
+
+
+async def apply_capture_updates(
+        db: AsyncSession,
+        save_id: int,
+        updates: list[tuple[int, int]]
+) -> tuple[list[tuple[str, int]], dict]:
+    """
+    Applica in una partita le variazioni di cattura indicate e verifica di conseguenza le condizioni di creazione
+    delle conquiste, senza eseguire il commit. In caso di errore annulla la transazione e solleva l'eccezione HTTP
+    corrispondente.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param updates: Coppie (ID del mostro, variazione) nell'ordine della richiesta.
+    :raises HTTPException: Se un mostro non viene trovato o i dati non sono validi, lancia un'eccezione HTTP.
+    :return: Le coppie (nome del mostro, variazione) e le conquiste create o annullate.
+    """
+    (feedback,), conquests = await apply_capture_batch(db, save_id, [updates])
+    if isinstance(feedback, HTTPException):
+        await db.rollback()
+        raise feedback
+    return feedback, conquests
+
+
+async def commit_capture_updates(
+        db: AsyncSession,
+        save_id: int,
+        batch: list[list[tuple[int, int]]]
+) -> list[Union[dict, HTTPException]]:
+    """
+    Applica in un'unica transazione le variazioni di cattura di una o più richieste sulla stessa partita,
+    con un'unica verifica delle condizioni di creazione, registra un evento per ciascuna richiesta accettata
+    (così ognuna può essere annullata separatamente) ed esegue il commit.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param batch: Coppie (ID del mostro, variazione) di ciascuna richiesta, nell'ordine di arrivo.
+    :raises HTTPException: Se il commit fallisce.
+    :return: La risposta di ciascuna richiesta, o l'eccezione HTTP se la richiesta non è valida. Le conquiste
+        create o annullate vengono restituite all'ultima richiesta accettata del gruppo.
+    """
+    results, conquests = await apply_capture_batch(db, save_id, batch)
+    accepted = [
+        (updates, feedback) for updates, feedback in zip(batch, results) if not isinstance(feedback, HTTPException)
+    ]
+    if not accepted:
+        await db.rollback()
+        return results
+
+    # Registra le variazioni nel registro degli eventi della partita, nella stessa transazione. I flag delle conquiste
+    # create o annullate vengono salvati nell'evento dell'ultima richiesta, a cui sono restituite le conquiste
+    flags = await db.run_sync(pop_flag_changes)
+    for position, (updates, _) in enumerate(accepted, start=1):
+        payload = {"updates": [list(pair) for pair in updates]}
+        if position == len(accepted):
+            payload["flags"] = flags
+        await db.run_sync(record_event, save_id, "captures", payload)
+
+    # Incrementa la versione dei progressi della partita nella stessa transazione
+    version = await db.run_sync(progress_version.bump, save_id)
 
     # Prova a fare il commit delle modifiche tutte insieme
     try:
-        db.commit()
+        await db.commit()
         logger.info("Commit del database eseguito con successo")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Errore durante il commit del database: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Errore durante l'aggiornamento: {str(e)}")
 
-    response = {
-        "message": "Aggiornamento delle catture completato con successo",
-        "captures": feedback,
-        **conquests
-    }
+    # Notifica la modifica ai client collegati al flusso della partita
+    progress_stream.publish(save_id, version, "captures", {
+        "updates": [list(pair) for updates, _ in accepted for pair in updates], **conquests
+    })
+
+    last = accepted[-1][1]
+    return [
+        feedback if isinstance(feedback, HTTPException) else {
+            "message": "Aggiornamento delle catture completato con successo",
+            "captures": feedback,
+            **(conquests if feedback is last else {key: None for key in conquests})
+        }
+        for feedback in results
+    ]
+
+
+async def apply_coalesced_captures(save_id: int, batch: list[list[tuple[int, int]]]) -> list:
+    """
+    Handler dell'accorpamento delle catture: applica le richieste del gruppo in un'unica transazione,
+    in una sessione propria. Le richieste non valide ricevono il proprio errore senza influire sulle altre.
+
+    :param save_id: ID della partita.
+    :param batch: Coppie (ID del mostro, variazione) di ciascuna richiesta, nell'ordine di arrivo.
+    :return: La risposta o l'eccezione HTTP di ciascuna richiesta.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await commit_capture_updates(db, save_id, batch)
+    except HTTPException as e:
+        return [e] * len(batch)
+
+
+# Accorpamento delle variazioni di cattura ravvicinate, attivo se CAPTURE_COALESCING_WINDOW_MS è maggiore di 0
+capture_coalescer = WriteCoalescer(
+    CAPTURE_COALESCING_WINDOW_MS, CAPTURE_COALESCING_MAX_BATCH, apply_coalesced_captures
+)
+
+
+# Rotta per aggiornare il numero di catture dei mostri
+@try_except
+@router.post("/update_captures")
+async def update_fiend_captures(
+        request: schemas.FiendCapturesUpdateRequest,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    """
+    Aggiorna il numero di catture dei mostri indicati nella richiesta, nella partita indicata dall'header
+    `X-Save-Id` (o in quella predefinita), e registra la variazione nel registro degli eventi della partita.
+
+    Con l'accorpamento attivo, le richieste ricevute per la stessa partita entro la finestra configurata
+    vengono applicate in un'unica transazione: ogni richiesta riceve le proprie catture aggiornate,
+    mentre le conquiste create o annullate dal gruppo vengono restituite all'ultima richiesta.
+
+    :param request: Richiesta contenente una lista di mostri e le variazioni di cattura.
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
+    :raises HTTPException: Se un mostro non viene trovato o i dati non sono validi, lancia un'eccezione HTTP.
+    :return: Un messaggio di conferma o errore.
+    """
+    logger.info("Richiesta di aggiornamento ricevuta: updates=%s", request.updates)
+
+    updates = [(update_request.fiend_id, update_request.delta) for update_request in request.updates]
+    if capture_coalescer.enabled:
+        response = await capture_coalescer.submit(save_id, updates)
+    else:
+        (response,) = await commit_capture_updates(db, save_id, [updates])
+        if isinstance(response, HTTPException):
+            raise response
     logger.info("Risposta restituita: %s", response)
 
     return response
@@ -142,22 +365,24 @@ def update_fiend_captures(request: schemas.FiendCapturesUpdateRequest, db: Sessi
 # Rotta per resettare il numero di catture di tutti i mostri
 @try_except
 @router.post("/reset")
-def reset_fiends(db: Session = Depends(get_db)):
-    for fiend in db.query(models.Fiend).all():
-        fiend.was_captured = 0
+async def reset_fiends(db: AsyncSession = Depends(get_async_db), save_id: int = Depends(get_save_id)):
+    # Azzera catture, flag delle conquiste e riepiloghi della partita con pochi UPDATE di massa, dopo aver
+    # bloccato tutte le righe dei progressi della partita nello stesso ordine delle altre scritture
+    if not await db.run_sync(lock_save, save_id):
+        raise save_not_found(save_id)
+    await db.run_sync(reset_game, save_id)
 
-    for model_conquest in [models.AreaConquest, models.SpeciesConquest, models.OriginalCreation]:
-        conquests = db.query(model_conquest).all()
+    # Il reset non può essere annullato: viene registrato insieme a una nuova istantanea della partita
+    await db.run_sync(record_event, save_id, "reset", {}, snapshot=True)
 
-        for conquest in conquests:
-            conquest.created = False
-            conquest.defeated = False
+    version = await db.run_sync(progress_version.bump, save_id)
 
     # Prova a fare il commit delle modifiche
     try:
-        db.commit()
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Errore durante l'aggiornamento: {str(e)}")
 
+    progress_stream.publish(save_id, version, "reset", {})
     return {"message": "Il database è stato inizializzato con successo"}
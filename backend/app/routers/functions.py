@@ -1,17 +1,77 @@
 # backend/app/routers/functions.py
-from typing import Optional
-from fastapi import HTTPException
-from sqlalchemy.orm import Session  # Importa la sessione per interagire con il database
+import inspect
+import json
+from typing import Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, and_, case, select
+from sqlalchemy.ext.asyncio import AsyncSession  # Importa la sessione asincrona usata dalle rotte
+from sqlalchemy.orm import Session, joinedload, selectinload  # Importa la sessione per interagire con il database
+from app import models
 from app.database import Base
-from app.schemas import ConquestRepr, FullDetailsResponse, NemesisResponse
+from app.schemas import ConquestRepr, FullDetailsResponse, NemesisResponse, OriginalCreationResponse
 from app.creation_conditions import CreationConditions
+from app.events import record_event
+from app.progress import CATALOGUE_STATES, STATE_KEYS, lock_for_defeat, lock_save, set_conquest_flags
+from app.progress_stream import progress_stream
+from app.progress_version import progress_version
+from app.reference_data import reference_data
+from app.saves import save_not_found
+
+# Strategie di caricamento delle relazioni usate dai dettagli completi di ciascun tipo di conquista:
+# ricompense e statistiche arrivano dalla cache dei dati di riferimento, quindi vengono caricati in anticipo
+# solo la zona e i mostri richiesti, per un massimo di due query per tipo di conquista.
+FULL_DETAILS_LOADERS = {
+    models.AreaConquest: [
+        joinedload(models.AreaConquest.zone)
+        .selectinload(models.Zone.fiends)
+        .load_only(models.Fiend.id, models.Fiend.name)
+    ],
+    models.SpeciesConquest: [
+        selectinload(models.SpeciesConquest.fiends)
+        .load_only(models.Fiend.id, models.Fiend.name)
+    ],
+    models.OriginalCreation: [],
+}
+
+# Campi specifici di ciascun tipo di conquista da aggiungere ai dettagli completi
+FULL_DETAILS_FIELDS = {
+    models.AreaConquest: lambda area_conquest: dict(
+        zone_id=area_conquest.zone.id,
+        zone_name=area_conquest.zone.name,
+        required_fiends=sorted(((fiend.id, fiend.name) for fiend in area_conquest.zone.fiends), key=lambda x: x[0])
+    ),
+    models.SpeciesConquest: lambda species_conquest: dict(
+        required_fiends_amount=species_conquest.required_fiends,
+        required_fiends=sorted(((fiend.id, fiend.name) for fiend in species_conquest.fiends), key=lambda x: x[0])
+    ),
+    models.OriginalCreation: lambda original_creation: dict(
+        creation_rule=original_creation.creation_rule
+    ),
+}
+
+# Flag dei dettagli completi che cambiano con i progressi e vengono letti dal database ad ogni richiesta
+LIVE_FLAGS = {"created", "defeated"}
 
 
 def try_except(func):
     """
     Decoratore per gestire le eccezioni nei metodi di questo modulo,
-    distinguendo tra errori server-side e client-side.
+    distinguendo tra errori server-side e client-side. Supporta sia funzioni sincrone che asincrone.
     """
+    if inspect.iscoroutinefunction(func):
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException as e:
+                # Passa eccezioni HTTPException esistenti senza modificarle
+                print(e)
+                raise e
+            except Exception as e:
+                # Per altre eccezioni, restituisce un errore generico server-side
+                print(e)
+                raise HTTPException(status_code=500, detail=f"Errore interno: {str(e)}")
+        return async_wrapper
+
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
@@ -26,40 +86,108 @@ def try_except(func):
     return wrapper
 
 
+def select_with_state(model: type[Base], save_id: int) -> Select:
+    """
+    Costruisce la SELECT delle colonne di un modello del catalogo (mostri o conquiste) insieme alle colonne
+    del suo stato nella partita (`was_captured`, oppure `created` e `defeated`), letto dalla tabella di stato
+    con una join sulla chiave primaria.
+
+    :param model: Modello del catalogo.
+    :param save_id: ID della partita.
+    :return: SELECT le cui righe hanno gli stessi attributi degli schemi di risposta.
+    """
+    state_model = CATALOGUE_STATES[model]
+    state_columns = [column for column in state_model.__table__.columns if not column.primary_key]
+    return (
+        select(*model.__table__.columns, *state_columns)
+        .join(state_model, and_(STATE_KEYS[state_model] == model.id, state_model.save_id == save_id))
+    )
+
 
 @try_except
-def get_one(db: Session, model: type[Base], obj_id: int) -> Base:
+async def get_one(
+        db: AsyncSession,
+        model: type[Base],
+        obj_id: int,
+        options: Sequence = (),
+        save_id: Optional[int] = None
+) -> Base:
     """
     Recupera un oggetto di un modello dal database.
 
     :param db: Sessione del database.
     :param model: Modello da cui recuperare l'oggetto.
     :param obj_id: ID dell'oggetto da recuperare.
+    :param options: Opzioni di caricamento delle relazioni da applicare alla query.
+    :param save_id: ID della partita: se indicato, restituisce una riga con lo stato dell'oggetto nella partita.
     :return: Oggetto del modello.
     """
-    query = db.query(model).filter(model.id == obj_id).first()
+    if save_id is not None:
+        query = (await db.execute(select_with_state(model, save_id).where(model.id == obj_id))).first()
+    else:
+        query = (await db.scalars(select(model).options(*options).where(model.id == obj_id))).first()
     if not query:
         raise HTTPException(status_code=404, detail=f'"{model.__name__}" non trovato')
     return query
 
 
 @try_except
-def get_all(db: Session, model: type[Base]) -> list[Base]:
+async def get_all(db: AsyncSession, model: type[Base], save_id: Optional[int] = None) -> list[Base]:
     """
     Recupera tutti gli oggetti di un modello dal database.
 
     :param db: Sessione del database.
     :param model: Modello da cui recuperare gli oggetti.
+    :param save_id: ID della partita: se indicato, restituisce righe con lo stato degli oggetti nella partita.
     :return: Lista di oggetti del modello.
     """
-    query = db.query(model).order_by(model.id).all()
+    if save_id is not None:
+        query = (await db.execute(select_with_state(model, save_id).order_by(model.id))).all()
+    else:
+        query = (await db.scalars(select(model).order_by(model.id))).all()
     if not query:
         raise HTTPException(status_code=404, detail=f'"{model.__name__}" non trovato')
     return query
 
 
 @try_except
-def repr(db: Session, model: type[Base], creation_name: str, category_name: str, destination: str) -> ConquestRepr:
+async def get_zones_status(db: AsyncSession, save_id: int) -> list:
+    """
+    Recupera tutte le zone insieme al loro stato di completamento in una partita, letto dalla tabella
+    di riepilogo dei progressi `zone_progress` (una riga per zona e partita, aggiornata ad ogni variazione
+    delle catture).
+
+    Lo stato vale:
+    - `completed`: tutti i mostri della zona sono stati catturati 10 volte (o la zona non ha mostri);
+    - `area_conquest_created`: tutti i mostri della zona sono stati catturati almeno una volta;
+    - `just_started`: almeno un mostro della zona è stato catturato;
+    - `fresh`: nessun mostro della zona è stato catturato.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :return: Lista di righe (id, name, image_url, status) ordinate per ID.
+    """
+    progress = models.ZoneProgress
+
+    status = case(
+        (progress.completed_fiends == progress.total_fiends, "completed"),
+        (progress.uncaptured_fiends == 0, "area_conquest_created"),
+        (progress.uncaptured_fiends < progress.total_fiends, "just_started"),
+        else_="fresh"
+    )
+
+    query = (await db.execute(
+        select(models.Zone.id, models.Zone.name, models.Zone.image_url, status.label("status"))
+        .join(progress, and_(progress.zone_id == models.Zone.id, progress.save_id == save_id))
+        .order_by(models.Zone.id)
+    )).all()
+    if not query:
+        raise HTTPException(status_code=404, detail='"Zone" non trovato')
+    return query
+
+
+@try_except
+async def repr(db: AsyncSession, model: type[Base], creation_name: str, category_name: str, destination: str) -> ConquestRepr:
     """
     Recupera un oggetto di un modello dal database.
 
@@ -68,7 +196,7 @@ def repr(db: Session, model: type[Base], creation_name: str, category_name: str,
     :param creation_name: Nome dell'oggetto da recuperare.
     :return: Oggetto del modello.
     """
-    query = db.query(model).filter(model.name == creation_name).first()
+    query = (await db.scalars(select(model).where(model.name == creation_name))).first()
     if not query:
         raise HTTPException(status_code=404, detail=f'"{creation_name}" non trovato')
 
@@ -80,24 +208,65 @@ def repr(db: Session, model: type[Base], creation_name: str, category_name: str,
     )
 
 
+async def set_defeated(
+        db: AsyncSession,
+        save_id: int,
+        model: type[Base],
+        obj_id: int,
+        defeated: bool
+) -> tuple[bool, Optional[OriginalCreationResponse]]:
+    """
+    Imposta il flag `defeated` di una conquista in una partita e verifica di conseguenza il prototipo
+    "il supremo", senza eseguire il commit.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param model: Modello della conquista.
+    :param obj_id: ID della conquista.
+    :param defeated: Nuovo valore del flag.
+    :return: Il valore precedente del flag e il prototipo "il supremo", se creato o annullato.
+    """
+    # Blocca lo stato della conquista e dei prototipi zoolab nella partita prima di leggerlo
+    await db.run_sync(lock_for_defeat, save_id, model, obj_id)
+    conquest = await get_one(db, model, obj_id)
+    state = await db.get(CATALOGUE_STATES[model], (save_id, obj_id), populate_existing=True)
+    previous = state.defeated
+    await db.run_sync(set_conquest_flags, conquest, state, defeated=defeated)
+
+    await db.flush()
+
+    return previous, await CreationConditions(db, save_id).check_il_supremo()
+
+
 @try_except
-def __defeat_func(db: Session, model: type[Base], obj_id: int, defeated: bool) -> Optional[NemesisResponse]:
-    conquest = get_one(db, model, obj_id)
-    conquest.defeated = defeated
+async def __defeat_func(
+        db: AsyncSession,
+        save_id: int,
+        model: type[Base],
+        obj_id: int,
+        defeated: bool
+) -> Optional[NemesisResponse]:
+    # Blocca la partita prima degli stati, nello stesso ordine delle altre scritture
+    if not await db.run_sync(lock_save, save_id):
+        raise save_not_found(save_id)
+    previous, il_supremo = await set_defeated(db, save_id, model, obj_id, defeated)
 
-    db.flush()
-    db.refresh(conquest)
+    # Registra la modifica nel registro degli eventi della partita, nella stessa transazione
+    await db.run_sync(record_event, save_id, "defeat", {
+        "conquest": model.__tablename__, "id": obj_id, "defeated": defeated, "previous": previous
+    })
 
-    il_supremo = CreationConditions(db).check_il_supremo()
+    version = await db.run_sync(progress_version.bump, save_id)
 
     try:
-        db.commit()
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Errore durante l'aggiornamento: {str(e)}")
 
+    nemesis = None
     if il_supremo:
-        return NemesisResponse(
+        nemesis = NemesisResponse(
             id=il_supremo.id,
             name=il_supremo.name,
             image_url=il_supremo.image_url,
@@ -108,64 +277,130 @@ def __defeat_func(db: Session, model: type[Base], obj_id: int, defeated: bool) -
             type='Prototipo'
         )
 
+    # Notifica la modifica ai client collegati al flusso della partita
+    progress_stream.publish(save_id, version, "defeat", {
+        "conquest": model.__tablename__,
+        "id": obj_id,
+        "defeated": defeated,
+        "original_creations": [nemesis] if nemesis else None
+    })
+    return nemesis
+
 
 @try_except
-def defeated(db: Session, model: type[Base], obj_id: int) -> Optional[NemesisResponse]:
+async def defeated(db: AsyncSession, save_id: int, model: type[Base], obj_id: int) -> Optional[NemesisResponse]:
     """
-    Segna un oggetto come sconfitto.
+    Segna un oggetto come sconfitto in una partita.
 
     :param db: Sessione del database.
+    :param save_id: ID della partita.
     :param model: Modello dell'oggetto da segnare come sconfitto.
     :param obj_id: ID dell'oggetto da segnare come sconfitto.
     :return: Oggetto aggiornato.
     """
-    return __defeat_func(db, model, obj_id, True)
+    return await __defeat_func(db, save_id, model, obj_id, True)
 
 
 @try_except
-def undefeated(db: Session, model: type[Base], obj_id: int) -> Optional[NemesisResponse]:
+async def undefeated(db: AsyncSession, save_id: int, model: type[Base], obj_id: int) -> Optional[NemesisResponse]:
     """
-    Segna un oggetto come non sconfitto.
+    Segna un oggetto come non sconfitto in una partita.
 
     :param db: Sessione del database.
+    :param save_id: ID della partita.
     :param model: Modello dell'oggetto da segnare come non sconfitto.
     :param obj_id: ID dell'oggetto da segnare come non sconfitto.
     :return: Oggetto aggiornato.
     """
-    return __defeat_func(db, model, obj_id, False)
+    return await __defeat_func(db, save_id, model, obj_id, False)
 
 
 @try_except
-def full_details(obj, **fields) -> FullDetailsResponse:
+def full_details(db: Session, obj, **fields) -> FullDetailsResponse:
     """
     Recupera i dettagli completi di un oggetto.
 
+    Ricompense, statistiche, debolezze e resistenze vengono lette dalla cache dei dati di riferimento:
+    dal database provengono solo i dati dell'oggetto stesso. I flag `created` e `defeated` dipendono
+    dalla partita e vengono aggiunti da `full_details_document`.
+
+    :param db: Sessione del database, usata solo se la cache deve essere caricata.
     :param obj: Oggetto da cui recuperare i dettagli.
     """
+    reference = reference_data.get(db)
 
-    rewards_dict = {reward.reward_type: reward for reward in obj.rewards}
-    creation_reward = rewards_dict.get('creation')
-    battle_reward = rewards_dict.get('battle')
-    common_steal = rewards_dict.get('common_steal')
-    rare_steal = rewards_dict.get('rare_steal')
-    obj_stats = next(stats for stats in obj.stats)
+    rewards_dict = reference.element_rewards(obj)
+    obj_stats = reference.element_stat(obj)
 
     return FullDetailsResponse(
         id=obj.id,
         name=obj.name,
         image_url=obj.image_url,
-        created=obj.created,
-        defeated=obj.defeated,
-        creation_reward=(creation_reward.item.name, creation_reward.quantity),
-        battle_reward=(battle_reward.item.name, battle_reward.quantity),
-        common_steal=(common_steal.item.name, common_steal.quantity) if common_steal else None,
-        rare_steal=(rare_steal.item.name, rare_steal.quantity),
-        stats=obj_stats,
-        hp=obj_stats.stats.hp,
-        mp=obj_stats.stats.mp,
-        ap=obj_stats.stats.ap,
-        overkill=obj_stats.stats.overkill,
-        ap_overkill=obj_stats.stats.ap_overkill,
-        guild=obj_stats.stats.guil,
+        creation_reward=rewards_dict.get('creation'),
+        battle_reward=rewards_dict.get('battle'),
+        common_steal=rewards_dict.get('common_steal'),
+        rare_steal=rewards_dict.get('rare_steal'),
+        weakness=reference.element_weakness(obj) or None,
+        resistance=reference.element_resistance(obj) or None,
+        **obj_stats,
         **fields
     )
+
+
+def build_full_details_documents(db: Session) -> None:
+    """
+    Costruisce una volta sola i documenti dei dettagli completi di tutti i campioni di zona, campioni di specie
+    e prototipi zoolab, salvandoli nella cache dei dati di riferimento come JSON già serializzato
+    e privo dei flag `created` e `defeated`, che vengono aggiunti ad ogni richiesta.
+
+    :param db: Sessione del database.
+    """
+    reference = reference_data.get(db)
+    documents = {}
+
+    for model, loaders in FULL_DETAILS_LOADERS.items():
+        for obj in db.query(model).options(*loaders).order_by(model.id).all():
+            document = full_details(db, obj, **FULL_DETAILS_FIELDS[model](obj))
+            documents[(model.__tablename__, obj.id)] = document.model_dump_json(exclude=LIVE_FLAGS).encode()
+
+    reference.set_details(documents)
+
+
+@try_except
+async def full_details_document(db: AsyncSession, save_id: int, model: type[Base], obj_id: int) -> Response:
+    """
+    Restituisce i dettagli completi di un oggetto a partire dal documento precalcolato, leggendo dal database
+    solo i flag `created` e `defeated` della partita e inserendoli nel JSON già serializzato.
+
+    :param db: Sessione del database.
+    :param save_id: ID della partita.
+    :param model: Modello dell'oggetto.
+    :param obj_id: ID dell'oggetto.
+    :raises HTTPException: Se l'oggetto non viene trovato, lancia un'eccezione HTTP 404.
+    :return: Risposta JSON con i dettagli completi.
+    """
+    state_model = CATALOGUE_STATES[model]
+    flags = (await db.execute(
+        select(state_model.created, state_model.defeated)
+        .where(state_model.save_id == save_id, STATE_KEYS[state_model] == obj_id)
+    )).first()
+    if not flags:
+        raise HTTPException(status_code=404, detail=f'"{model.__name__}" non trovato')
+
+    key = (model.__tablename__, obj_id)
+    if reference_data.details_ready() and key not in reference_data.details:
+        # Elemento aggiunto al catalogo dopo la costruzione dei documenti: cache e documenti vengono ricostruiti
+        reference_data.invalidate()
+    if not reference_data.details_ready():
+        # La costruzione dei documenti usa le funzioni sincrone, eseguite sulla stessa connessione
+        await db.run_sync(build_full_details_documents)
+
+    document = reference_data.details.get(key)
+    if document is None:
+        raise HTTPException(status_code=404, detail=f'"{model.__name__}" non trovato')
+    body = b'{"created":%s,"defeated":%s,%s' % (
+        json.dumps(flags.created).encode(),
+        json.dumps(flags.defeated).encode(),
+        document[1:]
+    )
+    return Response(content=body, media_type="application/json")
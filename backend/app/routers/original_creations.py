@@ -1,65 +1,84 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
-from app.database import get_db
-from app.routers.functions import get_one, get_all, repr, defeated, undefeated, full_details
+from app.database import get_async_db
+from app.routers.functions import get_one, get_all, repr, defeated, undefeated, full_details_document
+from app.progress_version import progress_etag
+from app.saves import get_save_id
 
 router = APIRouter(
     prefix="/original_creations",
-    tags=["Original Creations"]
+    tags=["Original Creations"],
+    dependencies=[Depends(progress_etag)]
 )
 
 
 @router.get("/", response_model=list[schemas.OriginalCreation])
-def get_all_original_creations(db: Session = Depends(get_db)):
+async def get_all_original_creations(
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Restituisce tutte le creazioni originali.
 
     :param db: Sessione del database.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :return: Lista di creazioni originali.
     """
-    return get_all(db, models.OriginalCreation)
+    return await get_all(db, models.OriginalCreation, save_id=save_id)
 
 
 @router.get("/repr", response_model=schemas.ConquestRepr)
-def get_original_creation_repr(db: Session = Depends(get_db)):
+async def get_original_creation_repr(db: AsyncSession = Depends(get_async_db)):
     """
     Restituisce un oggetto rappresentativo di una creazione originale.
 
     :param db: Sessione del database.
     :return: Oggetto ConquestRepr.
     """
-    return repr(db, models.OriginalCreation, 'gasteropodos', 'Prototipi Zoolab', 'original_creations')
+    return await repr(db, models.OriginalCreation, 'gasteropodos', 'Prototipi Zoolab', 'original_creations')
 
 
 @router.get("/{original_creation_id}", response_model=schemas.OriginalCreation)
-def get_original_creation(original_creation_id: int, db: Session = Depends(get_db)):
-    return get_one(db, models.OriginalCreation, original_creation_id)
+async def get_original_creation(
+        original_creation_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await get_one(db, models.OriginalCreation, original_creation_id, save_id=save_id)
 
 
 @router.post("/{original_creation_id}/defeated")
-def defeated_original_creation(original_creation_id: int, db: Session = Depends(get_db)):
-    return defeated(db, models.OriginalCreation, original_creation_id)
+async def defeated_original_creation(
+        original_creation_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await defeated(db, save_id, models.OriginalCreation, original_creation_id)
 
 
 @router.post("/{original_creation_id}/undefeated")
-def undefeated_original_creation(original_creation_id: int, db: Session = Depends(get_db)):
-    return undefeated(db, models.OriginalCreation, original_creation_id)
+async def undefeated_original_creation(
+        original_creation_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await undefeated(db, save_id, models.OriginalCreation, original_creation_id)
 
 
 @router.get("/{original_creation_id}/full_details")
-def get_original_creation_full_details(original_creation_id: int, db: Session = Depends(get_db)):
+async def get_original_creation_full_details(
+        original_creation_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Restituisce i dettagli completi di una creazione originale.
 
     :param original_creation_id: ID della creazione originale.
     :param db: Sessione del database.
+    :param save_id: ID della partita (header `X-Save-Id`).
     :raises HTTPException: Se la creazione originale non viene trovata.
-    :return: Oggetto FullDetailsResponse.
+    :return: Risposta JSON con i dettagli completi.
     """
-    original_creation: models.OriginalCreation = get_one(db, models.OriginalCreation, original_creation_id)
-
-    return full_details(
-        original_creation,
-        creation_rule=original_creation.creation_rule,
-    )
+    return await full_details_document(db, save_id, models.OriginalCreation, original_creation_id)
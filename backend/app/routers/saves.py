@@ -0,0 +1,75 @@
+# backend/app/routers/saves.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app import models, schemas
+from app.database import get_async_db
+from app.saves import DEFAULT_SAVE_NAME, create_save, save_registry
+
+router = APIRouter(
+    prefix="/saves",
+    tags=["Saves"]
+)
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/", response_model=list[schemas.Save])
+async def get_saves(db: AsyncSession = Depends(get_async_db)):
+    """
+    Restituisce tutte le partite tracciate dal server. L'ID di una partita va indicato nell'header `X-Save-Id`
+    delle altre rotte; senza header viene usata la partita predefinita.
+
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :return: Lista delle partite.
+    """
+    return (await db.scalars(select(models.Save).order_by(models.Save.id))).all()
+
+
+@router.post("/", response_model=schemas.Save, status_code=201)
+async def post_save(request: schemas.SaveCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Crea una nuova partita con tutti i progressi a zero.
+
+    :param request: Nome della partita e utente proprietario (opzionale).
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :raises HTTPException: 409 se esiste già una partita con lo stesso nome.
+    :return: La partita creata.
+    """
+    try:
+        save = await db.run_sync(create_save, request.name, request.user_id)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f'Esiste già una partita "{request.name}"')
+
+    save_registry.add(save.id)
+    return save
+
+
+@router.delete("/{save_id}")
+async def delete_save(save_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Elimina una partita e, a cascata, tutti i suoi progressi. La partita predefinita non può essere eliminata.
+
+    :param save_id: ID della partita da eliminare.
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :raises HTTPException: 404 se la partita non esiste, 403 se è la partita predefinita.
+    :return: Un messaggio di conferma.
+    """
+    save = await db.get(models.Save, save_id)
+    if not save:
+        raise HTTPException(status_code=404, detail=f"Partita con ID {save_id} non trovata")
+    if save.name == DEFAULT_SAVE_NAME:
+        raise HTTPException(status_code=403, detail="La partita predefinita non può essere eliminata")
+
+    # Le righe di stato vengono eliminate dal database tramite ON DELETE CASCADE
+    await db.delete(save)
+    await db.commit()
+    save_registry.discard(save_id)
+
+    logger.info(f"Partita eliminata: {save.name} (ID {save_id})")
+    return {"message": f'La partita "{save.name}" è stata eliminata con successo'}
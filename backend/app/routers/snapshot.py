@@ -0,0 +1,42 @@
+# backend/app/routers/snapshot.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas
+from app.database import get_async_db
+from app.routers.functions import get_zones_status, select_with_state
+from app.progress_version import progress_etag
+from app.saves import get_save_id
+
+# Elementi del catalogo inclusi nello snapshot, con il relativo stato nella partita
+SNAPSHOT_MODELS = {
+    "fiends": models.Fiend,
+    "area_conquests": models.AreaConquest,
+    "species_conquests": models.SpeciesConquest,
+    "original_creations": models.OriginalCreation,
+}
+
+router = APIRouter(
+    prefix="/snapshot",
+    tags=["Snapshot"],
+    dependencies=[Depends(progress_etag)]
+)
+
+
+@router.get("/", response_model=schemas.ProgressSnapshot)
+async def get_snapshot(db: AsyncSession = Depends(get_async_db), save_id: int = Depends(get_save_id)):
+    """
+    Restituisce in un'unica risposta lo stato completo dei progressi di una partita: le zone con il loro stato
+    di completamento, le catture di tutti i mostri e i flag created/defeated di tutti i campioni e prototipi.
+    La risposta viene costruita con un numero fisso di query (una per tabella), indipendente dal numero di elementi.
+
+    :param db: Sessione del database ottenuta tramite dependency injection.
+    :param save_id: ID della partita (header `X-Save-Id`).
+    :return: Oggetto ProgressSnapshot.
+    """
+    return {
+        "zones": await get_zones_status(db, save_id),
+        **{
+            key: (await db.execute(select_with_state(model, save_id).order_by(model.id))).all()
+            for key, model in SNAPSHOT_MODELS.items()
+        },
+    }
@@ -1,52 +1,65 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas
-from app.database import get_db
-from app.routers.functions import get_one, get_all, repr, defeated, undefeated, full_details
+from app.database import get_async_db
+from app.routers.functions import get_one, get_all, repr, defeated, undefeated, full_details_document
+from app.progress_version import progress_etag
+from app.saves import get_save_id
 
 router = APIRouter(
     prefix="/species_conquests",
-    tags=["Species Conquests"]
+    tags=["Species Conquests"],
+    dependencies=[Depends(progress_etag)]
 )
 
 
 @router.get("/", response_model=list[schemas.SpeciesConquest])
-def get_all_species_conquests(db: Session = Depends(get_db)):
-    return get_all(db, models.SpeciesConquest)
+async def get_all_species_conquests(
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await get_all(db, models.SpeciesConquest, save_id=save_id)
 
 
 @router.get("/repr")
-def get_species_conquest_repr(db: Session = Depends(get_db)):
-    return repr(db, models.SpeciesConquest, 'unioculum', 'Campioni di Specie', 'species_conquests')
+async def get_species_conquest_repr(db: AsyncSession = Depends(get_async_db)):
+    return await repr(db, models.SpeciesConquest, 'unioculum', 'Campioni di Specie', 'species_conquests')
 
 
 @router.get("/{species_conquest_id}", response_model=schemas.SpeciesConquest)
-def get_species_conquest(species_conquest_id: int, db: Session = Depends(get_db)):
-    return get_one(db, models.SpeciesConquest, species_conquest_id)
+async def get_species_conquest(
+        species_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await get_one(db, models.SpeciesConquest, species_conquest_id, save_id=save_id)
 
 
 @router.post("/{species_conquest_id}/defeated")
-def defeated_species_conquest(species_conquest_id: int, db: Session = Depends(get_db)):
-    return defeated(db, models.SpeciesConquest, species_conquest_id)
+async def defeated_species_conquest(
+        species_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await defeated(db, save_id, models.SpeciesConquest, species_conquest_id)
 
 
 @router.post("/{species_conquest_id}/undefeated")
-def undefeated_species_conquest(species_conquest_id: int, db: Session = Depends(get_db)):
-    return undefeated(db, models.SpeciesConquest, species_conquest_id)
+async def undefeated_species_conquest(
+        species_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
+    return await undefeated(db, save_id, models.SpeciesConquest, species_conquest_id)
 
 
 @router.get("/{species_conquest_id}/full_details")
-def get_species_conquest_full_details(species_conquest_id: int, db: Session = Depends(get_db)):
+async def get_species_conquest_full_details(
+        species_conquest_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        save_id: int = Depends(get_save_id)
+):
     """
     Recupera i dettagli completi di un campione di specie.
     """
-    species_conquest: models.SpeciesConquest = get_one(db, models.SpeciesConquest, species_conquest_id)
-
-    required_fiends = [(fiend.id, fiend.name) for fiend in species_conquest.fiends]
-    required_fiends = sorted(required_fiends, key=lambda x: x[0])
-
-    return full_details(
-        species_conquest,
-        required_fiends_amount=species_conquest.required_fiends,
-        required_fiends=required_fiends,
-    )
+    return await full_details_document(db, save_id, models.SpeciesConquest, species_conquest_id)
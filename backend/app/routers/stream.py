@@ -0,0 +1,76 @@
+# backend/app/routers/stream.py
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+import logging
+
+from app.config import STREAM_KEEPALIVE_SECONDS
+from app.database import AsyncSessionLocal
+from app.progress_stream import format_message, progress_stream
+from app.progress_version import progress_version
+from app.saves import get_save_id, save_not_found
+
+router = APIRouter(
+    prefix="/stream",
+    tags=["Stream"]
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def event_source(request: Request, save_id: int, last_event_id: Optional[str]):
+    queue = progress_stream.subscribe(save_id)
+    try:
+        # La versione viene letta dopo la registrazione, così le modifiche confermate nel frattempo arrivano in coda
+        async with AsyncSessionLocal() as db:
+            version = progress_version.token(save_id, await progress_version.current(db, save_id))
+
+        # Il client che si ricollega dopo aver perso delle modifiche deve ricaricare i dati
+        yield "retry: 3000\n\n"
+        if last_event_id is not None and last_event_id != version:
+            yield format_message("resync", {}, version)
+        yield format_message("ready", {"version": version}, version)
+
+        while not await request.is_disconnected():
+            try:
+                yield await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        progress_stream.unsubscribe(save_id, queue)
+
+
+@router.get("/")
+async def stream_progress(
+        request: Request,
+        save: Optional[int] = None,
+        x_save_id: Optional[int] = Header(None),
+        last_event_id: Optional[str] = Header(None)
+):
+    """
+    Flusso Server-Sent Events delle modifiche confermate ai progressi di una partita: variazioni di cattura
+    con le conquiste create o annullate, sconfitte, reset, annullamenti e ripristini. Permette a più schede
+    o dispositivi di restare sincronizzati senza interrogare periodicamente le liste.
+
+    Al collegamento viene inviato un messaggio `ready` con la versione attuale dei progressi; se l'header
+    `Last-Event-ID` di una riconnessione non corrisponde alla versione attuale viene inviato prima un `resync`.
+
+    :param request: Richiesta HTTP in ingresso, usata per rilevare la disconnessione del client.
+    :param save: ID della partita come parametro di query, perché `EventSource` non può inviare header.
+    :param x_save_id: ID della partita (header `X-Save-Id`), usato se `save` non è indicato.
+    :param last_event_id: ID dell'ultimo messaggio ricevuto dal client prima della riconnessione.
+    :raises HTTPException: 404 se la partita non esiste.
+    :return: Risposta `text/event-stream`.
+    """
+    # La sessione viene chiusa subito: il flusso resta aperto a lungo e non deve occupare una connessione del pool
+    async with AsyncSessionLocal() as db:
+        save_id = await get_save_id(save if save is not None else x_save_id, db)
+        if await progress_version.current(db, save_id) is None:
+            raise save_not_found(save_id)
+
+    return StreamingResponse(
+        event_source(request, save_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,132 @@
+# backend/app/saves.py
+import threading
+from typing import Optional
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import models
+from app.database import get_async_db
+from app.events import ensure_snapshot
+from app.progress import ensure_progress
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Nome della partita usata dalle richieste che non indicano l'header `X-Save-Id`
+DEFAULT_SAVE_NAME = "partita principale"
+
+
+class SaveRegistry:
+    """
+    Cache di processo delle partite esistenti, così la validazione dell'header `X-Save-Id` non richiede
+    una query ad ogni richiesta. Viene aggiornata dalla creazione e dall'eliminazione delle partite.
+
+    Attributes:
+        default_id (Optional[int]): ID della partita predefinita, se già risolto.
+    """
+
+    def __init__(self):
+        self.default_id: Optional[int] = None
+        self._known: set[int] = set()
+        self._lock = threading.Lock()
+
+    def add(self, save_id: int) -> None:
+        with self._lock:
+            self._known.add(save_id)
+
+    def discard(self, save_id: int) -> None:
+        with self._lock:
+            self._known.discard(save_id)
+            if self.default_id == save_id:
+                self.default_id = None
+
+    def __contains__(self, save_id: int) -> bool:
+        return save_id in self._known
+
+
+# Istanza condivisa dall'intero processo
+save_registry = SaveRegistry()
+
+
+def create_save(db: Session, name: str, user_id: Optional[int] = None) -> models.Save:
+    """
+    Crea una nuova partita con tutti i progressi a zero: righe di stato di mostri e conquiste,
+    tabelle di riepilogo, contatori globali e istantanea iniziale del registro degli eventi.
+    Il commit è a carico del chiamante.
+
+    :param db: Sessione del database.
+    :param name: Nome della partita.
+    :param user_id: ID dell'utente proprietario della partita (opzionale).
+    :return: La partita creata.
+    """
+    save = models.Save(name=name, user_id=user_id)
+    db.add(save)
+    db.flush()
+    ensure_progress(db, save.id)
+    ensure_snapshot(db, save.id)
+    logger.info(f"Partita creata: {name} (ID {save.id})")
+    return save
+
+
+def ensure_saves(db: Session) -> None:
+    """
+    Crea la partita predefinita se non esiste e allinea le righe di stato e le tabelle di riepilogo
+    di tutte le partite al catalogo presente nel database, scrivendo l'istantanea iniziale del registro
+    degli eventi delle partite che non ne hanno. Il commit è a carico del chiamante.
+
+    :param db: Sessione del database.
+    """
+    if not db.query(models.Save).filter(models.Save.name == DEFAULT_SAVE_NAME).first():
+        create_save(db, DEFAULT_SAVE_NAME)
+
+    for (save_id,) in db.query(models.Save.id).order_by(models.Save.id).all():
+        ensure_progress(db, save_id)
+        ensure_snapshot(db, save_id)
+        save_registry.add(save_id)
+
+
+def save_not_found(save_id: int) -> HTTPException:
+    """
+    Rimuove dalla cache una partita eliminata da un altro processo e restituisce l'errore 404 corrispondente.
+
+    :param save_id: ID della partita.
+    :return: Eccezione HTTP 404 da sollevare.
+    """
+    save_registry.discard(save_id)
+    logger.warning(f"Partita {save_id} non più presente nel database, rimossa dalla cache")
+    return HTTPException(status_code=404, detail=f"Partita con ID {save_id} non trovata")
+
+
+async def get_save_id(
+        x_save_id: Optional[int] = Header(None),
+        db: AsyncSession = Depends(get_async_db)
+) -> int:
+    """
+    Dependency che restituisce l'ID della partita a cui si riferisce la richiesta, indicato dall'header
+    `X-Save-Id` oppure, se assente, quello della partita predefinita.
+
+    La cache è di processo e non vede le partite eliminate da altri worker: le richieste GET verificano la partita
+    leggendone la versione dei progressi (`progress_etag`), le modifiche bloccandone la riga all'inizio della
+    transazione (`app.progress.lock_save`). In entrambi i casi una partita non più presente restituisce 404.
+
+    :param x_save_id: Valore dell'header `X-Save-Id`.
+    :param db: Sessione del database, usata solo se la partita non è ancora nella cache.
+    :raises HTTPException: 404 se la partita non esiste.
+    :return: ID della partita.
+    """
+    if x_save_id is None:
+        if save_registry.default_id is None:
+            save_id = await db.scalar(select(models.Save.id).where(models.Save.name == DEFAULT_SAVE_NAME))
+            if save_id is None:
+                raise HTTPException(status_code=404, detail="Partita predefinita non trovata")
+            save_registry.default_id = save_id
+            save_registry.add(save_id)
+        return save_registry.default_id
+
+    if x_save_id not in save_registry:
+        if not await db.scalar(select(models.Save.id).where(models.Save.id == x_save_id)):
+            raise HTTPException(status_code=404, detail=f"Partita con ID {x_save_id} non trovata")
+        save_registry.add(x_save_id)
+    return x_save_id
@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 
 
 class BaseElement(BaseModel):
@@ -137,3 +138,71 @@ class NemesisResponse(BaseElement):
     destination: str
     destination_name: str
 
+
+
+class ProgressSnapshot(BaseModel):
+    """Represents the whole game progress in a single response: zones with their status, fiends with their
+    captures and every area conquest, species conquest and original creation with its created/defeated flags."""
+    zones: list[Zone]
+    fiends: list[Fiend]
+    area_conquests: list[AreaConquest]
+    species_conquests: list[SpeciesConquest]
+    original_creations: list[OriginalCreation]
+
+
+class SaveCreate(BaseModel):
+    """Request to create a new playthrough (save), with a unique name and an optional owner user ID."""
+    name: str
+    user_id: Optional[int] = None
+
+
+class Save(SaveCreate):
+    """Represents a playthrough (save) tracked by the server, with SaveCreate fields and an ID."""
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProgressEvent(BaseModel):
+    """Represents an event of the append-only progress log of a save: a captures update, a defeat toggle, a reset,
+    or the undo/redo of a previous action, with its payload and the ID of the event it refers to."""
+    id: int
+    save_id: int
+    kind: str
+    payload: dict[str, Any]
+    target_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PoolStats(BaseModel):
+    """Represents the state of a database connection pool, with its wait statistics when instrumented."""
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    avg_wait_ms: Optional[float] = None
+    max_wait_ms: Optional[float] = None
+
+
+class PoolStatus(BaseModel):
+    """Represents the state of the connection pools of the sync and async engines."""
+    sync_engine: PoolStats
+    async_engine: PoolStats
+
+
+class CoalescerStats(BaseModel):
+    """Represents the configuration and the counters of the capture write coalescer."""
+    enabled: bool
+    window_ms: int
+    max_batch: int
+    requests: int
+    batches: int
+    pending: int
@@ -0,0 +1,106 @@
+# backend/app/sqlite_catalogue.py
+import atexit
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from typing import Optional
+from app.catalogue_files import read_manifest
+from app.config import SQLITE_CATALOGUE
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+# Il catalogo precompilato è un database SQLite con lo schema completo, il catalogo caricato dai file dei dati,
+# la partita predefinita a zero e le statistiche dell'ottimizzatore (ANALYZE), compattato con VACUUM.
+# La versione dei file del catalogo da cui è stato costruito è salvata in `PRAGMA user_version`.
+# Si ricostruisce dalla directory backend con:
+#
+#   python -m app.sqlite_catalogue
+
+
+def catalogue_version(path: str) -> Optional[int]:
+    """Restituisce la versione dei file del catalogo da cui è stato costruito un database SQLite, se esiste."""
+    if not os.path.exists(path):
+        return None
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as connection:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def build_catalogue(path: str = SQLITE_CATALOGUE) -> None:
+    """
+    Costruisce il catalogo precompilato in un file temporaneo e lo sostituisce a quello esistente
+    solo a costruzione completata.
+
+    :param path: Percorso del catalogo precompilato.
+    """
+    # Importati qui: il modulo viene usato anche da `app.database` durante la sua inizializzazione
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app import models, population_data
+
+    version = read_manifest()["version"]
+    temporary = f"{path}.tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    engine = create_engine(f"sqlite:///{temporary}")
+    try:
+        models.Base.metadata.create_all(engine)
+        population_data.db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+        population_data.populate_data(bulk=True)
+    finally:
+        engine.dispose()
+
+    with closing(sqlite3.connect(temporary, isolation_level=None)) as connection:
+        # populate_data segnala gli errori senza sollevarli: un catalogo vuoto non deve sostituire quello esistente
+        if not connection.execute("SELECT COUNT(*) FROM fiends").fetchone()[0]:
+            raise RuntimeError("Costruzione del catalogo precompilato non riuscita")
+        connection.execute("ANALYZE")
+        connection.execute(f"PRAGMA user_version = {int(version)}")
+        connection.execute("VACUUM")
+    os.replace(temporary, path)
+    logger.info(f"Catalogo precompilato (versione {version}) scritto in {path}")
+
+
+def prepare_sqlite_database(path: str) -> str:
+    """
+    Prepara il file del database SQLite usato dal server: se non esiste lo crea copiando il catalogo
+    precompilato, così l'avvio non richiede il popolamento. Con `:memory:` la copia viene fatta in un file
+    temporaneo, eliminato alla chiusura del processo.
+
+    :param path: Percorso del database (SQLITE_PATH).
+    :return: Percorso del file da aprire.
+    """
+    version = catalogue_version(SQLITE_CATALOGUE)
+    if version is None:
+        logger.warning(
+            f"Catalogo precompilato {SQLITE_CATALOGUE} non trovato: eseguire `python -m app.sqlite_catalogue`"
+        )
+    elif version != read_manifest()["version"]:
+        logger.warning(f"Il catalogo precompilato (versione {version}) non corrisponde ai file dei dati")
+
+    if path == ":memory:":
+        descriptor, path = tempfile.mkstemp(prefix="zoolab-", suffix=".db")
+        os.close(descriptor)
+        os.remove(path)
+        atexit.register(remove_database, path)
+
+    if not os.path.exists(path) and version is not None:
+        shutil.copyfile(SQLITE_CATALOGUE, path)
+        logger.info(f"Database {path} creato dal catalogo precompilato (versione {version})")
+    return path
+
+
+def remove_database(path: str) -> None:
+    """Elimina un database SQLite temporaneo insieme ai file del write-ahead log."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_catalogue()
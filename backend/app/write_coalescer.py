@@ -0,0 +1,101 @@
+# backend/app/write_coalescer.py
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+import logging
+
+# Configura il logger
+logger = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """
+    Accorpa le scritture che arrivano in rapida successione sulla stessa chiave (per esempio la stessa partita):
+    le richieste vengono trattenute per una breve finestra e poi applicate tutte insieme da un unico handler,
+    che restituisce il risultato di ciascuna richiesta nell'ordine di arrivo.
+
+    Un risultato che è un'eccezione viene sollevato solo nella richiesta corrispondente. Le richieste
+    il cui client si è disconnesso vengono comunque applicate.
+
+    Attributes:
+        window (float): Durata della finestra di accorpamento in secondi (0 per disattivare l'accorpamento).
+        max_batch (int): Numero di richieste oltre il quale il gruppo viene applicato senza attendere la finestra.
+        handler: Coroutine che riceve la chiave e le richieste del gruppo e restituisce i risultati.
+    """
+
+    def __init__(
+            self,
+            window_ms: int,
+            max_batch: int,
+            handler: Callable[[Hashable, list[Any]], Awaitable[list[Any]]]
+    ):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.handler = handler
+        self._pending: dict[Hashable, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._requests = 0
+        self._batches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """
+        Aggiunge una richiesta al gruppo in attesa per la chiave e ne attende il risultato.
+
+        :param key: Chiave del gruppo (per esempio l'ID della partita).
+        :param item: Richiesta da applicare.
+        :return: Il risultato della richiesta restituito dall'handler.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+        self._requests += 1
+
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.create_task(self._apply(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _apply(self, key: Hashable, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        self._batches += 1
+        logger.info(f"Applicazione di {len(batch)} richieste accorpate per {key}")
+        try:
+            results = await self.handler(key, [item for item, _ in batch])
+        except Exception as e:
+            logger.error(f"Errore durante l'applicazione delle richieste accorpate per {key}: {e}")
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Restituisce il numero di richieste ricevute e di gruppi applicati dall'avvio del processo."""
+        return {
+            "enabled": self.enabled,
+            "window_ms": round(self.window * 1000),
+            "max_batch": self.max_batch,
+            "requests": self._requests,
+            "batches": self._batches,
+            "pending": sum(len(batch) for batch in self._pending.values()),
+        }
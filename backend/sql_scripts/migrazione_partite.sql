@@ -0,0 +1,45 @@
+-- Migrazione dei progressi di gioco a partite multiple.
+-- Sostituita dalla revisione alembic 3f1c2a9d8b7e (`alembic upgrade head`), che crea anche le nuove tabelle.
+-- Copia catture e flag delle conquiste dalle colonne delle tabelle del catalogo (fiends.was_captured,
+-- *.created, *.defeated) nelle tabelle di stato per partita, assegnandoli alla partita predefinita.
+--
+-- Va eseguito dopo aver creato le nuove tabelle (saves, fiend_captures, area_conquest_states,
+-- species_conquest_states, original_creation_states) e prima di rimuovere le vecchie colonne.
+-- Le tabelle di riepilogo (zone_progress, species_conquest_progress, progress_counters) vanno ricreate
+-- con la colonna save_id: il server le ripopola all'avvio per ogni partita.
+
+BEGIN;
+
+INSERT INTO saves (name) VALUES ('partita principale') ON CONFLICT (name) DO NOTHING;
+
+INSERT INTO fiend_captures (save_id, fiend_id, was_captured)
+SELECT s.id, f.id, COALESCE(f.was_captured, 0)
+FROM fiends f, saves s
+WHERE s.name = 'partita principale'
+ON CONFLICT DO NOTHING;
+
+INSERT INTO area_conquest_states (save_id, area_conquest_id, created, defeated)
+SELECT s.id, c.id, COALESCE(c.created, FALSE), COALESCE(c.defeated, FALSE)
+FROM area_conquests c, saves s
+WHERE s.name = 'partita principale'
+ON CONFLICT DO NOTHING;
+
+INSERT INTO species_conquest_states (save_id, species_conquest_id, created, defeated)
+SELECT s.id, c.id, COALESCE(c.created, FALSE), COALESCE(c.defeated, FALSE)
+FROM species_conquests c, saves s
+WHERE s.name = 'partita principale'
+ON CONFLICT DO NOTHING;
+
+INSERT INTO original_creation_states (save_id, original_creation_id, created, defeated)
+SELECT s.id, c.id, COALESCE(c.created, FALSE), COALESCE(c.defeated, FALSE)
+FROM original_creations c, saves s
+WHERE s.name = 'partita principale'
+ON CONFLICT DO NOTHING;
+
+-- Rimozione delle vecchie colonne, ora sostituite dalle tabelle di stato
+ALTER TABLE fiends DROP COLUMN IF EXISTS was_captured;
+ALTER TABLE area_conquests DROP COLUMN IF EXISTS created, DROP COLUMN IF EXISTS defeated;
+ALTER TABLE species_conquests DROP COLUMN IF EXISTS created, DROP COLUMN IF EXISTS defeated;
+ALTER TABLE original_creations DROP COLUMN IF EXISTS created, DROP COLUMN IF EXISTS defeated;
+
+COMMIT;
@@ -0,0 +1,208 @@
+# backend/tests/conftest.py
+import importlib
+import os
+import subprocess
+import sys
+import uuid
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, Optional
+import pytest
+from sqlalchemy import event
+
+# I test vengono eseguiti su entrambi i database supportati. L'applicazione legge la configurazione all'importazione,
+# quindi per ogni database il pacchetto `app` viene reimportato con le variabili d'ambiente corrispondenti:
+#   - sqlite: copia temporanea di un catalogo precompilato costruito per la sessione di test;
+#   - postgresql: database temporaneo creato sul server indicato da DATABASE_USER e DATABASE_HOST (gli stessi
+#     valori predefiniti del server), popolato con il reseed ed eliminato al termine. Se il server non è
+#     raggiungibile i test su PostgreSQL vengono saltati.
+# I moduli dell'applicazione vanno quindi usati tramite la fixture `zoolab`, non importati dai moduli di test.
+#
+# Dalla directory backend:  python -m pytest
+BACKENDS = ["sqlite", "postgresql"]
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Istruzioni eseguite dall'applicazione per gestire la transazione, escluse dal conteggio delle query:
+# BEGIN esplicito di SQLite e tag della richiesta in application_name su PostgreSQL
+BOOKKEEPING_PREFIXES = ("BEGIN", "SELECT set_config('application_name'")
+
+
+class Zoolab:
+    """
+    Applicazione importata per un database di test, con il client HTTP e i moduli usati dai test.
+
+    Attributes:
+        backend (str): Database in uso (`sqlite` o `postgresql`).
+        client: TestClient dell'applicazione, con gli eventi di avvio già eseguiti.
+    """
+
+    def __init__(self, backend: str, client, modules: dict[str, ModuleType]):
+        self.backend = backend
+        self.client = client
+        self._modules = modules
+
+    def __getattr__(self, name: str) -> ModuleType:
+        # Moduli dell'applicazione per nome, per esempio `zoolab.models` o `zoolab.progress`
+        try:
+            return self._modules[name]
+        except KeyError:
+            module = importlib.import_module(f"app.{name}")
+            self._modules[name] = module
+            return module
+
+    def run(self, function, *args):
+        """Esegue una coroutine dell'applicazione nel ciclo di eventi del client, quello a cui sono legati gli engine."""
+        return self.client.portal.call(function, *args)
+
+    def session(self):
+        """Restituisce una nuova sessione sincrona sul database di test."""
+        return self.database.SessionLocal()
+
+    @contextmanager
+    def statements(self) -> Iterator[list[str]]:
+        """
+        Registra le istruzioni SQL eseguite da entrambi gli engine nel blocco, escluse quelle di gestione
+        della transazione (`BOOKKEEPING_PREFIXES`).
+        """
+        executed = []
+
+        def record(connection, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().startswith(BOOKKEEPING_PREFIXES):
+                executed.append(statement)
+
+        engines = [self.database.engine, self.database.async_engine.sync_engine]
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield executed
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", record)
+
+
+def run_module(module: str, environment: dict[str, str], *arguments: str) -> subprocess.CompletedProcess:
+    """Esegue un modulo dell'applicazione in un processo separato, dalla directory backend."""
+    return subprocess.run(
+        [sys.executable, "-m", module, *arguments], cwd=BACKEND_DIR, env={**os.environ, **environment},
+        check=True, capture_output=True, text=True
+    )
+
+
+def import_app() -> ModuleType:
+    """Reimporta da zero il pacchetto `app`, che legge la configurazione dalle variabili d'ambiente attuali."""
+    for name in [name for name in sys.modules if name == "app" or name.startswith("app.")]:
+        del sys.modules[name]
+    return importlib.import_module("app.main")
+
+
+def postgres_admin_connection():
+    """Apre una connessione (autocommit) al database di manutenzione del server PostgreSQL di test, se raggiungibile."""
+    import psycopg2
+
+    connection = psycopg2.connect(
+        dbname="postgres",
+        user=os.getenv("DATABASE_USER", "mr.anderson2159"),
+        host=os.getenv("DATABASE_HOST", "localhost"),
+        connect_timeout=3
+    )
+    connection.autocommit = True
+    return connection
+
+
+def create_postgres_database() -> str:
+    """Crea un database vuoto con un nome casuale sul server PostgreSQL di test e ne restituisce il nome."""
+    name = f"zoolab_test_{uuid.uuid4().hex[:8]}"
+    admin = postgres_admin_connection()
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE DATABASE {name}")
+    admin.close()
+    return name
+
+
+def drop_postgres_database(name: str) -> None:
+    """Elimina un database di test, chiudendo le connessioni ancora aperte."""
+    admin = postgres_admin_connection()
+    with admin.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+    admin.close()
+
+
+@pytest.fixture(scope="session")
+def sqlite_catalogue(tmp_path_factory) -> str:
+    """Catalogo precompilato SQLite costruito dai file del catalogo per la sessione di test."""
+    path = str(tmp_path_factory.mktemp("catalogue") / "catalogue.sqlite")
+    run_module("app.sqlite_catalogue", {"DB_BACKEND": "sqlite", "SQLITE_PATH": ":memory:", "SQLITE_CATALOGUE": path})
+    return path
+
+
+@pytest.fixture(scope="session", params=BACKENDS)
+def zoolab(request, sqlite_catalogue) -> Iterator[Zoolab]:
+    """Applicazione avviata su un database di test con il catalogo completo e la partita predefinita."""
+    backend = request.param
+    database_name: Optional[str] = None
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("DB_BACKEND", backend)
+        monkeypatch.setenv("ZOO_MODE", "local")
+
+        if backend == "sqlite":
+            monkeypatch.setenv("SQLITE_PATH", ":memory:")
+            monkeypatch.setenv("SQLITE_CATALOGUE", sqlite_catalogue)
+        else:
+            try:
+                database_name = create_postgres_database()
+            except Exception as e:
+                pytest.skip(f"PostgreSQL non disponibile: {e}")
+            monkeypatch.setenv("DATABASE", database_name)
+
+        try:
+            main = import_app()
+            modules = {"main": main}
+            if backend == "postgresql":
+                from app import database, models, population_data
+
+                models.Base.metadata.create_all(database.engine)
+                population_data.db = database.SessionLocal()
+                population_data.reseed_data()
+
+            from fastapi.testclient import TestClient
+
+            with TestClient(main.app) as client:
+                yield Zoolab(backend, client, modules)
+        finally:
+            if database_name:
+                sys.modules["app.database"].engine.dispose()
+                drop_postgres_database(database_name)
+
+
+@pytest.fixture
+def empty_postgres_database(zoolab) -> Iterator[str]:
+    """Database PostgreSQL vuoto sullo stesso server dell'applicazione, eliminato al termine del test."""
+    if zoolab.backend != "postgresql":
+        pytest.skip("Richiede PostgreSQL")
+    name = create_postgres_database()
+    yield name
+    drop_postgres_database(name)
+
+
+@pytest.fixture
+def save(zoolab) -> Iterator[dict[str, str]]:
+    """Partita nuova, con tutti i progressi a zero, eliminata al termine del test. Restituisce gli header da inviare."""
+    response = zoolab.client.post("/saves/", json={"name": f"test {uuid.uuid4().hex[:8]}"})
+    assert response.status_code == 201, response.text
+    save_id = response.json()["id"]
+    yield {"X-Save-Id": str(save_id)}
+    zoolab.client.delete(f"/saves/{save_id}")
+
+
+@pytest.fixture
+def capture(zoolab):
+    """Funzione che invia una variazione delle catture con le coppie (ID del mostro, variazione) indicate."""
+    def post(headers: dict[str, str], *updates: tuple[int, int]):
+        return zoolab.client.post(
+            "/fiends/update_captures",
+            json={"updates": [{"fiend_id": fiend_id, "delta": delta} for fiend_id, delta in updates]},
+            headers=headers
+        )
+    return post
@@ -0,0 +1,72 @@
+# backend/tests/test_captures.py
+import pytest
+
+
+def captures_of(zoolab, headers: dict[str, str], fiend_id: int) -> int:
+    response = zoolab.client.get(f"/fiends/{fiend_id}", headers=headers)
+    assert response.status_code == 200
+    return response.json()["was_captured"]
+
+
+@pytest.mark.parametrize("start, updates, detail", [
+    # Le variazioni vengono verificate una alla volta nell'ordine della richiesta, non sommate
+    (10, [(1, 1), (1, -1)], "non può essere catturato più di 10 volte (11)"),
+    (0, [(1, -1), (1, 1)], "non può avere un numero di catture minore di 0 (-1)"),
+    (0, [(1, 10), (1, 1)], "non può essere catturato più di 10 volte (11)"),
+])
+def test_capture_updates_are_checked_in_request_order(zoolab, save, capture, start, updates, detail):
+    if start:
+        assert capture(save, (1, start)).status_code == 200
+
+    response = capture(save, *updates)
+    assert response.status_code == 403
+    assert response.json()["detail"].endswith(detail)
+    assert captures_of(zoolab, save, 1) == start
+
+
+def test_missing_fiend_is_reported_before_the_limits(zoolab, save, capture):
+    response = capture(save, (1, -1), (100000, 1))
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Mostro con ID 100000 non trovato."
+
+
+def test_coalesced_requests_are_checked_against_the_running_state(zoolab, save):
+    save_id = int(save["X-Save-Id"])
+    fiends = zoolab.routers.fiends
+
+    # A scende sotto zero ed è scartata da sola; B è valida e viene applicata
+    a, b, c = zoolab.run(fiends.apply_coalesced_captures, save_id, [[(1, -1)], [(1, 1)], [(1, 8), (1, 1)]])
+    assert a.status_code == 403 and a.detail.endswith("(-1)")
+    assert b["captures"][0][1] == 1
+    assert [delta for _, delta in c["captures"]] == [8, 1]
+    assert captures_of(zoolab, save, 1) == 10
+
+    # Una richiesta valida solo dopo quelle che la precedono nel gruppo viene accettata
+    d, e = zoolab.run(fiends.apply_coalesced_captures, save_id, [[(1, -10)], [(1, -1)]])
+    assert d["captures"][0][1] == -10
+    assert e.status_code == 403 and e.detail.endswith("(-1)")
+    assert captures_of(zoolab, save, 1) == 0
+
+
+def test_capture_constraint_violation_is_rejected_like_the_checks(zoolab, save, capture, monkeypatch):
+    assert capture(save, (1, 10)).status_code == 200
+
+    # La verifica sotto blocco vede catture non aggiornate: solo il vincolo del database rifiuta la UPDATE
+    fiends = zoolab.routers.fiends
+    lock_for_captures = fiends.lock_for_captures
+    calls = []
+
+    def stale_lock_for_captures(db, save_id, fiend_ids):
+        locked = lock_for_captures(db, save_id, fiend_ids)
+        calls.append(fiend_ids)
+        return {fiend_id: (fiend, 0) for fiend_id, (fiend, _) in locked.items()} if len(calls) == 1 else locked
+
+    monkeypatch.setattr(fiends, "lock_for_captures", stale_lock_for_captures)
+    response = capture(save, (1, 1))
+    assert response.status_code == 403
+    assert response.json()["detail"].endswith("non può essere catturato più di 10 volte (11)")
+    assert len(calls) == 2
+
+    monkeypatch.undo()
+    assert captures_of(zoolab, save, 1) == 10
+    assert capture(save, (1, -1)).status_code == 200
@@ -0,0 +1,25 @@
+# backend/tests/test_catalogue.py
+import os
+import pytest
+from sqlalchemy import select
+from conftest import BACKEND_DIR
+
+# Modelli del catalogo con un'immagine, servita dalla directory backend/images
+IMAGE_MODELS = ["Zone", "Fiend", "AreaConquest", "SpeciesConquest", "OriginalCreation"]
+
+
+@pytest.mark.parametrize("model_name", IMAGE_MODELS)
+def test_catalogue_images_exist(zoolab, model_name):
+    model = getattr(zoolab.models, model_name)
+    db = zoolab.session()
+    try:
+        image_urls = db.scalars(select(model.image_url).where(model.image_url.is_not(None))).all()
+    finally:
+        db.close()
+
+    assert image_urls
+    missing = [
+        url for url in image_urls
+        if not os.path.isfile(os.path.join(BACKEND_DIR, "images", url.removeprefix("../images/")))
+    ]
+    assert missing == []
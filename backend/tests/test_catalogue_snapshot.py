@@ -0,0 +1,43 @@
+# backend/tests/test_catalogue_snapshot.py
+import zipfile
+import psycopg2
+from conftest import run_module
+
+
+def test_snapshot_round_trip_into_an_empty_database(zoolab, empty_postgres_database, tmp_path):
+    snapshot = zoolab.catalogue_snapshot
+    exported = str(tmp_path / "exported.zip")
+    manifest = snapshot.build_snapshot(exported)
+    assert {entry["name"] for entry in manifest["tables"]} == {table.name for table in snapshot.catalogue_tables()}
+    assert all(entry["rows"] > 0 for entry in manifest["tables"] if entry["name"] in ("zones", "fiends"))
+
+    # Ripristino ed esportazione dal database vuoto, con i comandi usati da setup.sh
+    restored = str(tmp_path / "restored.zip")
+    environment = {"DB_BACKEND": "postgresql", "DATABASE": empty_postgres_database}
+    run_module("app.catalogue_snapshot", environment, "--restore", exported)
+    run_module("app.catalogue_snapshot", environment, restored)
+
+    # Stesse righe in ogni tabella del catalogo: i file COPY, ordinati per chiave primaria, sono identici
+    with zipfile.ZipFile(exported) as first, zipfile.ZipFile(restored) as second:
+        assert first.read(snapshot.SNAPSHOT_MANIFEST) == second.read(snapshot.SNAPSHOT_MANIFEST)
+        for entry in manifest["tables"]:
+            assert first.read(entry["file"]) == second.read(entry["file"]), entry["name"]
+
+    # Il database ripristinato ha la partita predefinita e le sequenze degli ID riallineate
+    connection = psycopg2.connect(
+        dbname=empty_postgres_database, user=zoolab.config.DATABASE_USER, host=zoolab.config.DATABASE_HOST
+    )
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM saves")
+            assert cursor.fetchall() == [(zoolab.saves.DEFAULT_SAVE_NAME,)]
+            cursor.execute("SELECT version FROM catalogue_version")
+            assert cursor.fetchall() == [(1,)]
+            for table in snapshot.catalogue_tables():
+                if "id" in table.columns:
+                    cursor.execute(
+                        f"SELECT nextval(pg_get_serial_sequence('{table.name}', 'id')) > MAX(id) FROM {table.name}"
+                    )
+                    assert cursor.fetchone()[0] is not False, table.name
+    finally:
+        connection.close()
@@ -0,0 +1,72 @@
+# backend/tests/test_concurrency.py
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select
+
+# Scrittori concorrenti che inviano variazioni delle catture sugli stessi mostri. Ogni scrittore esegue coppie
+# di richieste +1/-1 e infine un +1, quindi al termine ogni mostro ha tante catture quanti sono gli scrittori
+# che lo aggiornano; nel frattempo le catture creano e annullano le conquiste della zona e delle specie.
+WRITERS = 4
+ROUNDS = 10
+FIEND_IDS = [1, 2, 3, 4]
+FIENDS_PER_REQUEST = 3
+
+
+def writer_fiends(writer: int) -> list[int]:
+    """
+    Mostri aggiornati da uno scrittore: gli scrittori condividono parte dei mostri, così le richieste si contendono
+    le stesse righe, e quelli dispari li elencano in ordine inverso, per verificare l'ordine dei blocchi.
+    """
+    if writer % 2:
+        return list(reversed(FIEND_IDS[1:1 + FIENDS_PER_REQUEST]))
+    return FIEND_IDS[:FIENDS_PER_REQUEST]
+
+
+def summaries(zoolab, db, save_id: int) -> dict[str, list[tuple]]:
+    """Righe di riepilogo e contatori globali di una partita, esclusa la versione dei progressi."""
+    models = zoolab.models
+    state = {}
+    for model in (models.ZoneProgress, models.SpeciesConquestProgress, models.ProgressCounters):
+        table = model.__table__
+        columns = [column for column in table.columns if column.name != "version"]
+        state[table.name] = sorted(tuple(row) for row in db.execute(select(*columns).where(table.c.save_id == save_id)))
+    return state
+
+
+def test_concurrent_captures_keep_the_counters_consistent(zoolab, save, capture):
+    def write(writer: int) -> list[int]:
+        fiend_ids = writer_fiends(writer)
+        statuses = []
+        for _ in range(ROUNDS):
+            for delta in (1, -1):
+                statuses.append(capture(save, *[(fiend_id, delta) for fiend_id in fiend_ids]).status_code)
+        statuses.append(capture(save, *[(fiend_id, 1) for fiend_id in fiend_ids]).status_code)
+        return statuses
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as executor:
+        statuses = [status for result in executor.map(write, range(WRITERS)) for status in result]
+    assert statuses == [200] * WRITERS * (2 * ROUNDS + 1)
+
+    # Catture finali
+    fiends = {fiend["id"]: fiend["was_captured"] for fiend in zoolab.client.get("/fiends/", headers=save).json()}
+    for fiend_id in FIEND_IDS:
+        writers = sum(fiend_id in writer_fiends(writer) for writer in range(WRITERS))
+        assert fiends[fiend_id] == writers, fiend_id
+    assert sum(fiends.values()) == WRITERS * FIENDS_PER_REQUEST
+
+    # Riepiloghi e contatori aggiornati in modo incrementale identici a quelli ricalcolati da zero
+    save_id = int(save["X-Save-Id"])
+    db = zoolab.session()
+    try:
+        incremental = summaries(zoolab, db, save_id)
+        zoolab.progress.rebuild_progress(db, save_id)
+        zoolab.progress.rebuild_counters(db, save_id)
+        db.flush()
+        assert summaries(zoolab, db, save_id) == incremental
+    finally:
+        db.rollback()
+        db.close()
+
+    # Il registro degli eventi riproduce lo stesso stato
+    rebuild = zoolab.client.post("/events/rebuild?dry_run=true", headers=save)
+    assert rebuild.status_code == 200
+    assert rebuild.json()["differences"] == {}
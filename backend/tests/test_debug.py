@@ -0,0 +1,7 @@
+# backend/tests/test_debug.py
+
+
+def test_debug_routes_are_not_mounted_outside_debug_mode(zoolab):
+    assert not zoolab.config.DEBUG_MODE
+    assert zoolab.client.get("/debug/pool").status_code == 404
+    assert zoolab.client.get("/debug/coalescer").status_code == 404
@@ -0,0 +1,35 @@
+# backend/tests/test_events.py
+
+
+def area_conquest(zoolab, headers: dict[str, str], conquest_id: int) -> dict:
+    response = zoolab.client.get(f"/area_conquests/{conquest_id}", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_undo_restores_the_flags_changed_by_a_capture(zoolab, save, capture):
+    # Le catture dei mostri 1, 2 e 3 creano il campione di zona 1, che viene poi sconfitto
+    assert capture(save, (1, 1), (2, 1), (3, 1)).json()["area_conquests"]
+    assert zoolab.client.post("/area_conquests/1/defeated", headers=save).status_code == 200
+    assert area_conquest(zoolab, save, 1)["defeated"] is True
+
+    # La cattura annullata annulla il campione, e con esso il flag `defeated`
+    assert capture(save, (1, -1)).status_code == 200
+    assert area_conquest(zoolab, save, 1)["created"] is False
+
+    # L'annullamento della cattura riporta il campione com'era, sconfitto compreso
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 200
+    conquest = area_conquest(zoolab, save, 1)
+    assert conquest["created"] is True
+    assert conquest["defeated"] is True
+
+    # Il ripristino lo annulla di nuovo, e un nuovo annullamento lo riporta sconfitto
+    assert zoolab.client.post("/events/redo", headers=save).status_code == 200
+    assert area_conquest(zoolab, save, 1)["created"] is False
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 200
+    assert area_conquest(zoolab, save, 1)["defeated"] is True
+
+    # La ricostruzione dal registro degli eventi arriva allo stesso stato
+    rebuild = zoolab.client.post("/events/rebuild?dry_run=true", headers=save)
+    assert rebuild.status_code == 200
+    assert rebuild.json()["differences"] == {}
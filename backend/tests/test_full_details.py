@@ -0,0 +1,44 @@
+# backend/tests/test_full_details.py
+from sqlalchemy import update
+
+
+def rename_area_conquest(zoolab, area_conquest_id: int, name: str) -> None:
+    """Rinomina un campione di zona come farebbe un reseed eseguito da un altro processo, senza invalidare la cache."""
+    db = zoolab.session()
+    try:
+        model = zoolab.models.AreaConquest
+        db.execute(update(model).where(model.id == area_conquest_id).values(name=name))
+        zoolab.reference_data.reference_data.bump_catalogue_version(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_full_details_follow_catalogue_changes_of_other_processes(zoolab, save):
+    path = "/area_conquests/1/full_details"
+    original = zoolab.client.get(path, headers=save).json()["name"]
+
+    rename_area_conquest(zoolab, 1, "Campione rinominato")
+    try:
+        assert zoolab.client.get(path, headers=save).json()["name"] == "Campione rinominato"
+    finally:
+        rename_area_conquest(zoolab, 1, original)
+    assert zoolab.client.get(path, headers=save).json()["name"] == original
+
+
+def test_full_details_rebuild_a_missing_document(zoolab, save):
+    path = "/species_conquests/1/full_details"
+    expected = zoolab.client.get(path, headers=save).json()
+
+    reference = zoolab.reference_data.reference_data
+    del reference.details[("species_conquests", 1)]
+    assert reference.details_ready()
+
+    response = zoolab.client.get(path, headers=save)
+    assert response.status_code == 200
+    assert response.json() == expected
+
+
+def test_full_details_of_an_unknown_element_is_not_found(zoolab, save):
+    response = zoolab.client.get("/original_creations/100000/full_details", headers=save)
+    assert response.status_code == 404
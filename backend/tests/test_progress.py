@@ -0,0 +1,245 @@
+# backend/tests/test_progress.py
+import pytest
+from sqlalchemy import select
+
+
+def zone_fiends(zoolab, zone_id: int) -> list[int]:
+    """ID dei mostri di una zona."""
+    fiend = zoolab.models.Fiend
+    db = zoolab.session()
+    try:
+        return list(db.scalars(select(fiend.id).where(fiend.zone_id == zone_id).order_by(fiend.id)))
+    finally:
+        db.close()
+
+
+def area_conquest_of(zoolab, zone_id: int) -> int:
+    """ID del campione della zona."""
+    area_conquest = zoolab.models.AreaConquest
+    db = zoolab.session()
+    try:
+        return db.scalar(select(area_conquest.id).where(area_conquest.zone_id == zone_id))
+    finally:
+        db.close()
+
+
+def smallest_species_conquest(zoolab) -> tuple[int, list[int], int]:
+    """Campione di specie che richiede meno catture: ID, ID dei suoi mostri e catture richieste per ciascuno."""
+    models = zoolab.models
+    db = zoolab.session()
+    try:
+        species = {}
+        for species_id, required, fiend_id in db.execute(
+            select(models.SpeciesConquest.id, models.SpeciesConquest.required_fiends, models.Fiend.id)
+            .join(models.Fiend, models.Fiend.species_conquest_id == models.SpeciesConquest.id)
+            .order_by(models.Fiend.id)
+        ):
+            species.setdefault((species_id, required), []).append(fiend_id)
+    finally:
+        db.close()
+    (species_id, required), fiend_ids = min(species.items(), key=lambda item: item[0][1] * len(item[1]))
+    return species_id, fiend_ids, required
+
+
+def get(zoolab, headers: dict[str, str], path: str):
+    response = zoolab.client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def zone_status(zoolab, headers: dict[str, str], zone_id: int) -> str:
+    return next(zone["status"] for zone in get(zoolab, headers, "/zones/") if zone["id"] == zone_id)
+
+
+def created(zoolab, headers: dict[str, str], path: str) -> bool:
+    return get(zoolab, headers, path)["created"]
+
+
+def destinations(response) -> dict[str, list[int]]:
+    """Conquiste create o annullate da una risposta, indicizzate per tipo."""
+    return {
+        key: sorted(conquest["id"] for conquest in response.json()[key] or [])
+        for key in ("area_conquests", "species_conquests", "original_creations")
+    }
+
+
+def consistent(zoolab, headers: dict[str, str]) -> None:
+    """Verifica che la ricostruzione dal registro degli eventi arrivi allo stato attuale della partita."""
+    rebuild = zoolab.client.post("/events/rebuild?dry_run=true", headers=headers)
+    assert rebuild.status_code == 200
+    assert rebuild.json()["differences"] == {}
+
+
+# Catture
+
+def test_captures_update_fiends_and_zone_status(zoolab, save, capture):
+    fiend_ids = zone_fiends(zoolab, 1)
+    response = capture(save, (fiend_ids[0], 2))
+    assert response.status_code == 200
+    assert get(zoolab, save, f"/fiends/{fiend_ids[0]}")["was_captured"] == 2
+
+    status = zone_status(zoolab, save, 1)
+    assert capture(save, *[(fiend_id, 1) for fiend_id in fiend_ids[1:]]).status_code == 200
+    assert zone_status(zoolab, save, 1) != status
+
+    assert capture(save, (fiend_ids[0], -3)).status_code == 403
+    assert get(zoolab, save, f"/fiends/{fiend_ids[0]}")["was_captured"] == 2
+    consistent(zoolab, save)
+
+
+def test_reset_clears_the_save(zoolab, save, capture):
+    fiend_ids = zone_fiends(zoolab, 1)
+    assert capture(save, *[(fiend_id, 3) for fiend_id in fiend_ids]).status_code == 200
+    assert zoolab.client.post("/fiends/reset", headers=save).status_code == 200
+
+    snapshot = get(zoolab, save, "/snapshot/")
+    assert all(fiend["was_captured"] == 0 for fiend in snapshot["fiends"])
+    assert not any(conquest["created"] for conquest in snapshot["area_conquests"])
+
+    # Il reset non può essere annullato
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 404
+    consistent(zoolab, save)
+
+
+# Creazione e annullamento delle conquiste
+
+def test_area_conquest_is_created_and_annulled_by_captures(zoolab, save, capture):
+    fiend_ids = zone_fiends(zoolab, 1)
+    conquest_id = area_conquest_of(zoolab, 1)
+
+    response = capture(save, *[(fiend_id, 1) for fiend_id in fiend_ids[:-1]])
+    assert destinations(response)["area_conquests"] == []
+    response = capture(save, (fiend_ids[-1], 1))
+    assert destinations(response)["area_conquests"] == [conquest_id]
+    assert created(zoolab, save, f"/area_conquests/{conquest_id}")
+
+    response = capture(save, (fiend_ids[0], -1))
+    assert destinations(response)["area_conquests"] == [conquest_id]
+    assert not created(zoolab, save, f"/area_conquests/{conquest_id}")
+    consistent(zoolab, save)
+
+
+def test_species_conquest_is_created_and_annulled_by_captures(zoolab, save, capture):
+    species_id, fiend_ids, required = smallest_species_conquest(zoolab)
+
+    response = capture(save, *[(fiend_id, required) for fiend_id in fiend_ids])
+    assert species_id in destinations(response)["species_conquests"]
+    assert created(zoolab, save, f"/species_conquests/{species_id}")
+
+    response = capture(save, (fiend_ids[0], -1))
+    assert species_id in destinations(response)["species_conquests"]
+    assert not created(zoolab, save, f"/species_conquests/{species_id}")
+    consistent(zoolab, save)
+
+
+def test_original_creation_follows_the_counters(zoolab, save, capture):
+    # Mangiaterra richiede 2 campioni di zona creati
+    first, second = zone_fiends(zoolab, 1), zone_fiends(zoolab, 2)
+    assert capture(save, *[(fiend_id, 1) for fiend_id in first]).status_code == 200
+    response = capture(save, *[(fiend_id, 1) for fiend_id in second])
+    (mangiaterra,) = destinations(response)["original_creations"]
+    assert get(zoolab, save, f"/original_creations/{mangiaterra}")["name"] == "mangiaterra"
+    assert created(zoolab, save, f"/original_creations/{mangiaterra}")
+
+    response = capture(save, (second[0], -1))
+    assert destinations(response)["original_creations"] == [mangiaterra]
+    assert not created(zoolab, save, f"/original_creations/{mangiaterra}")
+    consistent(zoolab, save)
+
+
+def test_defeat_toggles_the_flag(zoolab, save, capture):
+    conquest_id = area_conquest_of(zoolab, 1)
+    assert capture(save, *[(fiend_id, 1) for fiend_id in zone_fiends(zoolab, 1)]).status_code == 200
+
+    assert zoolab.client.post(f"/area_conquests/{conquest_id}/defeated", headers=save).status_code == 200
+    assert get(zoolab, save, f"/area_conquests/{conquest_id}")["defeated"] is True
+    assert zoolab.client.post(f"/area_conquests/{conquest_id}/undefeated", headers=save).status_code == 200
+    assert get(zoolab, save, f"/area_conquests/{conquest_id}")["defeated"] is False
+    consistent(zoolab, save)
+
+
+# Partite
+
+def test_saves_are_isolated(zoolab, save, capture):
+    other = zoolab.client.post("/saves/", json={"name": f"altra {save['X-Save-Id']}"})
+    assert other.status_code == 201
+    other_headers = {"X-Save-Id": str(other.json()["id"])}
+    try:
+        assert capture(save, (1, 4)).status_code == 200
+        assert get(zoolab, save, "/fiends/1")["was_captured"] == 4
+        assert get(zoolab, other_headers, "/fiends/1")["was_captured"] == 0
+        assert zoolab.client.post("/events/undo", headers=other_headers).status_code == 404
+    finally:
+        assert zoolab.client.delete(f"/saves/{other_headers['X-Save-Id']}").status_code == 200
+
+    assert zoolab.client.get("/fiends/1", headers=other_headers).status_code == 404
+    assert int(other_headers["X-Save-Id"]) not in {save["id"] for save in get(zoolab, {}, "/saves/")}
+
+
+def test_save_names_are_unique(zoolab, save):
+    name = next(item["name"] for item in get(zoolab, {}, "/saves/") if str(item["id"]) == save["X-Save-Id"])
+    assert zoolab.client.post("/saves/", json={"name": name}).status_code == 409
+
+
+def test_default_save_cannot_be_deleted(zoolab):
+    default = min(item["id"] for item in get(zoolab, {}, "/saves/"))
+    assert zoolab.client.delete(f"/saves/{default}").status_code == 403
+
+
+# Annullamento e ripristino
+
+def test_undo_and_redo_of_captures_and_defeats(zoolab, save, capture):
+    conquest_id = area_conquest_of(zoolab, 1)
+    fiend_ids = zone_fiends(zoolab, 1)
+    assert capture(save, *[(fiend_id, 1) for fiend_id in fiend_ids]).status_code == 200
+    assert capture(save, (fiend_ids[0], 2)).status_code == 200
+    assert zoolab.client.post(f"/area_conquests/{conquest_id}/defeated", headers=save).status_code == 200
+
+    # Gli annullamenti procedono dall'azione più recente
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 200
+    assert get(zoolab, save, f"/area_conquests/{conquest_id}")["defeated"] is False
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 200
+    assert get(zoolab, save, f"/fiends/{fiend_ids[0]}")["was_captured"] == 1
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 200
+    assert get(zoolab, save, f"/fiends/{fiend_ids[0]}")["was_captured"] == 0
+    assert not created(zoolab, save, f"/area_conquests/{conquest_id}")
+    assert zoolab.client.post("/events/undo", headers=save).status_code == 404
+
+    # Il ripristino riapplica le azioni annullate in ordine
+    assert zoolab.client.post("/events/redo", headers=save).status_code == 200
+    assert created(zoolab, save, f"/area_conquests/{conquest_id}")
+    assert zoolab.client.post("/events/redo", headers=save).status_code == 200
+    assert get(zoolab, save, f"/fiends/{fiend_ids[0]}")["was_captured"] == 3
+    consistent(zoolab, save)
+
+    # Una nuova azione rende impossibile ripristinare quelle annullate
+    assert capture(save, (fiend_ids[1], 1)).status_code == 200
+    assert zoolab.client.post("/events/redo", headers=save).status_code == 404
+    consistent(zoolab, save)
+
+
+# Istantanea dei progressi
+
+@pytest.mark.parametrize("key, path", [
+    ("fiends", "/fiends/"),
+    ("zones", "/zones/"),
+    ("area_conquests", "/area_conquests/"),
+    ("species_conquests", "/species_conquests/"),
+    ("original_creations", "/original_creations/"),
+])
+def test_snapshot_matches_the_list_routes(zoolab, save, capture, key, path):
+    assert capture(save, *[(fiend_id, 1) for fiend_id in zone_fiends(zoolab, 1)]).status_code == 200
+    snapshot = get(zoolab, save, "/snapshot/")
+    assert sorted(snapshot[key], key=lambda element: element["id"]) == \
+        sorted(get(zoolab, save, path), key=lambda element: element["id"])
+
+
+def test_snapshot_is_revalidated_with_the_etag(zoolab, save, capture):
+    response = zoolab.client.get("/snapshot/", headers=save)
+    etag = response.headers["ETag"]
+    assert zoolab.client.get("/snapshot/", headers={**save, "If-None-Match": etag}).status_code == 304
+
+    assert capture(save, (1, 1)).status_code == 200
+    response = zoolab.client.get("/snapshot/", headers={**save, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert next(fiend for fiend in response.json()["fiends"] if fiend["id"] == 1)["was_captured"] == 1
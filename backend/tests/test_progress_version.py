@@ -0,0 +1,38 @@
+# backend/tests/test_progress_version.py
+
+
+def test_etag_follows_the_version_stored_in_the_database(zoolab, save, capture):
+    first = zoolab.client.get("/zones/", headers=save)
+    etag = first.headers["ETag"]
+    assert zoolab.client.get("/zones/", headers={**save, "If-None-Match": etag}).status_code == 304
+
+    # Una modifica confermata da un'altra sessione (un altro worker o uno strumento a riga di comando)
+    # invalida la copia del client
+    db = zoolab.session()
+    try:
+        zoolab.progress_version.progress_version.bump(db, int(save["X-Save-Id"]))
+        db.commit()
+    finally:
+        db.close()
+
+    second = zoolab.client.get("/zones/", headers={**save, "If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+
+    assert capture(save, (1, 1)).status_code == 200
+    third = zoolab.client.get("/zones/", headers={**save, "If-None-Match": second.headers["ETag"]})
+    assert third.status_code == 200
+
+
+def test_rebuilding_the_counters_keeps_the_version_increasing(zoolab, save):
+    save_id = int(save["X-Save-Id"])
+    etag = zoolab.client.get("/zones/", headers=save).headers["ETag"]
+
+    db = zoolab.session()
+    try:
+        zoolab.progress.rebuild_counters(db, save_id)
+        db.commit()
+    finally:
+        db.close()
+
+    assert zoolab.client.get("/zones/", headers={**save, "If-None-Match": etag}).status_code == 200
@@ -0,0 +1,85 @@
+# backend/tests/test_query_counts.py
+import pytest
+
+# Numero massimo di istruzioni SQL per richiesta delle rotte di elenco di zone e mostri, indipendente dal numero
+# di zone e di mostri catturati. Ogni GET legge anche la versione dei progressi della partita per l'ETag.
+LIST_ENDPOINTS = {
+    "/zones/": 2,
+    "/fiends/": 2,
+    "/zones/1/fiends": 3,
+    "/zones/1/fiends_with_found": 3,
+}
+
+
+@pytest.mark.parametrize("path, limit", LIST_ENDPOINTS.items())
+def test_list_endpoints_run_a_constant_number_of_statements(zoolab, save, capture, path, limit):
+    with zoolab.statements() as fresh:
+        assert zoolab.client.get(path, headers=save).status_code == 200
+    assert len(fresh) <= limit, fresh
+
+    # Con una parte dei mostri catturati il numero di query non cambia
+    assert capture(save, *[(fiend_id, 1) for fiend_id in range(1, 30)]).status_code == 200
+    with zoolab.statements() as started:
+        assert zoolab.client.get(path, headers=save).status_code == 200
+    assert len(started) == len(fresh), started
+
+
+def test_zone_status_does_not_query_each_zone(zoolab, save):
+    zones = zoolab.session()
+    try:
+        zone_count = zones.query(zoolab.models.Zone).count()
+    finally:
+        zones.close()
+
+    with zoolab.statements() as executed:
+        response = zoolab.client.get("/zones/", headers=save)
+    assert len(response.json()) == zone_count > 1
+    assert len(executed) == LIST_ENDPOINTS["/zones/"]
+
+# Istruzioni SQL di una variazione delle catture che non crea né annulla conquiste e non supera soglie dei riepiloghi:
+# verifica della partita, blocchi con le catture attuali, UPDATE delle catture, verifica delle condizioni, registro
+# degli eventi e versione dei progressi.
+# La prima cattura di un mostro aggiorna anche il riepilogo della sua zona e della sua specie.
+CAPTURE_STATEMENTS = 15
+FIRST_CAPTURE_STATEMENTS = CAPTURE_STATEMENTS + 2
+
+# Numero massimo di istruzioni SQL per i dettagli completi di una conquista, compresa la versione dei progressi
+FULL_DETAILS_STATEMENTS = 2
+
+
+def test_capture_post_runs_a_fixed_number_of_statements(zoolab, save, capture):
+    with zoolab.statements() as first:
+        assert capture(save, (1, 1)).status_code == 200
+    assert len(first) == FIRST_CAPTURE_STATEMENTS, first
+
+    # Da 5 a 8 catture il mostro non attraversa le soglie della sua specie né quelle dei contatori globali
+    assert capture(save, (1, 4)).status_code == 200
+    for _ in range(3):
+        with zoolab.statements() as executed:
+            assert capture(save, (1, 1)).status_code == 200
+        assert len(executed) == CAPTURE_STATEMENTS, executed
+
+
+def test_capture_post_statements_do_not_depend_on_the_number_of_fiends(zoolab, save, capture):
+    # Mostri della stessa zona portati a 5 catture: la variazione successiva non cambia i riepiloghi
+    fiend_ids = [1, 2, 3, 4]
+    assert capture(save, *[(fiend_id, 5) for fiend_id in fiend_ids]).status_code == 200
+
+    with zoolab.statements() as executed:
+        response = capture(save, *[(fiend_id, 1) for fiend_id in fiend_ids])
+    assert response.status_code == 200
+    assert response.json()["area_conquests"] is None
+    assert len(executed) == CAPTURE_STATEMENTS, executed
+
+
+@pytest.mark.parametrize("path", [
+    "/area_conquests/1/full_details",
+    "/species_conquests/1/full_details",
+    "/original_creations/1/full_details",
+])
+def test_full_details_run_a_constant_number_of_statements(zoolab, save, path):
+    with zoolab.statements() as executed:
+        response = zoolab.client.get(path, headers=save)
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+    assert len(executed) <= FULL_DETAILS_STATEMENTS, executed
@@ -0,0 +1,75 @@
+# backend/tests/test_reseed.py
+import os
+import subprocess
+import pytest
+from sqlalchemy import select, text, update
+from conftest import BACKEND_DIR, run_module
+
+
+def reseed(zoolab) -> dict[str, dict[str, int]]:
+    """Esegue il reseed del catalogo sul database di test, con una sessione propria."""
+    zoolab.population_data.db = zoolab.session()
+    return zoolab.population_data.reseed_data()
+
+
+def test_reseed_without_changes_is_a_no_op(zoolab):
+    assert reseed(zoolab) == {}
+
+
+def test_reseed_renames_an_element_that_keeps_its_unique_values(zoolab):
+    # Nel database il mostro ha un altro nome ma la stessa immagine: per il reseed è stato rinominato, quindi
+    # il mostro dei file viene inserito con l'immagine ancora assegnata alla riga da eliminare
+    fiend = zoolab.models.Fiend
+    db = zoolab.session()
+    try:
+        old_id = db.scalar(select(fiend.id).where(fiend.name == "varna"))
+        db.execute(update(fiend).where(fiend.id == old_id).values(name="varna rinominato"))
+        db.commit()
+    finally:
+        db.close()
+
+    changes = reseed(zoolab)
+    assert changes["fiends"] == {"inserted": 1, "updated": 0, "deleted": 1}
+
+    db = zoolab.session()
+    try:
+        rows = db.execute(select(fiend.id, fiend.image_url).where(fiend.name.like("varna%"))).all()
+    finally:
+        db.close()
+    assert len(rows) == 1
+    assert rows[0].id != old_id
+    assert rows[0].image_url == "../images/fiends/varna.webp"
+    assert reseed(zoolab) == {}
+
+
+def test_reseed_of_a_database_with_the_fixup_scripts_applied_is_a_no_op(zoolab):
+    # Le correzioni degli script storici sono incluse nei file del catalogo: su un database già corretto
+    # il reseed non modifica nulla
+    with open(os.path.join(BACKEND_DIR, "sql_scripts", "correzione_ordinamento_zone.sql"), encoding="utf-8") as file:
+        image_fixups = [line for line in file if line.startswith("UPDATE fiends SET image_url")]
+    assert image_fixups
+
+    db = zoolab.session()
+    try:
+        for statement in image_fixups:
+            db.execute(text(statement))
+        db.commit()
+    finally:
+        db.close()
+    assert reseed(zoolab) == {}
+
+
+def test_reseed_creates_the_schema_of_a_new_database(zoolab, empty_postgres_database):
+    environment = {"DB_BACKEND": "postgresql", "DATABASE": empty_postgres_database}
+    run_module("app.population_data", environment, "--reseed")
+
+    dry_run = run_module("app.population_data", environment, "--reseed", "--dry-run")
+    assert "Modifiche (simulazione): nessuna" in dry_run.stdout
+
+
+def test_failed_reseed_exits_with_an_error(zoolab):
+    if zoolab.backend != "postgresql":
+        pytest.skip("Richiede PostgreSQL")
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        run_module("app.population_data", {"DB_BACKEND": "postgresql", "DATABASE": "zoolab_inesistente"}, "--reseed")
+    assert "nessuna modifica salvata" in error.value.stdout
@@ -0,0 +1,36 @@
+# backend/tests/test_saves.py
+import pytest
+
+
+@pytest.fixture
+def deleted_elsewhere(zoolab, save):
+    """Partita eliminata da un'altra sessione (per esempio un altro worker), ancora presente nella cache del processo."""
+    save_id = int(save["X-Save-Id"])
+    assert zoolab.client.get("/zones/", headers=save).status_code == 200
+    assert save_id in zoolab.saves.save_registry
+
+    db = zoolab.session()
+    try:
+        db.query(zoolab.models.Save).filter(zoolab.models.Save.id == save_id).delete()
+        db.commit()
+    finally:
+        db.close()
+    return save
+
+
+def test_read_of_a_save_deleted_by_another_process_is_not_found(zoolab, deleted_elsewhere):
+    response = zoolab.client.get("/zones/", headers=deleted_elsewhere)
+    assert response.status_code == 404
+    assert int(deleted_elsewhere["X-Save-Id"]) not in zoolab.saves.save_registry
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("post", "/fiends/update_captures", {"updates": [{"fiend_id": 1, "delta": 1}]}),
+    ("post", "/fiends/reset", None),
+    ("post", "/area_conquests/1/defeated", None),
+    ("post", "/events/undo", None),
+])
+def test_write_to_a_save_deleted_by_another_process_is_not_found(zoolab, deleted_elsewhere, method, path, body):
+    response = getattr(zoolab.client, method)(path, headers=deleted_elsewhere, **({"json": body} if body else {}))
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Partita con ID {deleted_elsewhere['X-Save-Id']} non trovata"
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config import DATABASE_NAME, DB_BACKEND  # noqa: E402
+from app.main import app  # noqa: E402
+
+# Benchmark delle variazioni di cattura concorrenti: misura il throughput (richieste al secondo) di
+# /fiends/update_captures al crescere del numero di scrittori che aggiornano gli stessi mostri della stessa
+# partita, e quindi si contendono i blocchi sulle stesse righe dei progressi. Le richieste attraversano
+# l'applicazione completa (rotte, accorpamento se attivo, transazioni e blocchi) senza il server HTTP.
+# Va eseguito dalla radice del progetto su un database popolato (DATABASE=<nome> per sceglierlo):
+#
+#   python scripts/benchmark_captures.py [scrittori...]
+#
+# Ogni scrittore esegue coppie di richieste +1/-1, quindi al termine di ogni misura le catture tornano a zero.
+# Il benchmark usa una partita temporanea, eliminata al termine: le altre partite non vengono modificate.
+# La correttezza dello stato finale con scrittori concorrenti è verificata da backend/tests/test_concurrency.py.
+
+WRITERS = [1, 2, 4, 8]
+ROUNDS = 25
+FIEND_IDS = [1, 2, 3, 4]
+FIENDS_PER_REQUEST = 3
+
+
+def writer_fiends(writer):
+    # Gli scrittori condividono parte dei mostri e quelli dispari li elencano in ordine inverso
+    if writer % 2:
+        return list(reversed(FIEND_IDS[1:1 + FIENDS_PER_REQUEST]))
+    return FIEND_IDS[:FIENDS_PER_REQUEST]
+
+
+def write(client, headers, writer):
+    fiend_ids = writer_fiends(writer)
+    errors = 0
+    for _ in range(ROUNDS):
+        for delta in (1, -1):
+            response = client.post(
+                "/fiends/update_captures",
+                json={"updates": [{"fiend_id": fiend_id, "delta": delta} for fiend_id in fiend_ids]},
+                headers=headers
+            )
+            if response.status_code != 200:
+                print(f"Errore {response.status_code}: {response.text}")
+                errors += 1
+    return errors
+
+
+def measure(client, headers, writers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as executor:
+        errors = sum(executor.map(lambda writer: write(client, headers, writer), range(writers)))
+    elapsed = time.perf_counter() - start
+
+    captures = {
+        fiend["id"]: fiend["was_captured"] for fiend in client.get("/fiends/", headers=headers).json()
+        if fiend["id"] in FIEND_IDS
+    }
+    return writers * ROUNDS * 2 / elapsed, errors, all(value == 0 for value in captures.values())
+
+
+if __name__ == '__main__':
+    writers_list = [int(argument) for argument in sys.argv[1:]] or WRITERS
+
+    with TestClient(app) as client:
+        save = client.post("/saves/", json={"name": f"benchmark {uuid.uuid4().hex[:8]}"}).json()
+        headers = {"X-Save-Id": str(save["id"])}
+        print(f"Database: {DB_BACKEND} ({DATABASE_NAME if DB_BACKEND == 'postgresql' else 'SQLite'}), "
+              f"partita temporanea {save['id']}, {ROUNDS * 2} richieste per scrittore")
+        try:
+            baseline = None
+            for writers in writers_list:
+                throughput, errors, consistent = measure(client, headers, writers)
+                baseline = baseline or throughput
+                print(f"{writers:>3} scrittori: {throughput:8.1f} req/s ({throughput / baseline:4.2f}x), "
+                      f"errori: {errors}, stato finale {'coerente' if consistent else 'NON COERENTE'}")
+        finally:
+            client.delete(f"/saves/{save['id']}")
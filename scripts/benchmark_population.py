@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import models, population_data  # noqa: E402
+from app.config import DATABASE_NAME  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+
+# Benchmark del popolamento del catalogo: confronta il caricamento riga per riga (get_or_create con SELECT,
+# INSERT, flush e refresh per ogni elemento) con il caricamento in blocco (mappe nome → ID in memoria e
+# un'unica INSERT multi-riga per tabella). Entrambi i tempi includono la creazione della partita predefinita.
+#
+# ATTENZIONE: ad ogni ripetizione tutte le tabelle vengono eliminate e ricreate, quindi va eseguito
+# dalla radice del progetto su un database di prova, indicato esplicitamente:
+#
+#   DATABASE=zoolab_benchmark python scripts/benchmark_population.py [ripetizioni]
+
+REPETITIONS = 5
+
+
+def measure(bulk, repetitions):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    timings = []
+    for _ in range(repetitions):
+        models.Base.metadata.drop_all(engine)
+        models.Base.metadata.create_all(engine)
+        population_data.db = SessionLocal()
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                population_data.populate_data(bulk=bulk)
+            timings.append(time.perf_counter() - start)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+    return sorted(timings)[len(timings) // 2], len(statements)
+
+
+if __name__ == '__main__':
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else REPETITIONS
+
+    if not os.getenv("DATABASE") or DATABASE_NAME == "zoolab":
+        sys.exit("Indicare un database di prova con DATABASE=<nome>: le tabelle vengono eliminate e ricreate.")
+
+    for name, bulk in [("riga per riga", False), ("in blocco", True)]:
+        median, statements = measure(bulk, repetitions)
+        print(f"{name:<14} mediana {median * 1000:8.2f} ms, {statements} query")
+
+    db = SessionLocal()
+    print(f"Catalogo: {db.query(models.Fiend).count()} mostri, {db.query(models.Item).count()} item, "
+          f"{db.query(models.Stats).count()} statistiche")
+    db.close()
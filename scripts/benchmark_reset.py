@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app import models  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.progress import CONQUEST_STATES, lock_all, reset_game, reset_progress  # noqa: E402
+from app.saves import DEFAULT_SAVE_NAME  # noqa: E402
+
+# Benchmark del reset dei progressi: confronta l'implementazione precedente (caricamento di tutti i mostri
+# e di tutte le conquiste nella sessione, modificati uno alla volta) con quella basata su UPDATE di massa.
+# Va eseguito dalla radice del progetto su un database popolato (DATABASE=<nome> per sceglierlo)
+# e misura il reset della partita predefinita:
+#
+#   python scripts/benchmark_reset.py [ripetizioni]
+#
+# Ogni ripetizione porta prima tutti i progressi a uno stato "completato" e poi esegue il reset, all'interno
+# di una transazione che viene sempre annullata: il database non viene modificato.
+
+REPETITIONS = 20
+
+
+def legacy_reset(db, save_id):
+    lock_all(db, save_id)
+
+    for capture in db.query(models.FiendCapture).filter(models.FiendCapture.save_id == save_id).all():
+        capture.was_captured = 0
+
+    for state_model in CONQUEST_STATES.values():
+        for state in db.query(state_model).filter(state_model.save_id == save_id).all():
+            state.created = False
+            state.defeated = False
+
+    reset_progress(db, save_id)
+
+
+def fill_progress(db, save_id):
+    # Stato di partenza con tutte le catture e tutti i flag da azzerare, così entrambe le implementazioni
+    # devono davvero modificare ogni riga
+    db.query(models.FiendCapture).filter(models.FiendCapture.save_id == save_id).update(
+        {models.FiendCapture.was_captured: 10}, synchronize_session=False
+    )
+    for state_model in CONQUEST_STATES.values():
+        db.query(state_model).filter(state_model.save_id == save_id).update(
+            {state_model.created: True, state_model.defeated: True}, synchronize_session=False
+        )
+
+
+def measure(reset, save_id, repetitions):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    timings = []
+    for _ in range(repetitions):
+        db = SessionLocal()
+        try:
+            fill_progress(db, save_id)
+            db.flush()
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", count)
+            start = time.perf_counter()
+            reset(db, save_id)
+            db.flush()
+            timings.append(time.perf_counter() - start)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+            db.rollback()
+            db.close()
+
+    return sorted(timings)[len(timings) // 2], len(statements)
+
+
+if __name__ == '__main__':
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else REPETITIONS
+
+    db = SessionLocal()
+    print(f"Catalogo: {db.query(models.Fiend).count()} mostri, "
+          f"{db.query(models.AreaConquest).count()} campioni di zona, "
+          f"{db.query(models.SpeciesConquest).count()} campioni di specie, "
+          f"{db.query(models.OriginalCreation).count()} prototipi zoolab")
+    save_id = db.query(models.Save.id).filter(models.Save.name == DEFAULT_SAVE_NAME).scalar()
+    db.close()
+
+    for name, reset in [("ORM (precedente)", legacy_reset), ("UPDATE di massa", reset_game)]:
+        median, statements = measure(reset, save_id, repetitions)
+        print(f"{name:<18} mediana {median * 1000:8.2f} ms, {statements} query")
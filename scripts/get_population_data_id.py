@@ -1,14 +1,15 @@
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app.catalogue_files import iter_catalogue  # noqa: E402
+
+# Genera le UPDATE che riassegnano gli ID dei mostri nell'ordine del file del catalogo (fiends.jsonl),
+# leggendo direttamente i file dei dati senza importare né analizzare population_data.py
 
 if __name__ == '__main__':
-    with open('/Users/mr.anderson2159/zoolab/backend/app/population_data.py', 'r') as file:
-        lines = file.readlines()
-        lines = [line.strip() for line in lines if 'new_fiend' in line]
-        # Regex modificata per gestire apici singoli o doppi e spazi
-        fiends = [re.search(r'new_fiend\s*\(\s*[\'"]([^\'"]+)[\'"]', line) for line in lines]
-        fiend_names = [match.group(1) for match in fiends if match]
-
-        for i, name in enumerate(fiend_names):
-            if name == 'budino d':
-                name = "budino d''acqua"
-            print(f"UPDATE fiends SET id = {i + 1} WHERE name = '{name.lower()}';")
+    for _, rows in iter_catalogue(["fiends"]):
+        for i, row in enumerate(rows):
+            name = row["fiend_name"].lower().replace("'", "''")
+            print(f"UPDATE fiends SET id = {i + 1} WHERE name = '{name}';")
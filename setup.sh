@@ -12,29 +12,61 @@ pip install --upgrade pip
 echo "Installazione delle dipendenze per il backend..."
 pip install -r backend/requirements.txt
 
-echo "Configurazione del database PostgreSQL..."
-DB_NAME="zoolab"
-DB_USER="mr.anderson2159"  # Sostituisci con il tuo nome utente
-# DB_PASSWORD="password"  # Imposta una password corretta o richiedi input
-
-# Controlla se il database esiste già
-if psql -U "$DB_USER" -lqt | cut -d \| -f 1 | grep -qw "$DB_NAME"; then
-    echo "Il database $DB_NAME esiste già, salto la creazione."
+if [ "${DB_BACKEND:-postgresql}" = "sqlite" ]; then
+    echo "Costruzione del catalogo SQLite precompilato..."
+    # Il database SQLite del server (SQLITE_PATH) viene creato al primo avvio copiando il catalogo
+    (cd backend && python3 -m app.sqlite_catalogue)
 else
-    echo "Creazione del database $DB_NAME..."
-    createdb -U "$DB_USER" "$DB_NAME"
-fi
+    echo "Configurazione del database PostgreSQL..."
+    DB_NAME="zoolab"
+    DB_USER="mr.anderson2159"  # Sostituisci con il tuo nome utente
+    # DB_PASSWORD="password"  # Imposta una password corretta o richiedi input
+
+    # Controlla se il database esiste già
+    if psql -U "$DB_USER" -lqt | cut -d \| -f 1 | grep -qw "$DB_NAME"; then
+        echo "Il database $DB_NAME esiste già, salto la creazione."
+        NEW_DATABASE=false
+    else
+        echo "Creazione del database $DB_NAME..."
+        createdb -U "$DB_USER" "$DB_NAME"
+        NEW_DATABASE=true
+    fi
 
-echo "Eseguo le migrazioni (se presenti)..."
-# Qui potresti aggiungere comandi per le migrazioni del database, se usi Alembic o Django Migrations
-# esempio: alembic upgrade head
+    if [ "$NEW_DATABASE" = false ]; then
+        echo "Esecuzione delle migrazioni dello schema..."
+        # Un database marcato con revisioni locali non versionate va prima riallineato con `alembic stamp --purge base`
+        (cd backend && alembic upgrade head)
+    fi
 
-echo "Popolamento dei dati iniziali nel database..."
-python3 -m app.populate_data
+    # Istantanea binaria del catalogo per la versione attuale dei file dei dati. È facoltativa e non è inclusa
+    # nel repository: si costruisce su un database già popolato con `cd backend && python3 -m app.catalogue_snapshot`
+    # e velocizza la creazione di altri ambienti. Se manca, il catalogo viene caricato con il reseed, che crea
+    # anche lo schema del nuovo database
+    CATALOGUE_VERSION=$(python3 -c "import json; print(json.load(open('backend/data/catalogue/manifest.json'))['version'])")
+    SNAPSHOT="backend/data/snapshots/catalogue-v$CATALOGUE_VERSION.zip"
 
-echo "Applicazione delle correzioni al database..."
-psql -U postgres -d zoolab -f backend/sql_scripts/correzione_ordinamento_zone.sql
-psql -U postres -d zoolab -f backend/sql_scripts/correzione_id_mostri.sql
+    if [ "$NEW_DATABASE" = true ] && [ -f "$SNAPSHOT" ]; then
+        echo "Caricamento dell'istantanea del catalogo $SNAPSHOT..."
+        # Contiene il catalogo già corretto: popolamento e script di correzione non sono necessari
+        (cd backend && python3 -m app.catalogue_snapshot --restore)
+    else
+        if [ "$NEW_DATABASE" = true ]; then
+            echo "Istantanea $SNAPSHOT non trovata: il catalogo viene caricato dai file dei dati."
+        fi
+        echo "Popolamento (o allineamento) del catalogo nel database..."
+        # Il reseed applica solo le differenze rispetto ai file del catalogo: su un database già popolato
+        # non modifica i progressi delle partite e può essere rieseguito ad ogni aggiornamento dei dati
+        # I file del catalogo includono già le correzioni (ordine degli ID e immagini): gli script in backend/sql_scripts
+        # servono solo per database popolati con versioni precedenti e non vanno rieseguiti dopo il reseed
+        (cd backend && python3 -m app.population_data --reseed)
+    fi
+
+    if [ "$NEW_DATABASE" = true ]; then
+        # Lo schema di un nuovo database viene creato dal ripristino o dal reseed (identico all'ultima revisione):
+        # viene marcato come aggiornato, così le migrazioni successive partono da qui
+        (cd backend && alembic stamp head)
+    fi
+fi
 
 # Configura il PYTHONPATH
 export PYTHONPATH="$PYTHONPATH:/path/to/zoolab"